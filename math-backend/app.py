@@ -1,22 +1,153 @@
-from flask import Flask, request, jsonify
-from solvemath.factory import SolverFactory
-
-app = Flask(__name__)
-
-@app.route('/solve', methods=['POST'])
-def solve_api():
-    data = request.get_json()
-    solver_code = data.get("solver_code")
-    expression = data.get("expression")
-
-    factory = SolverFactory()
-    solver = factory.get_solver_by_code(solver_code)
-
-    if solver:
-        result, steps = solver.solve(expression)
-        return jsonify({"result": result, "steps": steps})
-
-    return jsonify({"error": "Invalid solver code"}), 400
-
-if __name__ == '__main__':
-    app.run(debug=True)
+from flask import Flask, Response, g, request, jsonify
+from solvemath import instrument
+from solvemath.service import (
+    BATCH_MAX_ITEMS, STATUS_CODES, InvalidSolverCode, PoolSaturated, format_event, request_options,
+    service_from_env,
+)
+
+app = Flask(__name__)
+service = service_from_env()
+instrument.configure_logging()
+# Solvers (and sympy/matplotlib) load on first use unless SOLVE_PRELOAD asks for them now.
+service.factory.preload_from_env()
+
+@app.before_request
+def start_trace():
+    g.trace_token = instrument.start_request(request.headers.get("X-Request-ID"))
+    g.trace_id = instrument.current_trace_id()
+
+@app.after_request
+def tag_response(response):
+    if g.get("trace_id"):
+        response.headers["X-Request-ID"] = g.trace_id
+    return response
+
+@app.teardown_request
+def end_trace(exc):
+    if "trace_token" in g:
+        instrument.end_request(g.pop("trace_token"))
+
+@app.route('/solve', methods=['POST'])
+def solve_api():
+    data = request.get_json()
+    solver_code = data.get("solver_code")
+    expression = data.get("expression")
+
+    try:
+        payload = service.solve(solver_code, expression, options=request_options(data))
+    except InvalidSolverCode:
+        return jsonify({"error": "Invalid solver code"}), 400
+    except PoolSaturated as e:
+        return jsonify({"error": "Server busy, retry later"}), 429, {"Retry-After": str(e.retry_after)}
+    return jsonify(payload), STATUS_CODES.get(payload.get("status"), 200)
+
+@app.route('/solve/stream', methods=['POST'])
+def solve_stream_api():
+    data = request.get_json()
+    solver_code = data.get("solver_code")
+    expression = data.get("expression")
+    sse = "text/event-stream" in request.headers.get("Accept", "")
+
+    events = service.solve_stream(solver_code, expression, options=request_options(data))
+    try:
+        first = next(events)
+    except InvalidSolverCode:
+        return jsonify({"error": "Invalid solver code"}), 400
+    except PoolSaturated as e:
+        return jsonify({"error": "Server busy, retry later"}), 429, {"Retry-After": str(e.retry_after)}
+
+    def generate():
+        yield format_event(*first, sse)
+        for kind, value in events:
+            yield format_event(kind, value, sse)
+
+    mimetype = "text/event-stream" if sse else "application/x-ndjson"
+    return Response(generate(), mimetype=mimetype, headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.route('/solve/batch', methods=['POST'])
+def solve_batch_api():
+    data = request.get_json()
+    items = data.get("items") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return jsonify({"error": "Expected a list of {solver_code, expression} items"}), 400
+    if len(items) > BATCH_MAX_ITEMS:
+        return jsonify({"error": f"Batch too large (max {BATCH_MAX_ITEMS} items)"}), 413
+
+    return jsonify({"results": service.solve_batch(items)})
+
+@app.route('/plot', methods=['GET', 'POST'])
+def plot_api():
+    from solvemath import plot
+    if request.method == 'POST':
+        data = request.get_json() or {}
+        items = data.get("expressions") or ([data["expression"]] if "expression" in data else [])
+        options = data
+    else:
+        items = request.args.getlist("expr")
+        options = request.args
+    try:
+        spec = plot.plot_spec(
+            items,
+            x_min=float(options.get("x_min", -10)),
+            x_max=float(options.get("x_max", 10)),
+            fmt=options.get("format", "png"),
+            points=int(options.get("points", plot.SHARED_GRID_POINTS)),
+        )
+        etag = plot.plot_etag(spec)
+    except Exception as e:
+        return jsonify({"error": f"Invalid plot request: {e}"}), 400
+
+    headers = {"ETag": f'"{etag}"', "Cache-Control": "public, max-age=86400, immutable"}
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers=headers)
+    try:
+        image = plot.render_plot(spec)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid plot request: {e}"}), 400
+    except Exception as e:
+        return jsonify({"error": f"Could not render plot: {e}"}), 500
+    return Response(image, mimetype=plot.PLOT_FORMATS[spec[1]], headers=headers)
+
+@app.route('/triangles', methods=['POST'])
+def triangles_api():
+    from solvemath import triangles
+    if (request.content_length or 0) > triangles.MAX_BODY_BYTES:
+        return jsonify({"error": "Request body too large"}), 413
+    try:
+        columns, unit, right, fmt = triangles.read_columns(request.get_data(), request.content_type or "", request.args)
+        out = triangles.solve_columns(columns, unit=unit, right=right)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid triangle request: {e}"}), 400
+    return Response(triangles.stream(out, fmt, unit), mimetype=triangles.FORMATS[fmt])
+
+@app.route('/geometry', methods=['POST'])
+def geometry_api():
+    from solvemath import shapes
+    if (request.content_length or 0) > shapes.MAX_BODY_BYTES:
+        return jsonify({"error": "Request body too large"}), 413
+    try:
+        shape, wanted, columns, fmt = shapes.read_request(request.get_data(), request.content_type or "", request.args)
+        out = shapes.evaluate(shape, columns, wanted)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid geometry request: {e}"}), 400
+    return Response(shapes.stream(out, fmt, shape), mimetype=shapes.FORMATS[fmt])
+
+@app.route('/metrics', methods=['GET'])
+def metrics_api():
+    return Response(service.metrics(), mimetype="text/plain; version=0.0.4")
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats_api():
+    if service.cache is None:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, **service.cache.stats()})
+
+@app.route('/pool/stats', methods=['GET'])
+def pool_stats_api():
+    pool = service.pool
+    if pool is None:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, **pool.stats()})
+
+if __name__ == '__main__':
+    app.run(debug=True)
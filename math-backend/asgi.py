@@ -0,0 +1,335 @@
+"""ASGI version of the solve API, e.g. `uvicorn asgi:app --workers 1`.
+
+Same request/response contract as app.py. The event loop only parses
+requests and writes responses; solves are handed to SolveService's async
+entry points, so thousands of idle or slow connections cost a coroutine
+each rather than an OS thread.
+"""
+import asyncio
+import json
+import os
+from urllib.parse import parse_qs
+
+from solvemath import instrument
+from solvemath.service import (
+    BATCH_MAX_ITEMS, STATUS_CODES, InvalidSolverCode, PoolSaturated, format_event, request_options,
+    service_from_env,
+)
+
+service = service_from_env()
+instrument.configure_logging()
+
+# Solves one client may have in flight before it gets 429s.
+CLIENT_CONCURRENCY = int(os.environ.get("SOLVE_CLIENT_CONCURRENCY", "8"))
+MAX_BODY_BYTES = int(os.environ.get("SOLVE_MAX_BODY_BYTES", str(4 * 1024 * 1024)))
+
+_active = {}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str, headers=()):
+        super().__init__(message)
+        self.status = status
+        self.headers = list(headers)
+
+
+async def _read_body(receive, limit: int = MAX_BODY_BYTES) -> bytes:
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise HTTPError(400, "Client disconnected")
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > limit:
+            raise HTTPError(413, "Request body too large")
+        chunks.append(chunk)
+        if not message.get("more_body"):
+            break
+    return b"".join(chunks)
+
+
+async def _read_json(receive):
+    body = await _read_body(receive)
+    try:
+        return json.loads(body or b"null")
+    except ValueError:
+        raise HTTPError(400, "Request body must be JSON")
+
+
+async def _send_bytes(send, status: int, body: bytes, headers=()):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-length", str(len(body)).encode()),
+                    *[(k.encode(), v.encode()) for k, v in headers]],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_json(send, status: int, body, headers=()):
+    data = json.dumps(body).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(data)).encode()),
+                    *[(k.encode(), v.encode()) for k, v in headers]],
+    })
+    await send({"type": "http.response.body", "body": data})
+
+
+def _client(scope) -> str:
+    for name, value in scope.get("headers", []):
+        if name == b"x-forwarded-for":
+            return value.decode().split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class _ClientSlot:
+    """Per-client in-flight limit; the loop is single-threaded so a dict suffices."""
+
+    def __init__(self, scope):
+        self.client = _client(scope)
+
+    def __enter__(self):
+        if _active.get(self.client, 0) >= CLIENT_CONCURRENCY:
+            raise HTTPError(429, "Too many concurrent requests from this client", [("retry-after", "1")])
+        _active[self.client] = _active.get(self.client, 0) + 1
+
+    def __exit__(self, *exc):
+        left = _active[self.client] - 1
+        if left:
+            _active[self.client] = left
+        else:
+            del _active[self.client]
+
+
+def _problem(data):
+    if not isinstance(data, dict):
+        raise HTTPError(400, "Expected a JSON object with solver_code and expression")
+    return data.get("solver_code"), data.get("expression"), request_options(data)
+
+
+async def solve_api(scope, receive, send):
+    solver_code, expression, options = _problem(await _read_json(receive))
+    with _ClientSlot(scope):
+        payload = await service.asolve(solver_code, expression, options)
+    await _send_json(send, STATUS_CODES.get(payload.get("status"), 200), payload)
+
+
+async def solve_batch_api(scope, receive, send):
+    data = await _read_json(receive)
+    items = data.get("items") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        raise HTTPError(400, "Expected a list of {solver_code, expression} items")
+    if len(items) > BATCH_MAX_ITEMS:
+        raise HTTPError(413, f"Batch too large (max {BATCH_MAX_ITEMS} items)")
+    with _ClientSlot(scope):
+        results = await service.asolve_batch(items)
+    await _send_json(send, 200, {"results": results})
+
+
+async def solve_stream_api(scope, receive, send):
+    solver_code, expression, options = _problem(await _read_json(receive))
+    accept = dict(scope.get("headers", [])).get(b"accept", b"")
+    sse = b"text/event-stream" in accept
+    with _ClientSlot(scope):
+        events = service.asolve_stream(solver_code, expression, options)
+        try:
+            first = await events.__anext__()
+        except BaseException:
+            await events.aclose()
+            raise
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/event-stream" if sse else b"application/x-ndjson"),
+                        (b"cache-control", b"no-cache"), (b"x-accel-buffering", b"no")],
+        })
+        try:
+            await send({"type": "http.response.body", "body": format_event(*first, sse).encode(), "more_body": True})
+            async for kind, value in events:
+                await send({"type": "http.response.body", "body": format_event(kind, value, sse).encode(),
+                            "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            await events.aclose()
+
+
+async def plot_api(scope, receive, send):
+    from solvemath import plot
+    if scope["method"] == "POST":
+        options = await _read_json(receive) or {}
+        if not isinstance(options, dict):
+            raise HTTPError(400, "Expected a JSON object")
+        items = options.get("expressions") or ([options["expression"]] if "expression" in options else [])
+    else:
+        query = parse_qs(scope.get("query_string", b"").decode())
+        items = query.get("expr", [])
+        options = {k: v[0] for k, v in query.items()}
+    try:
+        spec = plot.plot_spec(
+            items,
+            x_min=float(options.get("x_min", -10)),
+            x_max=float(options.get("x_max", 10)),
+            fmt=options.get("format", "png"),
+            points=int(options.get("points", plot.SHARED_GRID_POINTS)),
+        )
+        etag = plot.plot_etag(spec)
+    except Exception as e:
+        raise HTTPError(400, f"Invalid plot request: {e}")
+
+    headers = [("etag", f'"{etag}"'), ("cache-control", "public, max-age=86400, immutable")]
+    if_none_match = dict(scope.get("headers", [])).get(b"if-none-match", b"").decode()
+    if etag in if_none_match or if_none_match.strip() == "*":
+        return await _send_bytes(send, 304, b"", headers)
+    loop = asyncio.get_running_loop()
+    with _ClientSlot(scope):
+        try:
+            image = await loop.run_in_executor(service.async_threads, plot.render_plot, spec)
+        except ValueError as e:
+            raise HTTPError(400, f"Invalid plot request: {e}")
+    await _send_bytes(send, 200, image, [("content-type", plot.PLOT_FORMATS[spec[1]]), *headers])
+
+
+async def triangles_api(scope, receive, send):
+    from solvemath import triangles
+    body = await _read_body(receive, triangles.MAX_BODY_BYTES)
+    headers = dict(scope.get("headers", []))
+    query = {k: v[0] for k, v in parse_qs(scope.get("query_string", b"").decode()).items()}
+    content_type = headers.get(b"content-type", b"").decode()
+
+    def solve():
+        columns, unit, right, fmt = triangles.read_columns(body, content_type, query)
+        return triangles.solve_columns(columns, unit=unit, right=right), unit, fmt
+
+    loop = asyncio.get_running_loop()
+    with _ClientSlot(scope):
+        try:
+            out, unit, fmt = await loop.run_in_executor(service.async_threads, solve)
+        except ValueError as e:
+            raise HTTPError(400, f"Invalid triangle request: {e}")
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", triangles.FORMATS[fmt].encode())],
+        })
+        # Formatting a chunk is CPU work too, so it happens off the loop as well.
+        chunks = triangles.stream(out, fmt, unit)
+        while (chunk := await loop.run_in_executor(service.async_threads, next, chunks, None)) is not None:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+
+async def geometry_api(scope, receive, send):
+    from solvemath import shapes
+    body = await _read_body(receive, shapes.MAX_BODY_BYTES)
+    headers = dict(scope.get("headers", []))
+    query = {k: v[0] for k, v in parse_qs(scope.get("query_string", b"").decode()).items()}
+    content_type = headers.get(b"content-type", b"").decode()
+
+    def evaluate():
+        shape, wanted, columns, fmt = shapes.read_request(body, content_type, query)
+        return shapes.evaluate(shape, columns, wanted), shape, fmt
+
+    loop = asyncio.get_running_loop()
+    with _ClientSlot(scope):
+        try:
+            out, shape, fmt = await loop.run_in_executor(service.async_threads, evaluate)
+        except ValueError as e:
+            raise HTTPError(400, f"Invalid geometry request: {e}")
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", shapes.FORMATS[fmt].encode())],
+        })
+        chunks = shapes.stream(out, fmt, shape)
+        while (chunk := await loop.run_in_executor(service.async_threads, next, chunks, None)) is not None:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+
+async def metrics_api(scope, receive, send):
+    await _send_bytes(send, 200, service.metrics().encode(), [("content-type", "text/plain; version=0.0.4")])
+
+
+async def cache_stats_api(scope, receive, send):
+    if service.cache is None:
+        await _send_json(send, 200, {"enabled": False})
+    else:
+        await _send_json(send, 200, {"enabled": True, **service.cache.stats()})
+
+
+async def pool_stats_api(scope, receive, send):
+    pool = service.pool
+    if pool is None:
+        await _send_json(send, 200, {"enabled": False})
+    else:
+        await _send_json(send, 200, {"enabled": True, **pool.stats()})
+
+
+ROUTES = {
+    ("POST", "/solve"): solve_api,
+    ("POST", "/solve/stream"): solve_stream_api,
+    ("POST", "/solve/batch"): solve_batch_api,
+    ("GET", "/plot"): plot_api,
+    ("POST", "/plot"): plot_api,
+    ("POST", "/triangles"): triangles_api,
+    ("POST", "/geometry"): geometry_api,
+    ("GET", "/metrics"): metrics_api,
+    ("GET", "/cache/stats"): cache_stats_api,
+    ("GET", "/pool/stats"): pool_stats_api,
+}
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            # Preloading finishes before startup completes, so no request pays for it.
+            await asyncio.get_running_loop().run_in_executor(service.async_threads, service.factory.preload_from_env)
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            service.shutdown()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await _lifespan(receive, send)
+    if scope["type"] != "http":
+        return
+
+    handler = ROUTES.get((scope["method"], scope["path"]))
+    if handler is None:
+        allowed = [method for method, path in ROUTES if path == scope["path"]]
+        if allowed:
+            return await _send_json(send, 405, {"error": "Method not allowed"}, [("allow", ", ".join(allowed))])
+        return await _send_json(send, 404, {"error": "Not found"})
+
+    headers = dict(scope.get("headers", []))
+    token = instrument.start_request(headers.get(b"x-request-id", b"").decode("latin-1") or None)
+    trace_id = instrument.current_trace_id()
+    if trace_id:
+        send = _tagging(send, trace_id)
+    try:
+        await handler(scope, receive, send)
+    except HTTPError as e:
+        await _send_json(send, e.status, {"error": str(e)}, e.headers)
+    except InvalidSolverCode:
+        await _send_json(send, 400, {"error": "Invalid solver code"})
+    except PoolSaturated as e:
+        await _send_json(send, 429, {"error": "Server busy, retry later"}, [("retry-after", str(e.retry_after))])
+    finally:
+        instrument.end_request(token)
+
+
+def _tagging(send, trace_id: str):
+    """Wrap `send` so every response carries the request's X-Request-ID."""
+    async def tagged(message):
+        if message["type"] == "http.response.start":
+            message = {**message, "headers": [*message.get("headers", []), (b"x-request-id", trace_id.encode())]}
+        await send(message)
+    return tagged
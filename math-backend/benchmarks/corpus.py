@@ -0,0 +1,145 @@
+"""Representative problems per solver branch.
+
+Each branch maps to a list of cases. A case is (target, payload):
+target is a solver code (1 algebra, 2 series, 3 trig), "geometry",
+"plot", "triangles" or "shapes"; payload is the problem text, for plots a
+list of expressions, for triangles a CSV body for POST /triangles, and for
+shapes a JSON body for POST /geometry.
+"""
+import json
+
+
+def _linear_system(n: int, width: int) -> str:
+    """n equations in x_1..x_n, each touching about `width` unknowns, with one integer solution."""
+    lines = []
+    for i in range(n):
+        cols = sorted({i, *((i * 7 + k * 13) % n for k in range(1, width))})
+        coeffs = {j: (1 + (i + j) % 4) * (-1 if (i * j) % 3 == 1 else 1) for j in cols}
+        coeffs[i] = 10 * width  # diagonally dominant, so always uniquely solvable
+        rhs = sum(c * ((j % 11) - 5) for j, c in coeffs.items())
+        lines.append(" + ".join(f"{c}x_{j + 1}" for j, c in coeffs.items()) + f" = {rhs}")
+    return "solve simultaneous " + ", ".join(lines)
+
+
+def _triangle_csv(rows: int) -> str:
+    """Rows cycling through the SSS, SAS, ASA/AAS and SSA cases, unknowns left empty."""
+    patterns = ("{a},{b},{c},,,", "{a},{b},,,,{C}", "{a},,,{A},{B},", "{a},{b},,{A},,")
+    lines = ["a,b,c,A,B,C"]
+    for i in range(rows):
+        a, b = 5 + i % 7, 6 + i % 5
+        lines.append(patterns[i % 4].format(a=a, b=b, c=a + b - 1 - i % 3, A=20 + i % 40, B=30 + i % 50, C=40 + i % 90))
+    return "\n".join(lines) + "\n"
+
+
+def _shapes_json(shape: str, rows: int, **columns) -> str:
+    """A /geometry body with `rows` rows; each column cycles through its given values."""
+    return json.dumps({"shape": shape, "columns": {
+        name: [values[i % len(values)] for i in range(rows)] for name, values in columns.items()}})
+
+
+CORPUS = {
+    "algebra.linear": [
+        (1, "2x + 3 = 7"),
+        (1, "5x - 4 = 3x + 10"),
+        (1, "solve 3(x+1) = 2x - 7"),
+        (1, "7x - 2 = 4x + 13"),
+    ],
+    "algebra.quadratic": [
+        (1, "x^2 - 5x + 6 = 0"),
+        (1, "2x^2 + 3x - 2 = 0"),
+        (1, "x^2 - 2 = 0"),
+        (1, "x^2 + 4x + 4 = 0"),
+    ],
+    "algebra.system": [
+        (1, "solve x + y = 2, x - y = 0"),
+        (1, "2x + 3y = 12 and x - y = 1"),
+        (1, "x + y + z = 6, x - y = 1, y + z = 5"),
+    ],
+    "algebra.system.large": [
+        (1, _linear_system(2, 2)),
+        (1, _linear_system(10, 10)),
+        (1, _linear_system(50, 5)),
+        (1, _linear_system(200, 5)),
+    ],
+    "algebra.inequality": [
+        (1, "solve 2x + 1 > 5"),
+        (1, "x^2 - 4 < 0"),
+        (1, "1 < 2x + 1 ≤ 9"),
+        (1, "(x - 1)/(x + 2) >= 0"),
+        (1, "x^3 - x > 0, x < 5"),
+    ],
+    "algebra.factor": [
+        (1, "factor x^2 - 9"),
+        (1, "factor x^3 - 6x^2 + 11x - 6"),
+    ],
+    "algebra.simplify": [
+        (1, "simplify sqrt(8) + sqrt(18)"),
+        (1, "simplify (x^2 - 1)/(x - 1)"),
+    ],
+    "algebra.rational": [
+        (1, "rational (x^2 + 2x + 1)/(x + 1)"),
+        (1, "rational (x^3 - 8)/(x - 2)"),
+        # Any "/" sends an equation down the rational branch.
+        (1, "x/4 + 2 = 5"),
+    ],
+    "series.arithmetic": [
+        (2, "10th term of arithmetic sequence 2, 5, 8"),
+        (2, "sum of first 20 terms of arithmetic sequence 3, 7, 11"),
+    ],
+    "series.geometric": [
+        (2, "6th term of geometric sequence 2, 6, 18"),
+        (2, "sum of first 8 terms of geometric sequence 1, 2, 4"),
+    ],
+    "series.summation": [
+        (2, "sum of 1 + 2 + ... + 100"),
+        (2, "sum of n^2 from n=1 to k"),
+    ],
+    "series.range": [
+        (2, "terms 1..10000 of arithmetic sequence 2, 5, 8"),
+        (2, "partial sums up to 1000 of geometric sequence 1, 1/2, 1/4"),
+        (2, "partial sums of n^2 from n=1 to 10000"),
+    ],
+    "series.convergence": [
+        (2, "does the infinite series 1/n^2 converge"),
+        (2, "does the series 1/n diverge"),
+    ],
+    # Settled by the integral test, whose ∫ 1/ln x comes back as -li(2) + oo.
+    "series.integral": [
+        (2, "does the series 1/ln(n) converge"),
+        (2, "does the series 1/(n ln(n)) converge"),
+    ],
+    "trig.equation": [
+        (3, "solve sin(x) = 0.5"),
+        (3, "solve 2cos(x) = 1"),
+        (3, "solve tan(x) = 1"),
+    ],
+    "trig.identity": [
+        (3, "verify sin²(x) + cos²(x) = 1"),
+        (3, "verify identity 1 + tan²(x) = sec²(x)"),
+    ],
+    "trig.triangle": [
+        (3, "right triangle opposite=3 angle=30°"),
+        (3, "find hypotenuse of triangle adjacent=4 opposite=3"),
+    ],
+    "trig.triangle.bulk": [
+        ("triangles", _triangle_csv(1000)),
+        ("triangles", _triangle_csv(100000)),
+    ],
+    "geometry": [
+        ("geometry", "area of circle with radius 5"),
+        ("geometry", "area of circle with radius 12"),
+        ("geometry", "volume of cylinder radius 3 height 5.5"),
+        ("geometry", "area of triangle with sides 3, 4, 5"),
+        ("geometry", "distance between (1, 2) and (4, 6)"),
+    ],
+    "geometry.bulk": [
+        ("shapes", _shapes_json("cylinder", 1000, r=[1, 2.5, 3, 4.25], h=[2, 5, 7])),
+        ("shapes", _shapes_json("cone", 100000, r=[1, 2.5, 3, 4.25], h=[2, 5, 7])),
+        ("shapes", _shapes_json("line", 100000, x1=[0, 1, -2], y1=[0, 3], x2=[4, 5, 6, 7], y2=[1, -1, 2])),
+    ],
+    "plot": [
+        ("plot", ["x^2"]),
+        ("plot", ["sin(x)", "cos(x)"]),
+        ("plot", ["tan(x)", "1/x", "x^3/100"]),
+    ],
+}
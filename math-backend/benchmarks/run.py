@@ -0,0 +1,234 @@
+"""Benchmark every solver branch, in-process and through the HTTP API.
+
+    python -m benchmarks.run                               # in-process, all branches
+    python -m benchmarks.run --branch algebra --repeat 50
+    python -m benchmarks.run --http http://127.0.0.1:8000 --concurrency 16 --requests 400
+    python -m benchmarks.run --out new.json --compare baseline.json --threshold 1.25
+
+Run from math-backend/. For each branch it reports p50/p95/p99 latency,
+the first (cold) call, peak traced memory and throughput. With --http, the
+same corpus is sent to a running server (app.py or asgi.py) by
+`--concurrency` client threads. Start that server with
+SOLVE_CACHE_BACKEND=none, or repeated problems are answered from the result
+cache. --compare exits with status 1 when a branch's p50 or p95 grew by more
+than --threshold times against the baseline file.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import sympy
+
+from benchmarks.corpus import CORPUS
+
+COMPARED = ("p50_ms", "p95_ms")
+
+
+def percentile(sorted_values, q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), round(q / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies, elapsed: float, **extra) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "calls": len(ordered),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        "throughput_per_s": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+        **extra,
+    }
+
+
+# --- in-process ---
+
+def _callables():
+    from solvemath import plot, shapes, triangles
+    from solvemath.factory import SolverFactory
+
+    factory = SolverFactory()
+
+    def call(target, payload):
+        if target == "plot":
+            spec = plot.plot_spec(payload, -10, 10, "png", plot.SHARED_GRID_POINTS)
+            return plot.render_plot(spec)
+        if target == "triangles":
+            columns, unit, right, _ = triangles.read_columns(payload.encode(), "text/csv")
+            return b"".join(triangles.stream(triangles.solve_columns(columns, unit, right), "binary"))
+        if target == "shapes":
+            shape, wanted, columns, _ = shapes.read_request(payload.encode(), "application/json")
+            return b"".join(shapes.stream(shapes.evaluate(shape, columns, wanted), "binary"))
+        return factory.get_solver_by_code(target).solve(payload)
+
+    return call
+
+
+def bench_in_process(branches, repeat: int) -> dict:
+    call = _callables()
+    results = {}
+    for branch in branches:
+        cases = CORPUS[branch]
+        with contextlib.redirect_stdout(io.StringIO()):
+            # Cold: the first call per case, before any per-process caches fill.
+            first = []
+            for target, payload in cases:
+                started = time.perf_counter()
+                call(target, payload)
+                first.append(time.perf_counter() - started)
+
+            latencies = []
+            started_all = time.perf_counter()
+            for _ in range(repeat):
+                for target, payload in cases:
+                    started = time.perf_counter()
+                    call(target, payload)
+                    latencies.append(time.perf_counter() - started)
+            elapsed = time.perf_counter() - started_all
+
+            # Memory is traced in a separate pass; tracemalloc slows every allocation.
+            tracemalloc.start()
+            for target, payload in cases:
+                call(target, payload)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        results[branch] = summarize(latencies, elapsed, first_ms=round(max(first) * 1000, 3),
+                                    peak_kib=round(peak / 1024, 1))
+        print(f"  {branch:22} p50 {results[branch]['p50_ms']:9.3f} ms  p95 {results[branch]['p95_ms']:9.3f} ms  "
+              f"peak {results[branch]['peak_kib']:9.1f} KiB", file=sys.stderr)
+    return results
+
+
+# --- HTTP ---
+
+def _request(base_url: str, target, payload):
+    if target == "plot":
+        query = urllib.parse.urlencode([("expr", e) for e in payload])
+        req = urllib.request.Request(f"{base_url}/plot?{query}")
+    elif target == "triangles":
+        req = urllib.request.Request(f"{base_url}/triangles?format=binary", data=payload.encode(),
+                                     headers={"Content-Type": "text/csv"})
+    elif target == "shapes":
+        req = urllib.request.Request(f"{base_url}/geometry?format=binary", data=payload.encode(),
+                                     headers={"Content-Type": "application/json"})
+    else:
+        body = json.dumps({"solver_code": target, "expression": payload}).encode()
+        req = urllib.request.Request(f"{base_url}/solve", data=body, headers={"Content-Type": "application/json"})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=60) as resp:
+            resp.read()
+            status = resp.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except OSError:
+        status = 0
+    return time.perf_counter() - started, status
+
+
+def bench_http(base_url: str, branches, concurrency: int, requests: int) -> dict:
+    results = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as threads:
+        for branch in branches:
+            cases = CORPUS[branch]
+            if not cases:
+                continue
+            jobs = [cases[i % len(cases)] for i in range(requests)]
+            started = time.perf_counter()
+            outcomes = list(threads.map(lambda case: _request(base_url, *case), jobs))
+            elapsed = time.perf_counter() - started
+
+            statuses = {}
+            for _, status in outcomes:
+                statuses[str(status)] = statuses.get(str(status), 0) + 1
+            results[branch] = summarize([t for t, _ in outcomes], elapsed, statuses=statuses)
+            print(f"  {branch:22} p50 {results[branch]['p50_ms']:9.3f} ms  p95 {results[branch]['p95_ms']:9.3f} ms  "
+                  f"{results[branch]['throughput_per_s']:8.1f} req/s  {statuses}", file=sys.stderr)
+    return results
+
+
+# --- comparison ---
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """(mode, branch, metric, old, new) for every metric that regressed past `threshold`."""
+    regressions = []
+    for mode in ("in_process", "http"):
+        for branch, stats in current.get(mode, {}).items():
+            old = baseline.get(mode, {}).get(branch)
+            if not old:
+                continue
+            for metric in COMPARED:
+                if old.get(metric) and stats[metric] > old[metric] * threshold:
+                    regressions.append((mode, branch, metric, old[metric], stats[metric]))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--branch", action="append", default=[],
+                        help="branch or branch prefix to run (repeatable); default all")
+    parser.add_argument("--repeat", type=int, default=20, help="in-process passes over each branch's cases")
+    parser.add_argument("--skip-in-process", action="store_true")
+    parser.add_argument("--http", metavar="URL", help="also load-test a running server at URL")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="HTTP requests per branch")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--compare", metavar="BASELINE", help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="allowed slowdown factor before a metric counts as a regression")
+    args = parser.parse_args(argv)
+
+    branches = [b for b in CORPUS if not args.branch or any(b.startswith(p) for p in args.branch)]
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "sympy": sympy.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeat": args.repeat,
+            "http": args.http,
+            "concurrency": args.concurrency if args.http else None,
+        },
+    }
+    if not args.skip_in_process:
+        print("in-process:", file=sys.stderr)
+        results["in_process"] = bench_in_process(branches, args.repeat)
+    if args.http:
+        print(f"http {args.http} (concurrency {args.concurrency}):", file=sys.stderr)
+        results["http"] = bench_http(args.http.rstrip("/"), branches, args.concurrency, args.requests)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    else:
+        print(json.dumps(results, indent=2, sort_keys=True))
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for mode, branch, metric, old, new in regressions:
+            print(f"REGRESSION {mode} {branch} {metric}: {old} → {new} ms ({new / old:.2f}x)", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold}x", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
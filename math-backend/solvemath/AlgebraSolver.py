@@ -1,152 +1,275 @@
+import logging
 import sympy
-import re
+from solvemath import budget, inequalities, linear, univariate
 from solvemath.base import SolveMath
+from solvemath.budget import BudgetExceeded
+from solvemath.instrument import stage
+from solvemath.numeric import solve_numeric, format_root
+from solvemath.parser import ParseError, parse, parse_equation
 from solvemath.utils import extract_equations
-from solvemath.utils import extract_equations_from_text
+from solvemath.utils import extract_relations
 from sympy.solvers.inequalities import solve_univariate_inequality
 
+MODES = ('symbolic', 'numeric')
+# Share of the request's time budget the symbolic single-equation path may
+# use before falling back to numeric root finding.
+SYMBOLIC_SHARE = 0.6
+
+log = logging.getLogger(__name__)
+
+
+def classify(text, eq_strings) -> str:
+    """Which branch of AlgebraSolver.iter_solve handles the request (also part of its cache key)."""
+    if any(op in text for op in ['<', '>', '≤', '≥', '!=', '≠']):
+        return 'inequality'
+    if 'factor' in text:
+        return 'factor'
+    if any(word in text for word in ['simplify', 'surd', 'exponent']):
+        return 'simplify'
+    if '/' in text or 'rational' in text:
+        return 'rational'
+    if 'simultaneous' in text or len(eq_strings) > 1:
+        return 'system'
+    return 'single'
+
+
 class AlgebraSolver(SolveMath):
-    def solve(self, equation_text: str, variable: str = 'x') -> tuple[str, sympy.Expr | None]:
-        print("✅ AlgebraSolver is active")  
+    def solve(self, equation_text: str, variable: str = 'x', mode: str = 'symbolic',
+              precision: int = 15) -> tuple[str, sympy.Expr | None]:
+        return self.run_steps(self.iter_solve(equation_text, variable, mode, precision))
+
+    def iter_solve(self, equation_text: str, variable: str = 'x', mode: str = 'symbolic', precision: int = 15):
+        if mode not in MODES:
+            return f"❌ Error: Unknown mode '{mode}'. Use one of: {', '.join(MODES)}.", None
+        if not isinstance(precision, int) or not 1 <= precision <= 100:
+            return "❌ Error: precision must be an integer between 1 and 100.", None
         text = equation_text.lower()
-        text = re.sub(r'\bsolve\b|\bequation\b', '', text)
-        eq_strings = extract_equations(text)
+        with stage("parse"):
+            eq_strings = extract_equations(text)
         sym = sympy.Symbol(variable)
+        with stage("classify"):
+            branch = classify(text, eq_strings)
+        log.debug("AlgebraSolver: %s request %r", branch, eq_strings)
 
         try:
 
             
-            if any(op in text for op in ['<', '>', '≤', '≥']):
-                print(f"⚖️ Detected inequality: {text}")  
-                text = extract_equations_from_text(text)
-                print(f"✅Extracted the final text : {text}")
+            if branch == 'inequality':
+                with stage("parse"):
+                    found = extract_relations(text)
+                    statements = [value for _, value in found]
+                    relations = inequalities.relations(statements)
+                if not relations:
+                    return "❌ Error: Could not find an inequality to solve.", None
+                free = set().union(*(r.free_symbols for r in relations))
+                if len(free) == 1 and sym not in free:
+                    sym = free.pop()
                 steps = []
-                cleaned_text = text.replace('≤', '<=').replace('≥', '>=')
-                steps.append(f"📘 Step 1: Original inequality → {text}")
-                steps.append(f"📘 Step 2: Convert symbols → {cleaned_text}")
-                expr = sympy.sympify(cleaned_text)
-                result = solve_univariate_inequality(expr, sym)
-                steps.append(f"📘 Step 3: Solve inequality → {result}")
+                yield self.step(steps, f"📘 Step 1: Original inequality → {', '.join(s for s, _ in found)}")
+                yield self.step(steps, f"📘 Step 2: Convert symbols → {', '.join(map(str, relations))}")
+                with stage("solve"):
+                    charted = inequalities.solve(statements, sym)
+                if charted is None:
+                    # Not polynomial or rational in one unknown: sympy's general solvers.
+                    with stage("solve"):
+                        if len(relations) > 1:
+                            result = sympy.reduce_inequalities(relations, sym)
+                        else:
+                            result = solve_univariate_inequality(relations[0], sym)
+                    yield self.step(steps, f"📘 Step 3: Solve inequality → {result}")
+                    return '\n'.join(steps), None
+
+                charts, solution = charted
+                step_no = 3
+                for chart in charts:
+                    yield self.step(steps, f"📘 Step {step_no}: Sign chart for {chart.relation}")
+                    for line in inequalities.describe(chart, sym):
+                        yield self.step(steps, line)
+                    step_no += 1
+                if len(charts) > 1:
+                    yield self.step(steps, f"📘 Step {step_no}: Intersect the solution sets → "
+                                           f"{inequalities.notation(solution)}")
+                    step_no += 1
+                yield self.step(steps, f"📘 Step {step_no}: Solve inequality → {solution.as_relational(sym)}")
                 return '\n'.join(steps), None
 
-            if 'factor' in text:
-                print(f"🔍 Detected factorization request: {text}")  
-                text= extract_equations_from_text(text)
-                print(f"✅Extracted the final text : {text}")
-                expr = sympy.sympify(eq_strings[0] if eq_strings else text)
-                factored = sympy.factor(expr)
+            if branch == 'factor':
+                with stage("parse"):
+                    expr = self._expression(eq_strings)
+                with stage("factor"):
+                    factored = sympy.factor(expr)
                 return f"Factored: {factored}", expr
 
-            if any(word in text for word in ['simplify', 'surd', 'exponent']):
-                print(f"🔬 Detected simplification request: {text}")  
-                print(f"✅Extracted the final text : {text}")
-                text= extract_equations_from_text(text)
-                expr = sympy.sympify(eq_strings[0] if eq_strings else text)
-                simplified = sympy.simplify(expr)
+            if branch == 'simplify':
+                with stage("parse"):
+                    expr = self._expression(eq_strings)
+                with stage("simplify"):
+                    simplified = sympy.simplify(expr)
                 return f"Simplified: {simplified}", expr
 
-            if '/' in text or 'rational' in text:
-                print(f"🧮 Detected rational expression: {text}")  
-                text= extract_equations_from_text(text)
-                print(f"✅Extracted the final text : {text}")
-                expr = sympy.sympify(eq_strings[0] if eq_strings else text)
-                simplified = sympy.cancel(expr)
+            if branch == 'rational':
+                with stage("parse"):
+                    expr = self._expression(eq_strings)
+                with stage("simplify"):
+                    simplified = sympy.cancel(expr)
                 return f"Simplified Rational Expression: {simplified}", expr
 
            
-            is_system = 'simultaneous' in text or len(eq_strings) > 1
-            if is_system:
-                print(f"🧩 Detected system of equations: {eq_strings}")  
+            if branch == 'system':
                 steps = []
                 exprs = []
                 vars_set = set()
-                steps.append("📘 Step 1: Received system of equations:")
+                yield self.step(steps, "📘 Step 1: Received system of equations:")
                 for i, eq in enumerate(eq_strings):
-                    steps.append(f"  Eq{i+1}: {eq}")
+                    yield self.step(steps, f"  Eq{i+1}: {eq}")
                     if '=' not in eq:
-                        print(f"❌ Invalid equation format in system: {eq}")  
                         return "❌ Error: Invalid equation format in system. Expected '=' sign.", None
-                    lhs, rhs = eq.split('=')
-
-                   
-                    lhs = re.sub(r'(\d)([a-zA-Z])', r'\1*\2', lhs)
-                    rhs = re.sub(r'(\d)([a-zA-Z])', r'\1*\2', rhs)
-
-                    lhs_expr = sympy.sympify(lhs)
-                    rhs_expr = sympy.sympify(rhs)
+                    with stage("parse"):
+                        lhs_expr, rhs_expr = parse_equation(eq)
                     expr = lhs_expr - rhs_expr
                     exprs.append(expr)
                     vars_set.update(expr.free_symbols)
 
                 vars = sorted(vars_set, key=lambda s: s.name)
-                steps.append(f"📘 Step 2: Variables to solve for: {', '.join(map(str, vars))}")
-                steps.append("📘 Step 3: Converted to system of expressions:")
+                yield self.step(steps, f"📘 Step 2: Variables to solve for: {', '.join(map(str, vars))}")
+                yield self.step(steps, "📘 Step 3: Converted to system of expressions:")
                 for i, expr in enumerate(exprs):
-                    steps.append(f"  Expr{i+1}: {expr} = 0")
+                    yield self.step(steps, f"  Expr{i+1}: {expr} = 0")
 
-                print(f"📐 Solving for variables: {vars}")  
-                sol = sympy.solve(exprs, vars, dict=True)
+                with stage("solve"):
+                    sol = self._solve_system(exprs, vars, mode)
                 if not sol:
-                    print("❌ No solution for system.")  
-                    steps.append("❌ No solution found.")
+                    yield self.step(steps, "❌ No solution found.")
                     return '\n'.join(steps), None
 
-                steps.append("📘 Step 4: Solutions found:")
+                yield self.step(steps, "📘 Step 4: Solutions found:")
                 for sd in sol:
                     for v in vars:
-                        steps.append(f"  {v} = {sd[v]}")
+                        # Unknowns left free (underdetermined systems) stand for themselves.
+                        value = sd.get(v, v)
+                        if isinstance(value, float):
+                            yield self.step(steps, f"  {v} ≈ {format_root(value, precision)}")
+                        else:
+                            yield self.step(steps, f"  {v} = {value}")
 
                 return '\n'.join(steps), None
 
            
-            eq = eq_strings[0] if eq_strings else text
-            print(f"🧮 Solving single equation: {eq}")  
-
-            eq = re.sub(r'(\d)([a-zA-Z])', r'\1*\2', eq)
-            eq = eq.replace('^', '**')
+            if not eq_strings:
+                return "❌ Error: Could not read an equation from the input.", None
+            eq = eq_strings[0]
 
             steps = []
 
-            if '=' in eq:
-                lhs, rhs = eq.split('=')
-                steps.append(f"📘 Step 1: Original equation → {lhs} = {rhs}")
-                expr = sympy.sympify(lhs) - sympy.sympify(rhs)
-                steps.append(f"📘 Step 2: Move all terms to one side → {lhs} - ({rhs}) = 0")
-            else:
-                expr = sympy.sympify(eq)
-                steps.append(f"📘 Step 1: Expression to solve → {eq}")
+            lhs, rhs = eq.split('=')
+            yield self.step(steps, f"📘 Step 1: Original equation → {lhs} = {rhs}")
+            with stage("parse"):
+                lhs_expr, rhs_expr = parse_equation(eq)
+            expr = lhs_expr - rhs_expr
+            yield self.step(steps, f"📘 Step 2: Move all terms to one side → {lhs} - ({rhs}) = 0")
 
-            simplified_expr = sympy.simplify(expr)
-            steps.append(f"📘 Step 3: Simplify expression → {simplified_expr}")
+            if mode == 'numeric':
+                return (yield from self._solve_numeric(expr, sym, precision, steps, 3))
 
-            factored_expr = sympy.factor(simplified_expr)
-            if factored_expr != simplified_expr:
-                steps.append(f"📘 Step 4: Factor the expression → {factored_expr}")
-            else:
-                steps.append(f"📘 Step 4: Cannot factor further → {simplified_expr}")
+            # Symbolic work gets a share of the time budget; what is left is
+            # kept for the numeric fallback. Steps are yielded between the
+            # limited blocks, never inside them.
+            # univariate memoizes each form and takes polynomials through one
+            # factorization instead of simplify → factor → solve → simplify.
+            with stage("classify"):
+                kind = univariate.kind(expr, sym)
+            log.debug("AlgebraSolver: %s equation in %s", kind, sym)
+            symbolic = budget.share(SYMBOLIC_SHARE)
+            try:
+                with symbolic, stage("simplify"):
+                    simplified_expr = univariate.simplify(expr, sym, kind)
+                yield self.step(steps, f"📘 Step 3: Simplify expression → {simplified_expr}")
+
+                with symbolic, stage("factor"):
+                    factored_expr = univariate.factor(simplified_expr, sym, kind)
+                if factored_expr != simplified_expr:
+                    yield self.step(steps, f"📘 Step 4: Factor the expression → {factored_expr}")
+                else:
+                    yield self.step(steps, f"📘 Step 4: Cannot factor further → {simplified_expr}")
+
+                with symbolic, stage("solve"):
+                    sol = univariate.roots(expr, sym, kind)
+            except BudgetExceeded:
+                if budget.expired():
+                    raise
+                yield self.step(steps, "⏱️ Symbolic solve exceeded its time budget → switching to numeric root finding")
+                return (yield from self._solve_numeric(expr, sym, precision, steps, len(steps)))
+            except NotImplementedError:
+                yield self.step(steps, "⚠️ No closed-form solution → switching to numeric root finding")
+                return (yield from self._solve_numeric(expr, sym, precision, steps, 5))
 
-            sol = sympy.solve(expr, sym)
             if not sol:
-                print("❌ No solution.")  
-                steps.append("❌ No solution found.")
+                yield self.step(steps, "❌ No solution found.")
                 return '\n'.join(steps), expr
 
-            sol = [sympy.simplify(s) for s in sol]
-
             if any(s.has(sympy.I) for s in sol):
-                print("⚠️ Imaginary result detected.")  
-                steps.append("⚠️ Error: Imaginary result encountered.")
+                yield self.step(steps, "⚠️ Error: Imaginary result encountered.")
                 return '\n'.join(steps), None
 
             if len(sol) == 1:
-                steps.append(f"📘 Step 5: Final solution → {sym} = {sol[0]}")
+                yield self.step(steps, f"📘 Step 5: Final solution → {sym} = {sol[0]}")
             else:
-                steps.append("📘 Step 5: Final solutions:")
+                yield self.step(steps, "📘 Step 5: Final solutions:")
                 for s in sol:
-                    steps.append(f"  {sym} = {s}")
+                    yield self.step(steps, f"  {sym} = {s}")
 
             return '\n'.join(steps), expr
 
         except Exception as e:
-            print(f"❌ Exception occurred: {e}")  
+            log.debug("AlgebraSolver failed on %r", equation_text, exc_info=True)
             return f"❌ Error: {e}", None
+
+    @staticmethod
+    def _solve_system(exprs, unknowns, mode) -> list:
+        """Solutions as dicts: row reduction for linear systems, Gröbner bases for small
+        polynomial ones, sympy.solve for the rest. Numeric mode gives floats when unique."""
+        system = linear.linear_system(exprs, unknowns)
+        if system is None:
+            solutions = linear.solve_polynomial(exprs, unknowns)
+            return sympy.solve(exprs, unknowns, dict=True) if solutions is None else solutions
+
+        rows, has_floats = system
+        if mode == 'numeric':
+            values, rank = linear.solve_float(rows, len(unknowns))
+            if values is None:
+                return []
+            if rank == len(unknowns):
+                return [dict(zip(unknowns, map(float, values)))]
+        solution = linear.solve_exact(rows, len(unknowns))
+        if solution is None:
+            return []
+        out = {}
+        for v, (constant, free) in zip(unknowns, solution):
+            value = sympy.Rational(constant.numerator, constant.denominator) + sympy.Add(
+                *(sympy.Rational(c.numerator, c.denominator) * unknowns[j] for j, c in free.items()))
+            out[v] = value.evalf() if has_floats else value
+        return [out]
+
+    @staticmethod
+    def _expression(eq_strings):
+        """The first statement as a plain expression: 'f=g' becomes f - g, 'f=0' just f."""
+        if not eq_strings:
+            raise ParseError("No expression found")
+        lhs, rhs = parse_equation(eq_strings[0])
+        return lhs if rhs == 0 else lhs - rhs
+
+    def _solve_numeric(self, expr, sym, precision, steps, step_no):
+        """Numeric root finding for expr = 0, continuing the step numbering at `step_no`."""
+        with stage("solve"):
+            real, complex_roots, method = solve_numeric(expr, sym, precision)
+        yield self.step(steps, f"📘 Step {step_no}: Solve numerically ({precision} significant digits) → {method}")
+        if not real and not complex_roots:
+            yield self.step(steps, "❌ No solution found.")
+            return '\n'.join(steps), expr
+
+        yield self.step(steps, f"📘 Step {step_no + 1}: Final solutions:")
+        for root in real:
+            yield self.step(steps, f"  {sym} ≈ {format_root(root, precision)}")
+        for root in complex_roots:
+            yield self.step(steps, f"  {sym} ≈ {format_root(root, precision)} (complex)")
+        return '\n'.join(steps), expr
@@ -1,139 +1,351 @@
-import sympy
-from solvemath.base import SolveMath
-from typing import Tuple
-
-class SeriesSolver(SolveMath):
-    def solve(self, problem_text: str, variable: str = 'n') -> Tuple[str, sympy.Expr | None]:
-        print(f"🔢 SeriesSolver activated for: {problem_text}")
-        text = problem_text.lower()
-        steps = []
-
-        try:
-           
-            if any(keyword in text for keyword in ['arithmetic', 'common difference', 'aₙ']):
-                steps.append("📘 Arithmetic Sequence Detected")
-
-                terms = self._extract_sequence(text)
-                if len(terms) >= 2:
-                    a1 = terms[0]
-                    d = terms[1] - terms[0]
-                    steps.append(f"  First term (a₁) = {a1}")
-                    steps.append(f"  Common difference (d) = {d}")
-                    
-                    # Find nth term or specific term
-                    if "term" in text:
-                        n = self._extract_integer_before_keyword(text, "term") or variable
-                        nth_term = a1 + (n - 1) * d
-                        steps.append(f"  {n}th term: aₙ = a₁ + (n-1)d = {nth_term}")
-                        return '\n'.join(steps), sympy.sympify(f"{a1} + ({n}-1)*{d}")
-                    
-                    # Sum of terms
-                    if "sum" in text:
-                        n = self._extract_integer_before_keyword(text, "sum") or variable
-                        total = (n / 2) * (2 * a1 + (n - 1) * d)
-                        steps.append(f"  Sum of first {n} terms: Sₙ = n/2 * (2a₁ + (n-1)d) = {total}")
-                        return '\n'.join(steps), sympy.sympify(f"({n}/2)*(2*{a1} + ({n}-1)*{d})")
-
-            # --- Geometric Sequence ---
-            elif any(keyword in text for keyword in ['geometric', 'common ratio', 'gₙ']):
-                steps.append("📘 Geometric Sequence Detected")
-                # Example: "Find the sum of 2 + 6 + 18 + ... up to 5 terms"
-                terms = self._extract_sequence(text)
-                if len(terms) >= 2:
-                    a1 = terms[0]
-                    r = terms[1] / terms[0]
-                    steps.append(f"  First term (a₁) = {a1}")
-                    steps.append(f"  Common ratio (r) = {r}")
-                    
-                    # Nth term
-                    if "term" in text:
-                        n = self._extract_integer_before_keyword(text, "term") or variable
-                        nth_term = a1 * (r ** (n - 1))
-                        steps.append(f"  {n}th term: gₙ = a₁ * r^(n-1) = {nth_term}")
-                        return '\n'.join(steps), sympy.sympify(f"{a1}*({r}^({n}-1))")
-                    
-                    # Sum of terms
-                    if "sum" in text:
-                        n = self._extract_integer_before_keyword(text, "sum") or variable
-                        if r == 1:
-                            total = n * a1
-                        else:
-                            total = a1 * (1 - r**n) / (1 - r)
-                        steps.append(f"  Sum of first {n} terms: Sₙ = a₁(1-rⁿ)/(1-r) = {total}")
-                        return '\n'.join(steps), sympy.sympify(f"{a1}*(1-{r}^{n})/(1-{r})")
-
-            # --- Summation (Σ) ---
-            elif "sum" in text or "sigma" in text:
-                steps.append("📘 Summation (Σ) Detected")
-                # Example: "Sum of 1 + 2 + 3 + ... + 100"
-                if "..." in text:
-                    start, end = self._extract_range(text)
-                    if start == 1 and "n" not in text:
-                        total = end * (end + 1) // 2  # Triangular numbers
-                        steps.append(f"  Sum of 1 to {end}: S = n(n+1)/2 = {total}")
-                        return '\n'.join(steps), sympy.sympify(f"{end}*({end}+1)/2")
-                # Handle symbolic sums like Σ(n^2, n=1 to k)
-                elif "sigma" in text or "sum" in text:
-                    expr = self._extract_summation_expression(text)
-                    if expr:
-                        n = sympy.Symbol(variable)
-                        total = sympy.Sum(expr, (n, 1, variable)).doit()
-                        steps.append(f"  Summation: Σ({expr}) = {total}")
-                        return '\n'.join(steps), total
-
-            # --- Convergence Tests (Advanced) ---
-            elif any(word in text for word in ['converge', 'diverge', 'infinite series']):
-                steps.append("📘 Convergence Test Detected")
-                expr = self._extract_series_expression(text)
-                if expr:
-                    n = sympy.Symbol(variable)
-                    convergence = sympy.limit(expr, n, sympy.oo)
-                    if convergence == 0:
-                        steps.append(f"  Series may converge (terms → 0). Further tests needed.")
-                    else:
-                        steps.append(f"  Series diverges (terms → {convergence}).")
-                    return '\n'.join(steps), None
-
-            return "❌ Could not identify series type. Try phrases like '10th term of 2,5,8,...' or 'sum of 1+2+3+...+100'.", None
-
-        except Exception as e:
-            print(f"❌ SeriesSolver Error: {e}")
-            return f"❌ Error: {str(e)}", None
-
-    # --- Helper Methods ---
-    def _extract_sequence(self, text: str) -> list[float]:
-        """Extract numbers from phrases like '3, 7, 11' or '2 + 6 + 18'."""
-        numbers = []
-        # Match commas or '+' separated numbers
-        parts = [p.strip() for p in text.replace('+', ',').split(',') if p.strip().replace('.', '').isdigit()]
-        for p in parts:
-            try:
-                numbers.append(float(p))
-            except ValueError:
-                continue
-        return numbers
-
-    def _extract_integer_before_keyword(self, text: str, keyword: str) -> int | None:
-        """Extract '10' from phrases like '10th term'."""
-        words = text.split()
-        for i, word in enumerate(words):
-            if keyword in word:
-                if i > 0 and words[i-1].isdigit():
-                    return int(words[i-1])
-        return None
-
-    def _extract_range(self, text: str) -> Tuple[int, int]:
-        """Extract range from '1 + 2 + ... + 100'."""
-        parts = text.split('...')
-        start = int(parts[0].split()[-1]) if parts[0].split() else 1
-        end = int(parts[1].split()[0]) if parts[1].split() else start
-        return start, end
-
-    def _extract_summation_expression(self, text: str) -> sympy.Expr | None:
-        """Extract Σ(n^2, n=1 to k) or similar."""
-        try:
-            # Simple case: "sum of n^2 from n=1 to k"
-            expr_part = text.split('sum of')[-1].split('from')[0].strip()
-            return sympy.sympify(expr_part)
-        except:
-            return None
\ No newline at end of file
+import logging
+import re
+import sympy
+from fractions import Fraction
+from solvemath import closedform, convergence, sequences
+from solvemath.base import SolveMath
+from solvemath.closedform import format_exact
+from solvemath.instrument import stage
+from solvemath.parser import parse_expression
+from typing import Tuple
+
+log = logging.getLogger(__name__)
+
+NUMBER = r'-?\d+(?:\.\d+)?(?:/\d+)?'
+# Two or more numbers separated by ',' or '+': '3, 7, 11', '2 + 6 + 18'
+_RUN = re.compile(rf'{NUMBER}(?:\s*[,+]\s*{NUMBER})+')
+_NTH = re.compile(r'(\d+)\s*(?:st|nd|rd|th)\s+term|term\s+(?:number\s+)?(\d+)|\bn\s*=\s*(\d+)')
+_COUNT = re.compile(r'(?:first|up\s*to)\s+(\d+)|(\d+)\s+terms')
+_BOUNDS = re.compile(r'\b([a-z])\s*=\s*(-?\d+)\s*(?:to|\.\.)\s*(-?\d+|[a-z]\w*)')
+_SIGMA = re.compile(r'sums?\s+of|sigma|[σΣ]|sums?')
+# Range requests: 'terms 1..10000', 'partial sums 1 to 50', 'first 100 terms', 'partial sums up to 1000'
+_VALUES_RANGE = re.compile(r'\b(?:terms?|sums?)\s+(?:from\s+)?(\d+)\s*(?:\.\.(?!\.)|to)\s*(\d+)')
+_VALUES_FIRST = re.compile(r'\b(?:first|up\s*to)\s+(\d+)|(\d+)\s+(?:partial\s+sums|terms)')
+_PARTIAL = re.compile(r'\bpartial\s+sums?\b')
+# Words around the summand in 'does the infinite series 1/n^2 converge?'
+_CONVERGENCE_WORDS = re.compile(
+    r'\b(?:does|do|is|it|the|an|infinite|geometric|arithmetic|harmonic|alternating|series|sum|sigma|converges?|diverges?|convergent|divergent|convergence'
+    r'|divergence|tests?|determine|whether|or|for|of|check|absolutely|conditionally|from)\b|[?σΣ]')
+_INFINITE_BOUNDS = re.compile(r'\b([a-z])\s*(?:=\s*(-?\d+)\s*(?:to|\.\.)\s*(?:∞|oo\b|inf(?:inity)?\b)|(?:≥|>=)\s*(-?\d+))')
+
+class SeriesSolver(SolveMath):
+    def solve(self, problem_text: str, variable: str = 'n', mode: str = 'exact',
+              encoding: str = 'json') -> Tuple[str, sympy.Expr | None]:
+        return self.run_steps(self.iter_solve(problem_text, variable, mode, encoding))
+
+    def iter_solve(self, problem_text: str, variable: str = 'n', mode: str = 'exact', encoding: str = 'json'):
+        """Range requests ('terms 1..10000 of ...', 'partial sums up to 500 of ...')
+        return (result, None, values) where values is the sequences.encode_values()
+        payload; `mode` picks exact or float64 values and `encoding` json or base64."""
+        if mode not in sequences.MODES:
+            return f"❌ Error: Unknown mode '{mode}'. Use one of: {', '.join(sequences.MODES)}.", None
+        if encoding not in sequences.ENCODINGS:
+            return f"❌ Error: Unknown encoding '{encoding}'. Use one of: {', '.join(sequences.ENCODINGS)}.", None
+        log.debug("SeriesSolver activated for %r", problem_text)
+        text = problem_text.lower()
+        steps = []
+
+        try:
+
+            # --- Convergence Tests (Advanced) ---
+            # Checked first: "does the geometric series 1/2^n converge" is a convergence question.
+            if any(word in text for word in ['converge', 'diverge', 'infinite series']):
+                yield self.step(steps, "📘 Convergence Test Detected")
+                with stage("parse"):
+                    found = self._extract_series_expression(text, variable)
+                if found:
+                    expr, n, start = found
+                    start = convergence.first_defined(expr, n, start)
+                    yield self.step(steps, f"  Series: Σ aₙ for {n} ≥ {start}, aₙ = {expr}")
+                    tests = convergence.iter_tests(expr, n, start)
+                    verdict = None
+                    while True:
+                        # Time the tests, not the consumer of each step.
+                        with stage("solve"):
+                            found = next(tests, None)
+                        if found is None:
+                            break
+                        name, outcome = found
+                        yield self.step(steps, f"  {name.capitalize()} test: {outcome.detail}")
+                        verdict = outcome.verdict and (name, outcome.verdict)
+                    if verdict:
+                        name, result = verdict
+                        mark = "✅" if result == "converges" else "❌"
+                        yield self.step(steps, f"  {mark} The series {result} (by the {name} test).")
+                    else:
+                        with stage("estimate"):
+                            outcome = convergence.estimate(expr, n, start)
+                        yield self.step(steps, f"  No test was decisive; {outcome.detail}.")
+                    return '\n'.join(steps), None
+
+            elif any(keyword in text for keyword in ['arithmetic', 'common difference', 'aₙ']):
+                yield self.step(steps, "📘 Arithmetic Sequence Detected")
+
+                terms = self._extract_sequence(text)
+                if len(terms) >= 2:
+                    a1 = terms[0]
+                    d = terms[1] - terms[0]
+                    yield self.step(steps, f"  First term (a₁) = {format_exact(a1)}")
+                    yield self.step(steps, f"  Common difference (d) = {format_exact(d)}")
+
+                    request = self._values_request(text)
+                    if request:
+                        info = {"kind": "arithmetic", "a1": a1, "d": d}
+                        return (yield from self._values(steps, info, *request, mode, encoding))
+
+                    # Sum of terms ("sum of first 20 terms" mentions "term" too)
+                    if "sum" in text:
+                        n = self._extract_count(text)
+                        if n is None:
+                            n = sympy.Symbol(variable)
+                            total = sympy.expand(n / 2 * (2 * self._rational(a1) + (n - 1) * self._rational(d)))
+                            yield self.step(steps, f"  Sum of first n terms: Sₙ = n/2 * (2a₁ + (n-1)d) = {total}")
+                            return '\n'.join(steps), total
+                        with stage("solve"):
+                            total = closedform.arithmetic_sum(a1, d, n)
+                        yield self.step(steps, f"  Sum of first {n} terms: Sₙ = n/2 * (2a₁ + (n-1)d) = {format_exact(total)}")
+                        return '\n'.join(steps), self._exact(total)
+
+                    # Find nth term or specific term
+                    if "term" in text:
+                        n = self._extract_nth(text)
+                        if n is None:
+                            n = sympy.Symbol(variable)
+                            nth_term = sympy.expand(self._rational(a1) + (n - 1) * self._rational(d))
+                            yield self.step(steps, f"  nth term: aₙ = a₁ + (n-1)d = {nth_term}")
+                            return '\n'.join(steps), nth_term
+                        with stage("solve"):
+                            nth_term = closedform.arithmetic_term(a1, d, n)
+                        yield self.step(steps, f"  {n}th term: aₙ = a₁ + (n-1)d = {format_exact(nth_term)}")
+                        return '\n'.join(steps), self._exact(nth_term)
+
+            # --- Geometric Sequence ---
+            elif any(keyword in text for keyword in ['geometric', 'common ratio', 'gₙ']):
+                yield self.step(steps, "📘 Geometric Sequence Detected")
+                # Example: "Find the sum of 2 + 6 + 18 + ... up to 5 terms"
+                terms = self._extract_sequence(text)
+                if len(terms) >= 2 and terms[0] != 0:
+                    a1 = terms[0]
+                    r = terms[1] / terms[0]
+                    yield self.step(steps, f"  First term (a₁) = {format_exact(a1)}")
+                    yield self.step(steps, f"  Common ratio (r) = {format_exact(r)}")
+
+                    request = self._values_request(text)
+                    if request:
+                        info = {"kind": "geometric", "a1": a1, "r": r}
+                        return (yield from self._values(steps, info, *request, mode, encoding))
+
+                    # Sum of terms
+                    if "sum" in text:
+                        n = self._extract_count(text)
+                        if n is None:
+                            n = sympy.Symbol(variable)
+                            a, q = self._rational(a1), self._rational(r)
+                            total = n * a if q == 1 else a * (1 - q ** n) / (1 - q)
+                            yield self.step(steps, f"  Sum of first n terms: Sₙ = a₁(1-rⁿ)/(1-r) = {total}")
+                            return '\n'.join(steps), total
+                        with stage("solve"):
+                            total = closedform.geometric_sum(a1, r, n)
+                        yield self.step(steps, f"  Sum of first {n} terms: Sₙ = a₁(1-rⁿ)/(1-r) = {format_exact(total)}")
+                        return '\n'.join(steps), self._exact(total)
+
+                    # Nth term
+                    if "term" in text:
+                        n = self._extract_nth(text)
+                        if n is None:
+                            n = sympy.Symbol(variable)
+                            nth_term = self._rational(a1) * self._rational(r) ** (n - 1)
+                            yield self.step(steps, f"  nth term: gₙ = a₁ * r^(n-1) = {nth_term}")
+                            return '\n'.join(steps), nth_term
+                        with stage("solve"):
+                            nth_term = closedform.geometric_term(a1, r, n)
+                        yield self.step(steps, f"  {n}th term: gₙ = a₁ * r^(n-1) = {format_exact(nth_term)}")
+                        return '\n'.join(steps), self._exact(nth_term)
+
+            # --- Summation (Σ) ---
+            elif "sum" in text or "sigma" in text or "σ" in text:
+                yield self.step(steps, "📘 Summation (Σ) Detected")
+                # Example: "Sum of 1 + 2 + 3 + ... + 100"
+                if "..." in text:
+                    terms, last = self._extract_range(text)
+                    info = closedform.classify_terms(terms, last)
+                    count = info and (info["count"] if last is not None else self._extract_count(text))
+                    request = info and self._values_request(text, count)
+                    if request:
+                        return (yield from self._values(steps, info, *request, mode, encoding))
+                    if count:
+                        with stage("solve"):
+                            total = closedform.series_sum(info, count)
+                        yield self.step(steps, self._series_step(info, count, total))
+                        return '\n'.join(steps), self._exact(total)
+                # Handle symbolic sums like Σ(n^2, n=1 to k)
+                else:
+                    with stage("parse"):
+                        expr, n, lo, hi = self._extract_summation(text, variable)
+                    if expr is not None and _PARTIAL.search(text) and isinstance(hi, int):
+                        coeffs = self._polynomial_coeffs(expr, n)
+                        info = ({"kind": "polynomial", "coeffs": coeffs} if coeffs is not None else
+                                {"kind": "function", "func": sympy.lambdify(n, expr, "numpy")})
+                        return (yield from self._values(steps, info, "partial_sums", lo, hi, mode, encoding, lo))
+                    if expr is not None:
+                        with stage("solve"):
+                            total = self._polynomial_sum(expr, n, lo, hi)
+                            if total is None:
+                                total = sympy.Sum(expr, (n, lo, hi)).doit()
+                        exact = isinstance(total, Fraction)
+                        shown = format_exact(total) if exact else total
+                        yield self.step(steps, f"  Summation: Σ({expr}, {n} = {lo} to {hi}) = {shown}")
+                        return '\n'.join(steps), self._exact(total) if exact else total
+
+            return "❌ Could not identify series type. Try phrases like '10th term of 2,5,8,...' or 'sum of 1+2+3+...+100'.", None
+
+        except Exception as e:
+            log.debug("SeriesSolver failed on %r", problem_text, exc_info=True)
+            return f"❌ Error: {str(e)}", None
+
+    # --- Helper Methods ---
+    def _extract_sequence(self, text: str) -> list[Fraction]:
+        """Extract exact terms from phrases like '3, 7, 11' or '2 + 6 + 1/2'."""
+        runs = _RUN.findall(text)
+        if not runs:
+            return []
+        longest = max(runs, key=len)
+        return [closedform.to_fraction(p) for p in re.findall(NUMBER, longest)]
+
+    def _extract_nth(self, text: str) -> int | None:
+        """Extract 10 from '10th term', 'term 10' or 'n = 10'."""
+        match = _NTH.search(text)
+        return int(next(g for g in match.groups() if g)) if match else None
+
+    def _extract_count(self, text: str) -> int | None:
+        """Extract 20 from 'first 20 terms' or 'up to 20 terms'."""
+        match = _COUNT.search(text)
+        return int(next(g for g in match.groups() if g)) if match else None
+
+    def _extract_range(self, text: str) -> Tuple[list, Fraction | None]:
+        """Extract the listed terms and the last term from '1 + 2 + ... + 100'."""
+        head, _, tail = text.partition('...')
+        terms = self._extract_sequence(head)
+        if not terms:
+            terms = [closedform.to_fraction(p) for p in re.findall(NUMBER, head)[-1:]]
+        last = re.match(rf'\s*[,+]?\s*({NUMBER})\b(?!\s*terms)', tail)
+        return terms, closedform.to_fraction(last.group(1)) if last else None
+
+    def _extract_summation(self, text: str, variable: str):
+        """Σ(n^2, n=1 to k), 'sum of n^2 from n=1 to 100' → (expr, index, lower, upper)."""
+        bounds = _BOUNDS.search(text)
+        keyword = _SIGMA.search(text)
+        start = keyword.end() if keyword else 0
+        end = bounds.start() if bounds and bounds.start() > start else len(text)
+        expr_part = re.sub(r'\b(?:from|for|where|with)\s*$', '', text[start:end].strip()).strip(' ,')
+        if expr_part.startswith('(') and expr_part.count('(') > expr_part.count(')'):
+            expr_part = expr_part[1:]   # the opening paren of 'Σ(n^2, n=1 to k)'
+        try:
+            expr = parse_expression(expr_part)
+        except Exception:
+            return None, None, None, None
+        if bounds:
+            n = sympy.Symbol(bounds.group(1))
+            lo = int(bounds.group(2))
+            hi = bounds.group(3)
+            hi = int(hi) if re.fullmatch(r'-?\d+', hi) else sympy.Symbol(hi)
+        else:
+            n = sympy.Symbol(variable)
+            lo, hi = 1, sympy.Symbol('k' if variable != 'k' else 'm')
+        return expr, n, lo, hi
+
+    def _values_request(self, text: str, count: int | None = None) -> Tuple[str, int, int] | None:
+        """('terms' | 'partial_sums', lo, hi) for range requests, else None.
+
+        'first 20 terms' alone lists terms; next to 'sum' it is a single sum.
+        Partial sums without a range run over the `count` terms of a listed series.
+        """
+        kind = "partial_sums" if _PARTIAL.search(text) else "terms"
+        match = _VALUES_RANGE.search(text)
+        if match:
+            return kind, int(match.group(1)), int(match.group(2))
+        if kind == "terms" and "sum" in text:
+            return None
+        match = _VALUES_FIRST.search(text)
+        if match:
+            return kind, 1, int(next(g for g in match.groups() if g))
+        if kind == "partial_sums" and count:
+            return kind, 1, count
+        return None
+
+    def _values(self, steps: list, info: dict, kind: str, lo: int, hi: int, mode: str, encoding: str,
+                first: int = 1):
+        """Compute a whole range of terms / partial sums and finish the solve with it."""
+        if hi < lo or (lo < 1 and info["kind"] not in ("polynomial", "function")):
+            return f"❌ Error: Invalid range {lo}..{hi}.", None
+        if hi - lo + 1 > sequences.MAX_VALUES:
+            return f"❌ Error: At most {sequences.MAX_VALUES} values per request (asked for {hi - lo + 1}).", None
+        with stage("solve"):
+            values, dtype = sequences.evaluate(info, kind, lo, hi, mode, first)
+        with stage("format"):
+            payload = sequences.encode_values(values, dtype, kind, lo, encoding)
+        label = "Terms" if kind == "terms" else "Partial sums"
+        yield self.step(steps, f"  {label} {lo}..{hi}: {sequences.preview(values, dtype)} ({len(values)} values, {dtype})")
+        return '\n'.join(steps), None, payload
+
+    def _extract_series_expression(self, text: str, variable: str):
+        """'does Σ 1/n^2 from n=1 to ∞ converge?' → (1/n**2, n, 1), or None."""
+        start = 1
+        index = None
+        bounds = _INFINITE_BOUNDS.search(text)
+        if bounds:
+            index = sympy.Symbol(bounds.group(1))
+            start = int(bounds.group(2) or bounds.group(3))
+            text = text[:bounds.start()] + text[bounds.end():]
+        expr_part = _CONVERGENCE_WORDS.sub(' ', text).strip(' ,.')
+        if expr_part.startswith('(') and expr_part.count('(') > expr_part.count(')'):
+            expr_part = expr_part[1:]
+        try:
+            expr = parse_expression(expr_part)
+        except Exception:
+            return None
+        if index is None:
+            symbols = sorted(expr.free_symbols, key=str)
+            index = symbols[0] if len(symbols) == 1 else sympy.Symbol(variable)
+        return expr, index, start
+
+    def _polynomial_coeffs(self, expr, n) -> list[Fraction] | None:
+        """Coefficients c_0, c_1, ... of a polynomial in `n` with rational coefficients, else None."""
+        if not expr.free_symbols <= {n} or not expr.is_polynomial(n):
+            return None
+        coeffs = sympy.Poly(expr, n).all_coeffs()[::-1]
+        if not all(c.is_Rational for c in coeffs):
+            return None
+        return [closedform.to_fraction(c) for c in coeffs]
+
+    def _polynomial_sum(self, expr, n, lo: int, hi):
+        """Faulhaber for polynomials in `n` with rational coefficients, else None."""
+        coeffs = self._polynomial_coeffs(expr, n)
+        if coeffs is None:
+            return None
+        if isinstance(hi, int):
+            return closedform.polynomial_sum(coeffs, lo, hi)
+        formula = closedform.polynomial_sum_formula(coeffs, lo)
+        return sympy.Add(*(self._rational(c) * hi ** j for j, c in enumerate(formula)))
+
+    def _series_step(self, info: dict, count: int, total) -> str:
+        if info["kind"] == "arithmetic" and info["a1"] == 1 and info["d"] == 1:
+            return f"  Sum of 1 to {count}: S = n(n+1)/2 = {format_exact(total)}"
+        if info["kind"] == "arithmetic":
+            last = closedform.arithmetic_term(info["a1"], info["d"], count)
+            return (f"  Arithmetic series, {count} terms: S = n/2 * (a₁ + aₙ) = "
+                    f"{count}/2 * ({format_exact(info['a1'])} + {format_exact(last)}) = {format_exact(total)}")
+        if info["kind"] == "geometric":
+            return (f"  Geometric series, {count} terms (a₁ = {format_exact(info['a1'])}, r = {format_exact(info['r'])}): "
+                    f"S = a₁(1-rⁿ)/(1-r) = {format_exact(total)}")
+        end = info["start"] + count - 1
+        return f"  Sum of {info['start']}^{info['p']} to {end}^{info['p']}: Faulhaber's formula = {format_exact(total)}"
+
+    @staticmethod
+    def _rational(value) -> sympy.Rational:
+        return sympy.Rational(value.numerator, value.denominator)
+
+    @classmethod
+    def _exact(cls, value) -> sympy.Rational | None:
+        # Numbers too long to print in full are only shown approximately in the steps.
+        return cls._rational(value) if closedform.is_small(value) else None
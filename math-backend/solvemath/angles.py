@@ -0,0 +1,190 @@
+"""Standard angles and general solutions of f(u) = c for the six trig functions.
+
+STANDARD_ANGLES maps each function to {value: principal angle} for the
+multiples of π/12 in the inverse function's principal range, keyed by the
+value rounded to 12 digits so '0.5', '1/2' and 'sin(pi/6)' all hit. A
+solution family u = base + period·n is a Family; sin/csc give two
+families per value with period 2π, cos/sec two (±α), tan/cot one with
+period π. Families that interleave (sin u = 0: 0 + 2πn and π + 2πn) are
+merged into one with half the period.
+
+to_radians()/to_degrees() convert plain numbers and rational multiples
+of π with Fraction arithmetic, so 30° comes back as exactly π/6 without a
+trip through sympy.
+"""
+import math
+import re
+from fractions import Fraction
+from typing import NamedTuple
+
+import sympy
+from sympy import pi
+
+FUNCTIONS = {"sin": sympy.sin, "cos": sympy.cos, "tan": sympy.tan,
+             "csc": sympy.csc, "sec": sympy.sec, "cot": sympy.cot}
+_INVERSE = {"sin": sympy.asin, "cos": sympy.acos, "tan": sympy.atan,
+            "csc": sympy.acsc, "sec": sympy.asec, "cot": sympy.acot}
+# Principal range of each inverse, in multiples of π/12 (inclusive).
+_PRINCIPAL = {"sin": (-6, 6), "csc": (-6, 6), "tan": (-5, 5),
+              "cos": (0, 12), "sec": (0, 12), "cot": (1, 11)}
+
+
+def _key(value) -> float:
+    return round(float(value), 12)
+
+
+def _build_table() -> dict:
+    table = {}
+    for name, (lo, hi) in _PRINCIPAL.items():
+        f = FUNCTIONS[name]
+        entries = table[name] = {}
+        for k in range(lo, hi + 1):
+            angle = k * pi / 12
+            value = f(angle)
+            if value.is_finite:
+                entries.setdefault(_key(value), angle)
+    return table
+
+
+STANDARD_ANGLES = _build_table()
+
+
+class Family(NamedTuple):
+    """u = base + period·n, n ∈ ℤ; period None for an isolated solution."""
+    base: sympy.Expr
+    period: sympy.Expr | None
+
+
+def principal_angle(name: str, value) -> sympy.Expr | None:
+    """The inverse function's principal value: exact from the table, else asin/acos/... in closed form."""
+    value = sympy.sympify(value)
+    if not value.is_real:
+        return None
+    angle = STANDARD_ANGLES[name].get(_key(value))
+    if angle is not None:
+        return angle
+    if name in ("sin", "cos") and abs(value) > 1 or name in ("csc", "sec") and abs(value) < 1:
+        return None
+    angle = _INVERSE[name](value)
+    return angle.evalf() if value.is_Float else angle
+
+
+def general_solution(name: str, value) -> list:
+    """All real u with f(u) = value, as merged Families ([] when there are none)."""
+    alpha = principal_angle(name, value)
+    if alpha is None:
+        return []
+    if name in ("tan", "cot"):
+        families = [Family(alpha, pi)]
+    elif name in ("sin", "csc"):
+        families = [Family(alpha, 2 * pi), Family(pi - alpha, 2 * pi)]
+    else:
+        families = [Family(alpha, 2 * pi), Family(-alpha, 2 * pi)]
+    if alpha.is_Float:
+        families = [Family(f.base.evalf(), f.period) for f in families]
+    return merge(families)
+
+
+def normalize(family: Family) -> Family:
+    """Bring the base into [0, period)."""
+    if family.period is None:
+        return family
+    turns = int(float(family.base / family.period) // 1)
+    if not turns:
+        return family
+    base = family.base - turns * family.period
+    return Family(base.evalf() if family.base.has(sympy.Float) else base, family.period)
+
+
+def merge(families) -> list:
+    """Deduplicate families and fuse pairs that interleave into one of half the period."""
+    out = []
+    for family in map(normalize, families):
+        if family not in out:
+            out.append(family)
+    merged = True
+    while merged:
+        merged = False
+        for i, a in enumerate(out):
+            for b in out[i + 1:]:
+                if a.period is not None and a.period == b.period and _close(abs(a.base - b.base), a.period / 2):
+                    out.remove(a)
+                    out.remove(b)
+                    out.append(normalize(Family(min(a.base, b.base, key=float), a.period / 2)))
+                    merged = True
+                    break
+            if merged:
+                break
+    return sorted(out, key=lambda f: (float(f.base), float(f.period or 0)))
+
+
+def _close(a, b) -> bool:
+    return abs(float(a) - float(b)) < 1e-12
+
+
+def format_period(period) -> str:
+    """2*pi → '2πn', pi/2 → 'πn/2'."""
+    ratio = sympy.nsimplify(period / pi)
+    if not ratio.is_Rational:
+        return f"({period})·n"
+    num = "" if ratio.p == 1 else str(ratio.p)
+    return f"{num}πn" + ("" if ratio.q == 1 else f"/{ratio.q}")
+
+
+_NUMBER = re.compile(r"^-?(?:\d+(?:\.\d*)?|\.\d+)(?:/\d+)?$")
+_PI_MULTIPLE = re.compile(r"^(-?(?:\d+(?:\.\d*)?|\.\d+)?)\s*\*?\s*(?:π|pi)\s*(?:/\s*(\d+))?$")
+
+
+def parse_angle(text: str) -> tuple:
+    """(value, in_pi): '30' → (Fraction(30), False), '2pi/3' → (Fraction(2, 3), True), floats otherwise."""
+    text = text.strip().replace(" ", "")
+    if _NUMBER.match(text):
+        return Fraction(text), False
+    m = _PI_MULTIPLE.match(text)
+    if m:
+        coeff = m.group(1)
+        coeff = Fraction(coeff) if coeff not in ("", "-") else Fraction(-1 if coeff else 1)
+        return coeff / int(m.group(2) or 1), True
+    from solvemath.parser import parse_expression
+    value = parse_expression(text)
+    ratio = value / pi
+    if ratio.is_Rational:
+        return Fraction(int(ratio.p), int(ratio.q)), True
+    if value.is_Rational:
+        return Fraction(int(value.p), int(value.q)), False
+    return float(value), False
+
+
+def format_fraction(value: Fraction) -> str:
+    """3 → '3', 45/2 → '22.5', 1/3 → '1/3'."""
+    if value.denominator == 1:
+        return str(value.numerator)
+    q = value.denominator
+    for p in (2, 5):
+        while q % p == 0:
+            q //= p
+    return f"{float(value):g}" if q == 1 and len(f"{float(value):g}") < 16 else str(value)
+
+
+def format_pi(q: Fraction) -> str:
+    """Fraction(1, 6) → 'π/6', Fraction(-2, 3) → '-2π/3'."""
+    if q == 0:
+        return "0"
+    num = {1: "", -1: "-"}.get(q.numerator, str(q.numerator))
+    return f"{num}π" + ("" if q.denominator == 1 else f"/{q.denominator}")
+
+
+def to_radians(value, in_pi: bool = False) -> tuple:
+    """(exact text or None, float radians) for an angle in degrees."""
+    if isinstance(value, Fraction) and not in_pi:
+        q = value / 180
+        return format_pi(q), float(q) * math.pi
+    return None, math.radians(float(value) * (math.pi if in_pi else 1))
+
+
+def to_degrees(value, in_pi: bool = False) -> tuple:
+    """(exact text or None, float degrees) for an angle in radians."""
+    if isinstance(value, Fraction) and in_pi:
+        degrees = value * 180
+        return format_fraction(degrees), float(degrees)
+    return None, math.degrees(float(value))
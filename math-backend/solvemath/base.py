@@ -1,3 +1,6 @@
+import asyncio
+import functools
+import inspect
 from abc import ABC, abstractmethod
 
 class SolveMath(ABC):
@@ -9,4 +12,67 @@ class SolveMath(ABC):
         Returns:
             str: Formatted solution
         """
-        pass
\ No newline at end of file
+        pass
+
+    def iter_solve(self, equation: str, **kwargs):
+        """Solve step by step
+        Yields:
+            str: Each step line as soon as it is produced
+        Returns:
+            The same (result, expr) pair as solve(), or (result, expr, values)
+            when the solve produced an array of values
+        Solvers that cannot stream inherit this version, which yields nothing.
+        """
+        result = self.solve(equation, **kwargs)
+        yield from ()
+        return result
+
+    async def asolve(self, equation: str, executor=None, **kwargs):
+        """Async solve: runs solve() on `executor` (the loop's default if None)
+        so the CPU-bound sympy work stays off the event loop
+        Returns:
+            The same (result, expr) pair as solve()
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(self.solve, equation, **kwargs))
+
+    async def aiter_solve(self, equation: str, executor=None, **kwargs):
+        """Async iter_solve, advancing the solve on `executor`
+        Yields:
+            ("step", line) for each step as soon as it is produced, then
+            ("result", (result, expr)) once the solve finishes
+        """
+        loop = asyncio.get_running_loop()
+        step_iter = self.iter_solve(equation, **kwargs)
+        while True:
+            event = await loop.run_in_executor(executor, self._next_event, step_iter)
+            yield event
+            if event[0] == "result":
+                return
+
+    @staticmethod
+    def _next_event(step_iter):
+        try:
+            return ("step", next(step_iter))
+        except StopIteration as stop:
+            return ("result", stop.value)
+
+    def solve_options(self, options: dict | None) -> dict:
+        """Keep the request options this solver's iter_solve accepts"""
+        accepted = inspect.signature(self.iter_solve).parameters
+        return {k: v for k, v in (options or {}).items() if k in accepted}
+
+    @staticmethod
+    def step(steps: list, line: str) -> str:
+        """Record a step line and hand it back so iter_solve can yield it"""
+        steps.append(line)
+        return line
+
+    @staticmethod
+    def run_steps(step_iter):
+        """Drain an iter_solve generator and return its final result"""
+        while True:
+            try:
+                next(step_iter)
+            except StopIteration as stop:
+                return stop.value
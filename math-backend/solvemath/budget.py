@@ -0,0 +1,92 @@
+import signal
+import threading
+import time
+from contextlib import contextmanager
+
+
+class BudgetExceeded(BaseException):
+    """Raised inside a solve when its time budget runs out.
+
+    Derives from BaseException so the solvers' blanket `except Exception`
+    handlers cannot swallow the cancellation.
+    """
+
+
+_deadlines = []
+
+
+def _can_interrupt() -> bool:
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+
+def _on_alarm(signum, frame):
+    raise BudgetExceeded()
+
+
+def _arm():
+    if not _deadlines:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        return
+    delay = max(min(_deadlines) - time.monotonic(), 1e-4)
+    signal.setitimer(signal.ITIMER_REAL, delay)
+
+
+@contextmanager
+def time_limit(seconds: float | None):
+    """Interrupt the enclosed block with BudgetExceeded after `seconds`.
+
+    Limits nest: the earliest deadline wins and the outer one is re-armed on
+    exit. Interruption relies on SIGALRM, so it only applies in the main
+    thread of a process (the sandbox workers); elsewhere the block runs
+    unbounded and callers must rely on the sandbox to kill it.
+    """
+    if seconds is None or not _can_interrupt():
+        yield
+        return
+    if not _deadlines:
+        signal.signal(signal.SIGALRM, _on_alarm)
+    _deadlines.append(time.monotonic() + max(seconds, 0))
+    _arm()
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        _deadlines.pop()
+        _arm()
+
+
+def remaining() -> float | None:
+    """Seconds left before the innermost active deadline, or None."""
+    if not _deadlines:
+        return None
+    return max(min(_deadlines) - time.monotonic(), 0.0)
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+class share:
+    """A fraction of the remaining budget, spendable across several blocks.
+
+        symbolic = budget.share(0.5)
+        with symbolic:
+            ...
+        with symbolic:   # same deadline as the first block
+            ...
+
+    Without an active budget the blocks run unbounded.
+    """
+
+    def __init__(self, fraction: float):
+        left = remaining()
+        self.deadline = None if left is None else time.monotonic() + left * fraction
+
+    def __enter__(self):
+        seconds = None if self.deadline is None else self.deadline - time.monotonic()
+        self._limit = time_limit(seconds)
+        return self._limit.__enter__()
+
+    def __exit__(self, *exc):
+        return self._limit.__exit__(*exc)
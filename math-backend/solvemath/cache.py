@@ -0,0 +1,195 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def make_key(solver_code, expression: str, **options) -> str:
+    """Build the cache key for a problem.
+
+    Algebra problems (code 1) are keyed on the solve branch and the
+    equations produced by `extract_equations`, so '2x + 3 = 7' and
+    '2*x+3=7' share an entry but 'factor x^2-9' and 'solve x^2-9' do not.
+    Other solvers read the raw text, so only case and runs of whitespace
+    are folded for them.
+    """
+    text = ' '.join(str(expression).lower().split())
+    if solver_code == 1:
+        # Imported here: utils pulls in sympy, which the app defers until first use.
+        from solvemath.AlgebraSolver import classify
+        from solvemath.utils import extract_equations
+        equations = extract_equations(text)
+        text = f"{classify(text, equations)}:" + (';'.join(equations) or text)
+    opts = ','.join(f"{k}={options[k]}" for k in sorted(options) if options[k] is not None)
+    return f"{solver_code}|{opts}|{text}"
+
+
+class MemoryBackend:
+    """In-process LRU store with optional per-entry TTL."""
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            self._data.move_to_end(key)
+            return entry
+
+    def set(self, key, entry) -> int:
+        """Store an entry and return how many entries were evicted."""
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            evicted = 0
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteBackend:
+    """On-disk LRU store that survives restarts."""
+
+    def __init__(self, path: str = "solve_cache.sqlite3", maxsize: int = 100000):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " expires REAL, used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_used ON results(used)")
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE results SET used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0]), row[1]
+
+    def set(self, key, entry) -> int:
+        value, expires = entry
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, expires, used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), expires, time.time()),
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            evicted = max(0, count - self.maxsize)
+            if evicted:
+                self._conn.execute(
+                    "DELETE FROM results WHERE key IN"
+                    " (SELECT key FROM results ORDER BY used LIMIT ?)",
+                    (evicted,),
+                )
+            return evicted
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+class ResultCache:
+    """Bounded result cache with hit/miss/eviction counters.
+
+    Values must be JSON-serialisable so every backend can store them.
+    """
+
+    def __init__(self, backend=None, ttl: float | None = None):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        entry = self.backend.get(key)
+        if entry is not None and entry[1] is not None and entry[1] < time.time():
+            self.backend.delete(key)
+            with self._lock:
+                self.expirations += 1
+            entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return entry[0]
+
+    def set(self, key, value):
+        expires = time.time() + self.ttl if self.ttl else None
+        evicted = self.backend.set(key, (value, expires))
+        if evicted:
+            with self._lock:
+                self.evictions += evicted
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "size": len(self.backend),
+            "maxsize": self.backend.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def cache_from_env() -> ResultCache | None:
+    """Build the cache described by the SOLVE_CACHE_* environment variables.
+
+    SOLVE_CACHE_BACKEND is 'memory' (default), 'sqlite' or 'none';
+    SOLVE_CACHE_SIZE bounds the entry count, SOLVE_CACHE_TTL is in seconds
+    and SOLVE_CACHE_PATH locates the SQLite file.
+    """
+    kind = os.environ.get("SOLVE_CACHE_BACKEND", "memory").lower()
+    if kind in ("none", "off", ""):
+        return None
+    size = int(os.environ.get("SOLVE_CACHE_SIZE", "4096"))
+    ttl = float(os.environ.get("SOLVE_CACHE_TTL", "0")) or None
+    if kind == "sqlite":
+        backend = SQLiteBackend(os.environ.get("SOLVE_CACHE_PATH", "solve_cache.sqlite3"), size)
+    elif kind == "memory":
+        backend = MemoryBackend(size)
+    else:
+        raise ValueError(f"Unknown SOLVE_CACHE_BACKEND: {kind}")
+    return ResultCache(backend, ttl)
@@ -0,0 +1,253 @@
+"""Exact closed forms for the series SeriesSolver recognizes.
+
+Everything here is integer/Fraction arithmetic: an arithmetic sum up to
+10^9 or the 10^6-th geometric term costs a handful of big-int operations,
+never a loop over the terms and never a sympy call. Power sums use
+Faulhaber's formula, so any finite Σ of a polynomial is exact as well.
+Geometric results that could only be shown in scientific notation anyway
+are returned as a Magnitude (sign and log10), so r**n is never built.
+"""
+import math
+from fractions import Fraction
+from functools import lru_cache
+from typing import NamedTuple
+
+# Results with more bits than this are shown in scientific notation.
+MAX_EXACT_BITS = 200
+
+
+def to_fraction(value) -> Fraction:
+    """'3', '-2.5', '1/3', 7 or a sympy Rational → Fraction."""
+    if isinstance(value, Fraction):
+        return value
+    if hasattr(value, "p") and hasattr(value, "q"):   # sympy Rational/Integer
+        return Fraction(int(value.p), int(value.q))
+    return Fraction(str(value).strip())
+
+
+# --- progressions ---
+
+def arithmetic_term(a1, d, n: int) -> Fraction:
+    return Fraction(a1) + (n - 1) * Fraction(d)
+
+
+def arithmetic_sum(a1, d, n: int) -> Fraction:
+    return Fraction(n, 2) * (2 * Fraction(a1) + (n - 1) * Fraction(d))
+
+
+class Magnitude(NamedTuple):
+    """sign * 10**log10, for a result far past MAX_EXACT_BITS that is never built exactly."""
+    sign: int
+    log10: float
+    integral: bool
+
+
+def _log10(value: Fraction) -> float:
+    return math.log10(abs(value.numerator)) - math.log10(value.denominator)
+
+
+def _huge_power(a1: Fraction, r: Fraction, n: int) -> bool:
+    """Whether a1 * r**n (and a geometric sum up to it) is certainly too long to show exactly.
+
+    Decided from n * log2|r| before r**n is built: 1e9 squarings of 2
+    would take minutes for a number that is printed as ≈ m.mmme+N anyway.
+    """
+    p, q = abs(r.numerator), r.denominator
+    if p <= 1 and q == 1:
+        return False
+    slack = sum(v.bit_length() for v in (a1.numerator, a1.denominator, r.numerator, r.denominator))
+    return n * math.log2(max(p, q)) > 2 * (MAX_EXACT_BITS + slack)
+
+
+def geometric_term(a1, r, n: int) -> Fraction | Magnitude:
+    a1, r = Fraction(a1), Fraction(r)
+    if a1 and _huge_power(a1, r, n - 1):
+        sign = (1 if a1 > 0 else -1) * (-1 if r < 0 and (n - 1) % 2 else 1)
+        integral = r.denominator == 1 and a1.numerator * pow(r.numerator, n - 1, a1.denominator) % a1.denominator == 0
+        return Magnitude(sign, _log10(a1) + (n - 1) * _log10(r), integral)
+    return a1 * r ** (n - 1)
+
+
+def geometric_sum(a1, r, n: int) -> Fraction | Magnitude:
+    a1, r = Fraction(a1), Fraction(r)
+    if r == 1:
+        return n * a1
+    if a1 and _huge_power(a1, r, n):
+        sign = 1 if a1 > 0 else -1
+        if abs(r) < 1:
+            # r**n is lost below the shown digits: S ≈ a1 / (1 - r).
+            return Magnitude(sign, _log10(a1 / (1 - r)), False)
+        if r < 0 and n % 2 == 0:
+            sign = -sign
+        # a1 (r**n - 1) / (r - 1) is whole when that division leaves no remainder.
+        modulus = abs(a1.denominator * (r.numerator - 1))
+        integral = r.denominator == 1 and a1.numerator * (pow(r.numerator, n, modulus) - 1) % modulus == 0
+        return Magnitude(sign, _log10(a1) + n * _log10(r) - _log10(1 - r), integral)
+    return a1 * (1 - r ** n) / (1 - r)
+
+
+def triangular(n: int) -> int:
+    return n * (n + 1) // 2
+
+
+# --- power sums (Faulhaber) ---
+
+@lru_cache(maxsize=None)
+def bernoulli(k: int) -> Fraction:
+    """Bernoulli number B_k with the B_1 = +1/2 convention Faulhaber's formula uses."""
+    if k == 1:
+        return Fraction(1, 2)
+    return _bernoulli_minus(k)
+
+
+@lru_cache(maxsize=None)
+def _bernoulli_minus(k: int) -> Fraction:
+    if k == 0:
+        return Fraction(1)
+    if k > 1 and k % 2:
+        return Fraction(0)
+    return -sum(math.comb(k + 1, j) * _bernoulli_minus(j) for j in range(k)) / (k + 1)
+
+
+@lru_cache(maxsize=64)
+def faulhaber(k: int) -> tuple:
+    """Coefficients c_0..c_{k+1} with 1^k + 2^k + ... + m^k = Σ c_j m^j."""
+    coeffs = [Fraction(0)] * (k + 2)
+    for j in range(k + 1):
+        coeffs[k + 1 - j] = Fraction(math.comb(k + 1, j)) * bernoulli(j) / (k + 1)
+    return tuple(coeffs)
+
+
+def evaluate(coeffs, x):
+    """Horner evaluation of Σ coeffs[j] x^j; exact for Fraction/int x (int for all-int input)."""
+    total = 0
+    for c in reversed(coeffs):
+        total = total * x + c
+    return total
+
+
+def power_sum(k: int, m: int) -> Fraction:
+    """1^k + 2^k + ... + m^k (0 for m = 0; the polynomial extension for m < 0)."""
+    return evaluate(faulhaber(k), m)
+
+
+def polynomial_sum_formula(coeffs, lo: int) -> tuple:
+    """Coefficients, in the upper bound m, of Σ_{i=lo}^{m} p(i) for p = Σ coeffs[k] i^k."""
+    out = [Fraction(0)] * (len(coeffs) + 1)
+    for k, c in enumerate(coeffs):
+        if not c:
+            continue
+        for j, f in enumerate(faulhaber(k)):
+            out[j] += c * f
+    out[0] -= evaluate(out, lo - 1)
+    return tuple(out)
+
+
+def polynomial_sum(coeffs, lo: int, hi: int) -> Fraction:
+    """Σ_{i=lo}^{hi} p(i) exactly, in O(degree²) regardless of hi - lo."""
+    if hi < lo:
+        return Fraction(0)
+    return evaluate(polynomial_sum_formula(coeffs, lo), hi)
+
+
+# --- recognizing a listed series ---
+
+def iroot(x: int, p: int) -> int | None:
+    """The integer p-th root of x, or None when x is not a perfect p-th power."""
+    if x < 0 or x.bit_length() > 1000:
+        return None
+    guess = round(x ** (1.0 / p))
+    for r in (guess - 1, guess, guess + 1):
+        if r >= 0 and r ** p == x:
+            return r
+    return None
+
+
+def classify_terms(terms, last=None) -> dict | None:
+    """Identify the progression behind the listed `terms` (and final term `last`).
+
+    Returns {"kind": "arithmetic" | "geometric" | "powers", ...parameters,
+    "count": number of terms up to `last`} or None. `count` is None without
+    `last`, or when `last` is not a term of the progression.
+    """
+    terms = [Fraction(t) for t in terms]
+    if len(terms) < 2:
+        return None
+    last = None if last is None else Fraction(last)
+
+    d = terms[1] - terms[0]
+    if all(b - a == d for a, b in zip(terms, terms[1:])) and (d != 0 or len(terms) > 2):
+        count = None
+        if last is not None and d != 0:
+            steps = (last - terms[0]) / d
+            count = int(steps) + 1 if steps.denominator == 1 and steps >= 0 else None
+        return {"kind": "arithmetic", "a1": terms[0], "d": d, "count": count}
+
+    if terms[0] != 0:
+        r = terms[1] / terms[0]
+        if all(a != 0 and b / a == r for a, b in zip(terms, terms[1:])):
+            return {"kind": "geometric", "a1": terms[0], "r": r, "count": _geometric_count(terms[0], r, last)}
+
+    if all(t.denominator == 1 and t > 0 for t in terms):
+        for p in range(2, 11):
+            roots = [iroot(int(t), p) for t in terms]
+            if None not in roots and all(b - a == 1 for a, b in zip(roots, roots[1:])):
+                end = None if last is None or last.denominator != 1 else iroot(int(last), p)
+                count = None if end is None or end < roots[0] else end - roots[0] + 1
+                return {"kind": "powers", "p": p, "start": roots[0], "count": count}
+    return None
+
+
+def _geometric_count(a1: Fraction, r: Fraction, last) -> int | None:
+    if last is None or last == 0 or abs(r) in (0, 1):
+        return None
+    ratio = last / a1
+    try:
+        estimate = round(math.log(abs(ratio)) / math.log(abs(r)))
+    except (ValueError, OverflowError):
+        return None
+    for k in (estimate - 1, estimate, estimate + 1):
+        if k >= 0 and r ** k == ratio:
+            return k + 1
+    return None
+
+
+def series_sum(info: dict, count: int) -> Fraction:
+    """Sum of the first `count` terms of a progression described by classify_terms()."""
+    if info["kind"] == "arithmetic":
+        return arithmetic_sum(info["a1"], info["d"], count)
+    if info["kind"] == "geometric":
+        return geometric_sum(info["a1"], info["r"], count)
+    start, p = info["start"], info["p"]
+    return power_sum(p, start + count - 1) - power_sum(p, start - 1)
+
+
+# --- output ---
+
+def is_small(value) -> bool:
+    if isinstance(value, Magnitude):
+        return False
+    value = Fraction(value)
+    return max(value.numerator.bit_length(), value.denominator.bit_length()) <= MAX_EXACT_BITS
+
+
+def format_exact(value) -> str:
+    """Exact 'p' or 'p/q' when reasonably short, else '≈ m.mmme+N (D digits)'."""
+    if isinstance(value, Magnitude):
+        return _scientific(value.sign, value.log10, value.integral)
+    value = Fraction(value)
+    if is_small(value):
+        return str(value)
+    if value == 0:
+        return "0"
+    # math.log10 accepts arbitrarily large ints without converting to str.
+    return _scientific(-1 if value < 0 else 1, _log10(value), value.denominator == 1)
+
+
+def _scientific(sign: int, magnitude: float, integral: bool) -> str:
+    exponent = math.floor(magnitude)
+    mantissa = 10 ** (magnitude - exponent)
+    # A float log10 keeps ~16 significant digits, and the exponent uses up its own share of them.
+    shown = max(1, 15 - len(str(abs(exponent))))
+    digits = f" ({exponent + 1} digits)" if integral else ""
+    return f"≈ {'-' if sign < 0 else ''}{mantissa:.{shown}g}e+{exponent}{digits}"
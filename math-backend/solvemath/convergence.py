@@ -0,0 +1,268 @@
+"""Convergence tests for Σ a_n, cheapest first.
+
+iter_tests() tries pattern matches (p-series, geometric) before the
+nth-term, limit comparison, ratio, root and integral tests, and stops at
+the first definite verdict. Terms with a (-1)^n factor are tested on |a_n|
+first; when that series diverges, the alternating series test decides.
+
+Every test runs under its own slice of the request's time budget
+(TEST_SECONDS, never past the overall deadline), so one slow limit or
+integral cannot eat the whole solve. Limits go through an LRU cache: the
+ratio and root tests often ask for the same limits across requests. When
+no test is decisive, estimate() sums the first terms numerically.
+"""
+import logging
+import math
+import os
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+import sympy
+
+from solvemath import budget, sequences
+from solvemath.budget import BudgetExceeded
+
+log = logging.getLogger(__name__)
+
+# Time allowed per test, in seconds.
+TEST_SECONDS = float(os.environ.get("SOLVE_CONVERGENCE_TEST_SECONDS", "2"))
+# Terms summed by the numeric fallback.
+ESTIMATE_TERMS = 100000
+# Points where "eventually positive and decreasing" is checked numerically.
+_SAMPLES = (10, 100, 1000, 10000)
+
+
+class Outcome(NamedTuple):
+    verdict: str | None     # "converges", "diverges", or None when the test says nothing
+    detail: str
+
+
+@lru_cache(maxsize=1024)
+def limit(expr, n):
+    """lim_{n→∞} expr, or None when sympy cannot find it."""
+    try:
+        return sympy.limit(expr, n, sympy.oo)
+    except (NotImplementedError, ValueError, TypeError, ZeroDivisionError):
+        return None
+
+
+def _ratio(a, n):
+    return sympy.combsimp(sympy.powsimp(a.subs(n, n + 1) / a, force=True))
+
+
+def _unbounded(value) -> bool:
+    """Whether value contains an infinity. sympy calls -li(2) + oo finite, so is_finite alone is not enough."""
+    return value.has(sympy.oo, -sympy.oo, sympy.zoo, sympy.nan)
+
+
+def _finite_real(value) -> bool:
+    return (value is not None and not _unbounded(value) and value.is_extended_real is True
+            and value.is_finite is True)
+
+
+def _eventually_decreasing(a, n) -> bool:
+    """Positive and decreasing at increasingly large n (a numeric spot check)."""
+    try:
+        f = sympy.lambdify(n, a, "math")
+        values = [f(x) for x in _SAMPLES] + [f(_SAMPLES[-1] + 1)]
+    except (ArithmeticError, ValueError, TypeError):
+        return False
+    return all(v > 0 for v in values) and all(a > b for a, b in zip(values, values[1:]))
+
+
+# --- tests: each returns an Outcome, or None when it does not apply ---
+
+def p_series(a, n, start):
+    coeff, exponent = a.as_coeff_exponent(n)
+    if exponent == 0 or coeff.has(n) or not coeff.is_nonzero or not exponent.is_real:
+        return None
+    p = sympy.nsimplify(-exponent)
+    if p > 1:
+        return Outcome("converges", f"p-series Σ c/n^p with p = {p} > 1")
+    return Outcome("diverges", f"p-series Σ c/n^p with p = {p} ≤ 1")
+
+
+def geometric(a, n, start):
+    r = _ratio(a, n)
+    if r.has(n) or not r.is_real:
+        return None
+    if abs(r) < 1:
+        total = sympy.simplify(a.subs(n, start) / (1 - r))
+        return Outcome("converges", f"geometric with ratio r = {r}, |r| < 1; Σ from n={start} is {total}")
+    return Outcome("diverges", f"geometric with ratio r = {r}, |r| ≥ 1")
+
+
+def nth_term(a, n, start):
+    value = limit(a, n)
+    if value is None:
+        return None
+    if value == 0:
+        return Outcome(None, "aₙ → 0, so this test is inconclusive")
+    if isinstance(value, sympy.AccumBounds) or value.is_nonzero or value.is_infinite:
+        return Outcome("diverges", f"aₙ → {value} ≠ 0")
+    return None
+
+
+def comparison(a, n, start):
+    x = sympy.Dummy("x", positive=True)
+    try:
+        coeff, p = a.subs(n, 1 / x).as_leading_term(x).as_coeff_exponent(x)
+    except (NotImplementedError, ValueError, TypeError):
+        return None
+    if coeff.has(x) or not p.is_real:
+        return None
+    power = "n" if p == 1 else f"n^{p}"
+    if isinstance(coeff, sympy.AccumBounds):
+        # Bounded oscillation times n^-p: compare |a_n| with C/n^p.
+        if p > 1:
+            return Outcome("converges", f"|aₙ| ≤ C/{power} and Σ 1/{power} converges (absolutely convergent)")
+        return None
+    if not coeff.is_positive:
+        return None
+    if p > 1:
+        return Outcome("converges", f"aₙ ~ {coeff}/{power}; limit comparison with Σ 1/{power}, p > 1")
+    return Outcome("diverges", f"aₙ ~ {coeff}/{power}; limit comparison with Σ 1/{power}, p ≤ 1")
+
+
+def ratio(a, n, start):
+    value = limit(sympy.Abs(_ratio(a, n)), n)
+    if value is None or not (value.is_infinite or _finite_real(value)):
+        return None
+    if value.is_infinite or value > 1:
+        return Outcome("diverges", f"|aₙ₊₁/aₙ| → {value} > 1")
+    if value < 1:
+        return Outcome("converges", f"|aₙ₊₁/aₙ| → {value} < 1")
+    return Outcome(None, "|aₙ₊₁/aₙ| → 1, so this test is inconclusive")
+
+
+def root(a, n, start):
+    value = limit(sympy.Abs(a) ** (1 / n), n)
+    if value is None or not (value.is_infinite or _finite_real(value)):
+        return None
+    if value.is_infinite or value > 1:
+        return Outcome("diverges", f"|aₙ|^(1/n) → {value} > 1")
+    if value < 1:
+        return Outcome("converges", f"|aₙ|^(1/n) → {value} < 1")
+    return Outcome(None, "|aₙ|^(1/n) → 1, so this test is inconclusive")
+
+
+def integral(a, n, start):
+    if not _eventually_decreasing(a, n):
+        return None
+    x = sympy.Symbol("x", positive=True)
+    value = sympy.integrate(a.subs(n, x), (x, start, sympy.oo))
+    if value.has(sympy.Integral):
+        return None
+    # aₓ is positive here, so an integral that picked up +∞ (like -li(2) + oo for 1/ln x) diverges.
+    if value.is_infinite or (value.has(sympy.oo) and not value.has(-sympy.oo, sympy.zoo, sympy.nan)):
+        return Outcome("diverges", f"∫_{start}^∞ aₓ dx diverges")
+    if _finite_real(value):
+        return Outcome("converges", f"∫_{start}^∞ aₓ dx = {value} is finite")
+    return None
+
+
+def alternating(b, n, start):
+    """Leibniz: Σ (-1)^n b_n converges when b_n decreases to 0."""
+    if limit(b, n) == 0 and _eventually_decreasing(b, n):
+        return Outcome("converges", "|aₙ| decreases to 0 (conditionally convergent)")
+    return None
+
+
+TESTS = (
+    ("p-series", p_series),
+    ("geometric", geometric),
+    ("nth-term", nth_term),
+    ("comparison", comparison),
+    ("ratio", ratio),
+    ("root", root),
+    ("integral", integral),
+)
+
+
+def _bounded(test, *args) -> Outcome | None:
+    """Run one test within TEST_SECONDS; a timed-out test is skipped."""
+    try:
+        with budget.time_limit(TEST_SECONDS):
+            return test(*args)
+    except BudgetExceeded:
+        if budget.expired():
+            raise
+        return Outcome(None, f"gave no answer within {TEST_SECONDS:g}s")
+    except Exception:
+        # sympy raises all sorts on expressions a test cannot handle.
+        log.debug("%s test failed", getattr(test, "__name__", test), exc_info=True)
+        return None
+
+
+def split_sign(a, n):
+    """(True, |a_n|) for a_n = (-1)^(n+k)·b_n, else (False, a_n)."""
+    sign = [f for f in sympy.Mul.make_args(a) if f.is_Pow and f.base == -1 and f.exp.has(n)]
+    if not sign:
+        return False, a
+    return True, a / sympy.Mul(*sign)
+
+
+def first_defined(a, n, start: int, tries: int = 10) -> int:
+    """The first index from `start` where a_n is finite (1/(n log n) starts at 2)."""
+    for k in range(start, start + tries):
+        if a.subs(n, k).is_finite:
+            return k
+    return start
+
+
+def iter_tests(a, n, start: int = 1):
+    """Yield (test name, Outcome) cheapest first; the last has a definite verdict if any test found one."""
+    signed, magnitude = split_sign(a, n)
+    for name, test in TESTS:
+        # a_n → 0 exactly when |a_n| → 0, so every test looks at |a_n|.
+        outcome = _bounded(test, magnitude, n, start)
+        if outcome is None:
+            continue
+        if signed and name == "nth-term" and outcome.verdict == "diverges":
+            outcome = Outcome("diverges", outcome.detail.replace("aₙ", "|aₙ|", 1) + ", so aₙ does not tend to 0")
+        if signed and outcome.verdict == "converges":
+            outcome = Outcome("converges", f"{outcome.detail} for |aₙ|, so the series converges absolutely")
+        if signed and outcome.verdict == "diverges" and name != "nth-term":
+            yield name, Outcome(None, f"{outcome.detail} for |aₙ|, so it is not absolutely convergent")
+            outcome = _bounded(alternating, magnitude, n, start)
+            if outcome is not None:
+                yield "alternating series", outcome
+                return
+            continue
+        yield name, outcome
+        if outcome.verdict:
+            return
+
+
+def _numeric_terms(a, n, lo: int, hi: int) -> np.ndarray:
+    try:
+        func = sympy.lambdify(n, a, "numpy")
+        return sequences.numeric_terms({"kind": "function", "func": func}, lo, hi)
+    except (TypeError, AttributeError, NameError):
+        # Functions numpy cannot vectorize (factorial, ...): evaluate term by term.
+        func = sympy.lambdify(n, a, "math")
+        values = []
+        for k in range(lo, hi + 1):
+            try:
+                values.append(float(func(k)))
+            except (ArithmeticError, ValueError):
+                values.append(math.nan)
+        return np.asarray(values)
+
+
+def estimate(a, n, start: int = 1, terms: int = ESTIMATE_TERMS) -> Outcome:
+    """Sum the first `terms` terms numerically and judge how the partial sums behave."""
+    values = _numeric_terms(a, n, start, start + terms - 1)
+    values = values[np.isfinite(values)]
+    if len(values) < 1000:
+        return Outcome(None, "terms are not finite numbers, so no numeric estimate")
+    sums = np.cumsum(values)
+    s3, s4, s5 = (sums[min(k, len(sums)) - 1] for k in (1000, len(sums) // 10, len(sums)))
+    step_early, step_late = s4 - s3, s5 - s4
+    scale = max(1.0, abs(s5))
+    if abs(step_late) <= 1e-9 * scale or (step_early and abs(step_late / step_early) < 0.5):
+        return Outcome(None, f"partial sums settle: S_{len(sums)} ≈ {s5:.10g} (numeric estimate, likely converges)")
+    if step_early and abs(step_late / step_early) > 0.9:
+        return Outcome(None, f"partial sums keep growing: S_{len(sums)} ≈ {s5:.10g} (numeric estimate, likely diverges)")
+    return Outcome(None, f"S_{len(sums)} ≈ {s5:.10g}; the partial sums are still drifting")
@@ -0,0 +1,102 @@
+import math
+import os
+import queue
+import threading
+import time
+
+from solvemath.sandbox import Worker, last_result
+
+
+class PoolSaturated(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Solver pool saturated; retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class SolvePool:
+    """Long-lived, pre-warmed solver processes behind a bounded queue.
+
+    At most `workers` solves run at once and at most `queue_size` more wait
+    for a free worker; anything beyond that is rejected with PoolSaturated
+    so the API can answer 429 instead of piling up threads.
+    """
+
+    def __init__(self, workers: int | None = None, queue_size: int | None = None,
+                 memory_mb: int | None = None, warm: bool = True):
+        self.size = workers or os.cpu_count() or 1
+        self.queue_size = self.size * 4 if queue_size is None else queue_size
+        self._slots = threading.BoundedSemaphore(self.size + self.queue_size)
+        self._idle = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._avg_seconds = 1.0
+        for _ in range(self.size):
+            self._idle.put(Worker(memory_mb, warm).start())
+
+    def submit(self, solver_code, expression, timeout: float | None, block: bool = False,
+               options: dict | None = None) -> dict:
+        """Run one solve on a free worker and return its payload.
+
+        With `block=False` a full pool raises PoolSaturated immediately;
+        batch callers pass `block=True` to wait for a slot instead.
+        """
+        return last_result(self.iter_submit(solver_code, expression, timeout, block, options))
+
+    def iter_submit(self, solver_code, expression, timeout: float | None, block: bool = False,
+                    options: dict | None = None):
+        """Like submit(), but return the worker's step/result event stream.
+
+        The slot is claimed up front, so PoolSaturated is raised here rather
+        than on first iteration; the caller must then iterate the stream.
+        """
+        if not self._slots.acquire(blocking=block):
+            raise PoolSaturated(self.retry_after())
+        with self._lock:
+            self._in_flight += 1
+        return self._stream(solver_code, expression, timeout, options)
+
+    def _stream(self, solver_code, expression, timeout, options):
+        try:
+            worker = self._idle.get()
+            started = time.monotonic()
+            try:
+                yield from worker.iter_run(solver_code, expression, timeout, options)
+            finally:
+                if not worker.alive():
+                    worker.start()
+                self._idle.put(worker)
+                self._record(time.monotonic() - started)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def _record(self, seconds: float):
+        with self._lock:
+            self._avg_seconds = 0.9 * self._avg_seconds + 0.1 * seconds
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog should have drained."""
+        with self._lock:
+            backlog = self._in_flight / self.size
+            return max(1, math.ceil(backlog * self._avg_seconds))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.size,
+                "queue_size": self.queue_size,
+                "in_flight": self._in_flight,
+                "busy": min(self._in_flight, self.size),
+                "waiting": max(0, self._in_flight - self.size),
+                "avg_solve_seconds": round(self._avg_seconds, 4),
+            }
+
+    def shutdown(self):
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
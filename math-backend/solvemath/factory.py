@@ -1,13 +1,118 @@
-from solvemath.algebra_solver import AlgebraSolver
-from solvemath.series_solver import SeriesSolver
-from solvemath.trigonometry_solver import TrigonometrySolver
+"""Solver registry: solvers by code or name, imported on first use.
+
+Each solver registers a code, a name and a "module:Class" path. Nothing
+is imported until a solver is first asked for, so importing the app does
+not pull in sympy or matplotlib. Solvers keep no per-request state, so
+each one is built once and shared by every request and thread.
+
+preload() pays the import (and optionally warm-up) cost up front. App
+startup calls preload_from_env(), which reads SOLVE_PRELOAD: empty or "0"
+for nothing, "1"/"all" for every solver, or a comma-separated list of
+codes and names. SOLVE_PRELOAD_WARM=1 also runs each solver's WARMUP
+problems so sympy's first-call caches are filled.
+"""
+import importlib
+import logging
+import os
+import threading
+from typing import NamedTuple
+
+log = logging.getLogger(__name__)
+
+
+class InvalidSolverCode(ValueError):
+    pass
+
+
+class Registration(NamedTuple):
+    code: int
+    name: str
+    target: str             # "module:Class"
+    cached: bool = True     # whether results may go in the service's result cache
+
+
+REGISTRY = {}               # code → Registration
+_BY_NAME = {}               # name → code
+_instances = {}
+_lock = threading.Lock()
+
+# A few cheap problems per solver, run by warm workers (and by preload with
+# warm=True) before the first real request.
+WARMUP = {
+    1: ["2x + 3 = 7", "x^2 - 5x + 6 = 0", "x + y = 2, x - y = 0"],
+    2: ["sum of 1 + 2 + ... + 10"],
+    3: ["solve sin(x) = 0.5"],
+}
+
+
+def register(code: int, name: str, target: str, cached: bool = True):
+    """Register `target` ("module:Class") under `code` and `name`."""
+    REGISTRY[code] = Registration(code, name, target, cached)
+    _BY_NAME[name] = code
+
+
+register(1, "algebra", "solvemath.AlgebraSolver:AlgebraSolver")
+register(2, "series", "solvemath.SeriesSolver:SeriesSolver")
+register(3, "trigonometry", "solvemath.trigonometry:TrigonometrySolver")
+register(4, "geometry", "solvemath.geometry:GeometrySolver")
+# Plot results carry a whole base64 image; /plot and the compile caches cover repeats.
+register(5, "plot", "solvemath.plot:PlotSolver", cached=False)
+
+
+def cacheable(code) -> bool:
+    """Whether results for a (resolved) code may be kept in the result cache."""
+    registration = REGISTRY.get(code)
+    return registration is None or registration.cached
+
+
+def resolve(code):
+    """The registered code for a code or name, else `code` unchanged."""
+    if isinstance(code, str):
+        key = code.strip().lower()
+        if key in _BY_NAME:
+            return _BY_NAME[key]
+        if key.isdigit():
+            return int(key)
+    return code
+
+
+def _build(registration: Registration):
+    module, _, cls = registration.target.partition(":")
+    return getattr(importlib.import_module(module), cls)()
+
 
 class SolverFactory:
     def get_solver_by_code(self, code):
-        if code == 1:
-            return AlgebraSolver()
-        elif code == 2:
-            return SeriesSolver()
-        elif code == 3:
-            return TrigonometrySolver()
-        return None
+        """The shared solver for a code or name, or None when there is none."""
+        code = resolve(code)
+        solver = _instances.get(code)
+        if solver is not None:
+            return solver
+        registration = REGISTRY.get(code)
+        if registration is None:
+            return None
+        with _lock:
+            # Another thread may have built it while we waited.
+            if code not in _instances:
+                _instances[code] = _build(registration)
+            return _instances[code]
+
+    def preload(self, codes=None, warm: bool = False):
+        """Import and build the given solvers (all by default); with `warm`, run their WARMUP problems."""
+        for code in (REGISTRY if codes is None else codes):
+            solver = self.get_solver_by_code(code)
+            if solver is None:
+                log.warning("Cannot preload unknown solver %r", code)
+                continue
+            for problem in (WARMUP.get(resolve(code), []) if warm else ()):
+                try:
+                    solver.solve(problem)
+                except Exception:
+                    log.debug("Warm-up problem %r failed", problem, exc_info=True)
+
+    def preload_from_env(self):
+        spec = os.environ.get("SOLVE_PRELOAD", "").strip().lower()
+        if spec in ("", "0", "false", "no"):
+            return
+        codes = None if spec in ("1", "all", "true", "yes") else [c.strip() for c in spec.split(",") if c.strip()]
+        self.preload(codes, warm=os.environ.get("SOLVE_PRELOAD_WARM", "") in ("1", "true", "yes"))
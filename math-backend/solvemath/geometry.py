@@ -1,14 +1,55 @@
-from .base import SolveMath
-import math
-import re
+import logging
+
+from solvemath import shapes
+from solvemath.base import SolveMath
+from solvemath.instrument import stage
+from typing import Tuple
+
+log = logging.getLogger(__name__)
+
 
 class GeometrySolver(SolveMath):
-    def solve(self, equation: str) -> str:
+    def solve(self, problem_text: str) -> Tuple[str, None]:
+        return self.run_steps(self.iter_solve(problem_text))
+
+    def iter_solve(self, problem_text: str):
+        """Measures of one shape from the formula table (shapes.TABLE), one step per measure."""
+        log.debug("GeometrySolver activated for %r", problem_text)
+        steps = []
         try:
-            if "area of circle" in equation.lower():
-                radius = float(re.findall(r'\d+', equation)[0])
-                area = math.pi * radius ** 2
-                return f"Area: {round(area, 2)}"
-            return "Unsupported geometry problem."
+            with stage("parse"):
+                problem = shapes.read_problem(problem_text)
+            if problem is None:
+                return ("❌ Unsupported geometry problem. Try 'area of circle with radius 2.5', "
+                        "'volume of cylinder radius 3 height 5' or 'distance between (1, 2) and (4, 6)'."), None
+            shape, wanted, params = problem
+            yield self.step(steps, f"📘 Geometry: {shape}")
+            if params:
+                yield self.step(steps, "  Given: " + ", ".join(f"{k} = {v:.10g}" for k, v in params.items()))
+
+            with stage("solve"):
+                formulas = shapes.choose(shape, wanted, params)
+                out = shapes.evaluate(shape, {k: [v] for k, v in params.items()}, [f.measure for f in formulas])
+            if "d" in params and "r" not in params:
+                yield self.step(steps, f"  r = d / 2 = {params['d'] / 2:.10g}")
+            if not out["valid"][0]:
+                yield self.step(steps, f"❌ No {shape} has these measurements.")
+                return '\n'.join(steps), None
+
+            for f in formulas:
+                value = float(out[f.measure][0])
+                shown = f"{value:.10g}" if value == value else "undefined"
+                if f.measure == "slope" and value != value:
+                    shown = "undefined (vertical line)"
+                yield self.step(steps, f"  {f.measure.replace('_', ' ')} = {f.text} = {shown}")
+            if "midpoint_x" in out and "midpoint_y" in out:
+                yield self.step(steps, f"  midpoint = ({float(out['midpoint_x'][0]):.10g}, "
+                                       f"{float(out['midpoint_y'][0]):.10g})")
+            return '\n'.join(steps), None
+
+        except ValueError as e:
+            yield self.step(steps, f"❌ {e}.")
+            return '\n'.join(steps), None
         except Exception as e:
-            return f"Error: {str(e)}"
\ No newline at end of file
+            log.debug("GeometrySolver failed on %r", problem_text, exc_info=True)
+            return f"❌ Error: {str(e)}", None
@@ -0,0 +1,110 @@
+"""Identity verification: refute numerically, then try to prove symbolically.
+
+verify(lhs, rhs) evaluates both sides at SAMPLES random points in one
+vectorized NumPy call. A single point where they disagree refutes the
+identity in well under a millisecond, with that point as the
+counterexample. Candidates that agree everywhere go to trigsimp, fu and
+expand_trig rewriting, within PROOF_SECONDS of the request's budget. If
+none of them reaches 0 in time, the verdict is "probable" and reports how
+closely the sides agreed.
+"""
+import os
+from typing import NamedTuple
+
+import numpy as np
+import sympy
+from sympy.simplify.fu import fu
+
+from solvemath import budget
+from solvemath.budget import BudgetExceeded
+
+SAMPLES = 64
+# Sampled points are drawn from [-RANGE, RANGE] for every free symbol.
+RANGE = 2 * np.pi
+# Relative disagreement above this refutes the identity.
+TOLERANCE = 1e-8
+# Points where a side is undefined are skipped; fewer usable ones than this is inconclusive.
+MIN_POINTS = 8
+PROOF_SECONDS = float(os.environ.get("SOLVE_IDENTITY_SECONDS", "2"))
+# Fixed seed: the same identity always gets the same verdict (and cache entry).
+SEED = 20240917
+
+
+class Verdict(NamedTuple):
+    status: str             # "proved", "refuted", "probable" or "unknown"
+    detail: str
+
+
+def numeric_check(lhs, rhs, symbols, samples: int = SAMPLES):
+    """(usable points, max relative error, counterexample or None) from one vectorized pass."""
+    rng = np.random.default_rng(SEED)
+    points = rng.uniform(-RANGE, RANGE, size=(len(symbols), samples))
+    with np.errstate(all="ignore"):
+        left = _evaluate(lhs, symbols, points)
+        right = _evaluate(rhs, symbols, points)
+        usable = np.isfinite(left) & np.isfinite(right)
+        error = np.abs(left - right) / np.maximum(1.0, np.maximum(np.abs(left), np.abs(right)))
+    error = np.where(usable, error, 0.0)
+    worst = int(np.argmax(error))
+    counterexample = None
+    if error[worst] > TOLERANCE:
+        at = {str(s): float(points[i, worst]) for i, s in enumerate(symbols)}
+        counterexample = (at, complex(left[worst]), complex(right[worst]))
+    return int(usable.sum()), float(error.max()), counterexample
+
+
+def _evaluate(expr, symbols, points) -> np.ndarray:
+    func = sympy.lambdify(symbols, expr, "numpy")
+    # Complex arithmetic so sqrt/log of negatives give values rather than nan.
+    values = func(*points.astype(complex))
+    return np.broadcast_to(np.asarray(values, dtype=complex), points.shape[1:])
+
+
+REWRITES = (
+    ("trigsimp", sympy.trigsimp),
+    ("fu", fu),
+    ("expand_trig + trigsimp", lambda e: sympy.trigsimp(sympy.expand_trig(e))),
+    ("rewrite in sin/cos + simplify", lambda e: sympy.simplify(e.rewrite(sympy.cos))),
+)
+
+
+def prove(difference, seconds: float = PROOF_SECONDS) -> str | None:
+    """Name of the first rewrite taking `difference` to 0 within `seconds`, else None."""
+    try:
+        with budget.time_limit(seconds):
+            for name, rewrite in REWRITES:
+                try:
+                    if rewrite(difference) == 0:
+                        return name
+                except (TypeError, ValueError, NotImplementedError, AttributeError):
+                    continue
+    except BudgetExceeded:
+        if budget.expired():
+            raise
+    return None
+
+
+def _number(value: complex) -> str:
+    return f"{value.real:.6g}" if abs(value.imag) < 1e-12 else f"{value:.6g}"
+
+
+def verify(lhs, rhs) -> Verdict:
+    symbols = sorted((lhs - rhs).free_symbols, key=str)
+    if not symbols:
+        if sympy.simplify(lhs - rhs) == 0:
+            return Verdict("proved", "both sides are the same constant")
+        return Verdict("refuted", f"{lhs} ≠ {rhs}")
+
+    usable, max_error, counterexample = numeric_check(lhs, rhs, symbols)
+    if counterexample:
+        at, left, right = counterexample
+        where = ", ".join(f"{k} = {v:.6g}" for k, v in at.items())
+        return Verdict("refuted", f"at {where}: LHS ≈ {_number(left)}, RHS ≈ {_number(right)}")
+    if usable < MIN_POINTS:
+        return Verdict("unknown", f"only {usable} of {SAMPLES} random points were in the domain of both sides")
+
+    method = prove(lhs - rhs)
+    if method:
+        return Verdict("proved", f"LHS - RHS → 0 by {method}; sides also agree at {usable} random points")
+    return Verdict("probable", f"sides agree at {usable}/{SAMPLES} random points (max relative error {max_error:.1e}); "
+                               f"no symbolic proof found within {PROOF_SECONDS:g}s")
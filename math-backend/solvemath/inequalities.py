@@ -0,0 +1,225 @@
+"""Polynomial and rational inequalities by sign chart.
+
+Each relation lhs op rhs becomes f op 0 with f = lhs - rhs written over
+one denominator. The numerator and denominator are factored once, over the
+integers (univariate.factor_list). Their real roots are the critical
+points: zeros of the numerator, where f = 0, and zeros of the
+denominator, where f is undefined. Between neighbouring critical points
+no factor changes sign. So one exact rational test point per interval,
+fed to each factor's Poly.eval, fixes the sign of f on the whole
+interval. No floats are used, and there is no general-purpose solver.
+
+A chain like 1 < 2x + 3 ≤ 7 is read as its separate relations, and so is
+a system like "x > 1, x < 5". The answer is the intersection of the
+solution sets. Relations that are not polynomial or rational in one
+unknown with rational coefficients make chart() return None. The caller
+then falls back to sympy.
+"""
+from typing import NamedTuple
+
+import sympy
+from sympy import Poly
+from sympy.core.mul import _keep_coeff
+
+from solvemath import univariate
+
+OPS = ("<", "<=", ">", ">=", "==", "!=")
+_SIGNS = {1: "+", -1: "−", 0: "0"}
+
+
+class Row(NamedTuple):
+    interval: sympy.Set     # an open interval, or the critical point as a FiniteSet
+    test: sympy.Rational | None
+    signs: tuple            # (factor, sign) at the test point
+    sign: int | None        # sign of f; None where f is undefined
+    keep: bool
+
+
+class Chart(NamedTuple):
+    relation: sympy.Rel     # factored f op 0
+    points: tuple           # (point, "zero" or "undefined") in increasing order
+    rows: tuple
+    solution: sympy.Set
+
+
+def relations(statements) -> list:
+    """The relations among parsed statements, with chains split into their parts."""
+    out = []
+    for statement in statements:
+        if isinstance(statement, sympy.And):
+            out.extend(relations(statement.args))
+        elif isinstance(statement, sympy.Rel) and statement.rel_op in OPS:
+            out.append(statement)
+    return out
+
+
+def _factors(poly: Poly):
+    """(coefficient, [(factor Poly, multiplicity)]) for a Poly that may be constant."""
+    if poly.is_ground:
+        return poly.LC(), []
+    coeff, factors = univariate.factor_list(poly)
+    return coeff, list(factors)
+
+
+def _between(lo, hi):
+    """A simple rational strictly between lo and hi (either may be infinite)."""
+    if lo == -sympy.oo and hi == sympy.oo:
+        return sympy.Integer(0)
+    if lo == -sympy.oo:
+        return sympy.floor(hi) - 1
+    if hi == sympy.oo:
+        return sympy.ceiling(lo) + 1
+    mid = (lo + hi) / 2
+    n = sympy.floor(mid)
+    if sympy.floor(lo) + 1 < hi:
+        return n if n > lo else n + 1
+    d = 2
+    while True:
+        t = sympy.Rational(sympy.floor(mid * d), d)
+        if t > lo:
+            return t
+        d *= 2
+
+
+def _keeps(op: str, sign: int) -> bool:
+    return {"<": sign < 0, "<=": sign <= 0, ">": sign > 0, ">=": sign >= 0, "==": sign == 0, "!=": sign != 0}[op]
+
+
+def chart(relation, sym) -> Chart | None:
+    """Sign chart of one relation in `sym`, or None when it is not polynomial/rational over QQ."""
+    f = relation.lhs - relation.rhs
+    if f.has(sympy.Float):
+        f = sympy.nsimplify(f, rational=True)
+    if f.free_symbols - {sym}:
+        return None
+    num, den = sympy.fraction(sympy.together(f))
+    try:
+        num, den = Poly(num, sym), Poly(den, sym)
+        # together() cancels common factors; every divisor in the original is still a hole.
+        holes = [Poly(p.base, sym) for p in f.atoms(sympy.Pow) if p.exp.is_negative and p.base.has(sym)]
+    except sympy.PolynomialError:
+        return None
+    if not all(p.domain.is_ZZ or p.domain.is_QQ for p in (num, den, *holes)) or num.is_zero:
+        return None
+
+    op = relation.rel_op
+    num_coeff, num_factors = _factors(num)
+    den_coeff, den_factors = _factors(den)
+    coeff = num_coeff / den_coeff
+    kinds = {}
+    hole_factors = [factor for hole in holes for factor, _ in _factors(hole)[1]]
+    for factors, kind in (([f for f, _ in num_factors], "zero"),
+                          ([f for f, _ in den_factors] + hole_factors, "undefined")):
+        for factor in factors:
+            for root in factor.real_roots():
+                if kinds.get(root) != "undefined":
+                    kinds[root] = kind
+    points = sorted(kinds, key=lambda p: p.evalf(30))
+
+    # Denominator factors are labelled as reciprocals, so 1/(x - 1) is not read as a second x - 1.
+    labelled = [(factor.as_expr() ** k, factor, k) for factor, k in num_factors]
+    labelled += [(sympy.Mul(1, sympy.Pow(factor.as_expr(), -k), evaluate=False), factor, k)
+                 for factor, k in den_factors]
+    if coeff < 0:
+        labelled.insert(0, (coeff, Poly(coeff, sym), 1))
+    rows = []
+    edges = [-sympy.oo] + points + [sympy.oo]
+    for lo, hi in zip(edges, edges[1:]):
+        t = _between(lo, hi)
+        signs = tuple((shown, int(sympy.sign(factor.eval(t))) ** k) for shown, factor, k in labelled)
+        sign = 1
+        for _, s in signs:
+            sign *= s
+        rows.append(Row(sympy.Interval.open(lo, hi), t, signs, sign, _keeps(op, sign)))
+        if hi != sympy.oo:
+            undefined = kinds[hi] == "undefined"
+            rows.append(Row(sympy.FiniteSet(hi), None, (), None if undefined else 0,
+                            not undefined and _keeps(op, 0)))
+
+    # Unevaluated, so a factor shared by numerator and denominator stays visible.
+    numerator = _keep_coeff(coeff, sympy.Mul(*[f.as_expr() ** k for f, k in num_factors]))
+    factored = numerator if not den_factors else sympy.Mul(
+        numerator, *[sympy.Pow(f.as_expr(), -k) for f, k in den_factors], evaluate=False)
+    shown = sympy.Rel(factored, 0, op, evaluate=False)
+    return Chart(shown, tuple((p, kinds[p]) for p in points), tuple(rows), _union(rows))
+
+
+def _span(first: Row, last: Row) -> sympy.Set:
+    if first is last and first.test is None:
+        return first.interval
+    lo = first.interval.args[0] if first.test is None else first.interval.start
+    hi = last.interval.args[0] if last.test is None else last.interval.end
+    return sympy.Interval(lo, hi, first.test is not None, last.test is not None)
+
+
+def _union(rows) -> sympy.Set:
+    """The kept rows as a set. Rows are in order, so each run of kept rows is one interval;
+    building them directly skips sympy.Union's pairwise merging."""
+    parts, first = [], None
+    for row in rows:
+        if row.keep:
+            first, last = first or row, row
+        elif first is not None:
+            parts.append(_span(first, last))
+            first = None
+    if first is not None:
+        parts.append(_span(first, last))
+    if not parts:
+        return sympy.S.EmptySet
+    return parts[0] if len(parts) == 1 else sympy.Union(*parts, evaluate=False)
+
+
+def solve(statements, sym) -> tuple | None:
+    """(charts, solution set) for every relation in `statements`, or None if any has no sign chart."""
+    charts = []
+    for relation in relations(statements):
+        c = chart(relation, sym)
+        if c is None:
+            return None
+        charts.append(c)
+    if not charts:
+        return None
+    return charts, sympy.Intersection(*(c.solution for c in charts))
+
+
+def _number(value) -> str:
+    return {sympy.oo: "∞", -sympy.oo: "-∞"}.get(value, str(value))
+
+
+def notation(solution: sympy.Set) -> str:
+    """Interval notation: (-∞, -2) ∪ [1, ∞), {3}, ∅."""
+    if solution is sympy.S.EmptySet:
+        return "∅"
+    if solution is sympy.S.Reals:
+        return "(-∞, ∞)"
+    parts = solution.args if isinstance(solution, sympy.Union) else (solution,)
+    out = []
+    for part in parts:
+        if isinstance(part, sympy.Interval):
+            out.append(f"{'(' if part.left_open else '['}{_number(part.start)}, "
+                       f"{_number(part.end)}{')' if part.right_open else ']'}")
+        elif isinstance(part, sympy.FiniteSet):
+            out.append("{" + ", ".join(map(str, part.args)) + "}")
+        else:
+            out.append(str(part))
+    return " ∪ ".join(out)
+
+
+def describe(c: Chart, sym) -> list:
+    """Sign chart lines for one relation."""
+    if c.points:
+        lines = ["  Critical points: " + ", ".join(f"{sym} = {p} ({kind})" for p, kind in c.points)]
+    else:
+        lines = ["  No critical points: the sign never changes"]
+    for row in c.rows:
+        mark = "✓" if row.keep else "✗"
+        if row.test is None:
+            point = row.interval.args[0]
+            value = "undefined" if row.sign is None else "0"
+            lines.append(f"  {sym} = {point}: {value} {mark}")
+        else:
+            signs = ", ".join(f"{shown} ({_SIGNS[s]})" for shown, s in row.signs)
+            lines.append(f"  {notation(row.interval)}: test {sym} = {row.test}"
+                         f"{' → ' + signs if signs else ''} → {_SIGNS[row.sign]} {mark}")
+    lines.append(f"  → {notation(c.solution)}")
+    return lines
@@ -0,0 +1,268 @@
+"""Stage timing, Prometheus metrics, trace IDs and logging setup.
+
+Solvers mark their phases with `stage("simplify")` and friends. The time
+lands in the Trace activated by whoever drives the solve; a sandboxed
+worker ships its trace back to the parent with the result. The parent
+records one histogram sample per stage and writes one structured log
+record per solve, tagged with the request's trace ID.
+
+Logging is off unless SOLVE_LOG_LEVEL is set. When it is on, records go
+through a QueueHandler and a background listener thread, so request
+threads never block on stderr.
+"""
+import atexit
+import bisect
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+log = logging.getLogger("solvemath")
+log.addHandler(logging.NullHandler())
+
+# Generate an ID for requests that do not send X-Request-ID.
+TRACE_IDS = os.environ.get("SOLVE_TRACE_IDS", "1") not in ("0", "false", "no", "")
+# Prometheus' default latency buckets, in seconds.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_trace = contextvars.ContextVar("solve_trace", default=None)
+_trace_id = contextvars.ContextVar("solve_trace_id", default=None)
+_VALID_ID = re.compile(r"[\w.:-]{1,128}")
+
+
+# --- stage timing ---
+
+class Trace:
+    """Accumulated seconds per stage for one solve."""
+
+    def __init__(self):
+        self.stages = {}
+        self.cache_hit = False
+
+    def add(self, name: str, seconds: float):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def merge(self, stages: dict):
+        for name, seconds in stages.items():
+            self.add(name, seconds)
+
+
+@contextmanager
+def activate(trace: Trace | None):
+    """Send stage() timings in this thread to `trace`."""
+    token = _trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _trace.reset(token)
+
+
+@contextmanager
+def stage(name: str):
+    """Time the enclosed block as stage `name` of the active solve, if any.
+
+    Never wrap a `yield` of a step generator: the consumer's time would be
+    counted too.
+    """
+    trace = _trace.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, time.perf_counter() - started)
+
+
+# --- trace IDs ---
+
+def start_request(header_value: str | None = None):
+    """Adopt the client's X-Request-ID (or mint one); returns a token for end_request()."""
+    trace_id = header_value if header_value and _VALID_ID.fullmatch(header_value) else None
+    if trace_id is None and TRACE_IDS:
+        trace_id = uuid.uuid4().hex
+    return _trace_id.set(trace_id)
+
+
+def bind_trace_id(trace_id: str | None):
+    """Use an already-issued trace ID (e.g. inside a worker process); returns a token."""
+    return _trace_id.set(trace_id)
+
+
+def end_request(token):
+    _trace_id.reset(token)
+
+
+def current_trace_id() -> str | None:
+    return _trace_id.get()
+
+
+# --- metrics ---
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label values, Prometheus-style."""
+
+    def __init__(self, name: str, help: str, labels: tuple, buckets=BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][i] += 1
+            series[1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1])) for k, v in self._series.items())
+        for label_values, (counts, total) in items:
+            labels = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labels, label_values))
+            sep = "," if labels else ""
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total:.6f}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            labels = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labels, label_values))
+            lines.append(f"{self.name}{{{labels}}} {value}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+SOLVES = Counter("solve_requests_total", "Solves by solver code and outcome.", ("solver", "status"))
+SOLVE_SECONDS = Histogram("solve_duration_seconds", "End-to-end solve latency.", ("solver",))
+STAGE_SECONDS = Histogram("solve_stage_seconds", "Time spent per solve stage.", ("solver", "stage"))
+
+
+def record_solve(solver_code, status: str, seconds: float, trace: Trace, trace_id: str | None = None):
+    """Feed one finished solve into the metrics and the structured log."""
+    solver = str(solver_code)
+    SOLVES.inc(solver, status)
+    SOLVE_SECONDS.observe(seconds, solver)
+    for name, spent in trace.stages.items():
+        STAGE_SECONDS.observe(spent, solver, name)
+    if log.isEnabledFor(logging.INFO):
+        log.info("solve", extra={"trace_id": trace_id, "fields": {
+            "solver": solver, "status": status, "ms": round(seconds * 1000, 3),
+            "stages_ms": {k: round(v * 1000, 3) for k, v in trace.stages.items()},
+        }})
+
+
+def render_metrics(gauges: dict | None = None) -> str:
+    """Prometheus text exposition of every metric, plus `gauges` ({name: value})."""
+    lines = [*SOLVES.render(), *SOLVE_SECONDS.render(), *STAGE_SECONDS.render()]
+    for name, value in sorted((gauges or {}).items()):
+        lines += [f"# TYPE {name} gauge", f"{name} {value}"]
+    return "\n".join(lines) + "\n"
+
+
+# --- logging ---
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, trace_id and any `fields` extra."""
+
+    def format(self, record):
+        body = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        trace_id = getattr(record, "trace_id", None) or current_trace_id()
+        if trace_id:
+            body["trace_id"] = trace_id
+        body.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            body["exc"] = self.formatException(record.exc_info)
+        return json.dumps(body, default=str, ensure_ascii=False)
+
+
+class _TraceIdFilter(logging.Filter):
+    # Trace IDs live in a contextvar of the request thread; capture it
+    # before the record crosses to the listener thread.
+    def filter(self, record):
+        if not hasattr(record, "trace_id"):
+            record.trace_id = current_trace_id()
+        return True
+
+
+_listener = None
+
+
+def configure_logging(level: str | None = None):
+    """Route the "solvemath" logger to stderr as JSON lines via a background thread.
+
+    Uses SOLVE_LOG_LEVEL when `level` is not given; does nothing when neither is set.
+    """
+    global _listener
+    level = level or os.environ.get("SOLVE_LOG_LEVEL")
+    if not level or _listener is not None:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(JSONFormatter())
+    records = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(records)
+    queue_handler.addFilter(_TraceIdFilter())
+    log.addHandler(queue_handler)
+    log.setLevel(level.upper())
+    log.propagate = False
+    _listener = logging.handlers.QueueListener(records, handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+def _restart_in_child():
+    # The listener thread does not survive fork; give the child its own.
+    global _listener
+    if _listener is None:
+        return
+    for handler in list(log.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            log.removeHandler(handler)
+    level = logging.getLevelName(log.level)
+    _listener = None
+    configure_logging(level)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_in_child)
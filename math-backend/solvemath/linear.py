@@ -0,0 +1,143 @@
+"""Systems of equations without the general sympy.solve.
+
+linear_system() reads a linear system as rows of exact coefficients. The
+check is one pass over each expanded expression's terms, and it gives up
+as soon as a term is not a number times one unknown. solve_exact() row-
+reduces the augmented matrix [A | b] over QQ with sympy's sparse
+DomainMatrix: each equation in a large system usually touches only a few
+unknowns, so sparse elimination does far less work than dense elimination.
+A square system is first tried in float64 through LAPACK, and the
+solution is rationalized and checked exactly against every row. When the
+check passes, the elimination is skipped. Textbook systems with small-
+denominator answers pass, so only systems that need it pay for exact
+elimination. solve_float() is the numeric mode: numpy.linalg.solve, or
+lstsq for non-square systems.
+
+Small polynomial systems go to solve_polynomial(), which uses a
+lexicographic Gröbner basis (sympy.solve_poly_system).
+"""
+from fractions import Fraction
+
+import numpy as np
+import sympy
+from sympy.polys.domains import QQ
+from sympy.polys.matrices import DomainMatrix
+
+# Largest denominator tried when rationalizing the LAPACK solution.
+MAX_DENOMINATOR = 10 ** 6
+# Above this condition number the float solve is not trusted to find the unique solution.
+MAX_CONDITION = 1e12
+# Unknowns above which solve_polynomial() gives up (Gröbner bases blow up quickly).
+MAX_POLYNOMIAL_UNKNOWNS = 4
+
+
+def _fraction(c) -> Fraction | None:
+    if c.is_Rational:
+        return Fraction(int(c.p), int(c.q))
+    if c.is_Float:
+        return Fraction(str(c))
+    return None
+
+
+def linear_system(exprs, unknowns):
+    """(rows, has_floats) with row = ({column: coeff}, constant) for Σ coeff·x = constant, or None."""
+    index = {v: i for i, v in enumerate(unknowns)}
+    rows, has_floats = [], False
+    for expr in exprs:
+        coeffs, constant = {}, Fraction(0)
+        for term in sympy.Add.make_args(sympy.expand(expr)):
+            coeff, rest = term.as_coeff_Mul()
+            value = _fraction(coeff)
+            if value is None:
+                return None
+            has_floats = has_floats or coeff.is_Float
+            if rest == 1:
+                constant -= value
+            elif rest in index:
+                j = index[rest]
+                coeffs[j] = coeffs.get(j, 0) + value
+            else:
+                return None
+        rows.append(({j: c for j, c in coeffs.items() if c}, constant))
+    return rows, has_floats
+
+
+def _checked(rows, values) -> bool:
+    return all(sum(c * values[j] for j, c in coeffs.items()) == constant for coeffs, constant in rows)
+
+
+def _lapack_guess(rows, n):
+    """The float solution of a square nonsingular system, rationalized, or None."""
+    if len(rows) != n or not n:
+        return None
+    a = np.zeros((n, n))
+    b = np.array([float(constant) for _, constant in rows])
+    for i, (coeffs, _) in enumerate(rows):
+        for j, c in coeffs.items():
+            a[i, j] = float(c)
+    try:
+        if np.linalg.cond(a) > MAX_CONDITION:
+            # Singular or nearly so: there may be no solution or infinitely many.
+            return None
+        x = np.linalg.solve(a, b)
+    except np.linalg.LinAlgError:
+        return None
+    if not np.isfinite(x).all():
+        return None
+    values = [Fraction(float(v)).limit_denominator(MAX_DENOMINATOR) for v in x]
+    return values if _checked(rows, values) else None
+
+
+def solve_exact(rows, n):
+    """Exact solutions: None if inconsistent, else [(constant, {free column: coeff})] per unknown."""
+    guess = _lapack_guess(rows, n)
+    if guess is not None:
+        return [(v, {}) for v in guess]
+
+    matrix = {}
+    for i, (coeffs, constant) in enumerate(rows):
+        row = {j: QQ(c.numerator, c.denominator) for j, c in coeffs.items()}
+        if constant:
+            row[n] = QQ(constant.numerator, constant.denominator)
+        if row:
+            matrix[i] = row
+    reduced, pivots = DomainMatrix(matrix, (len(rows), n + 1), QQ).rref()
+    if n in pivots:
+        return None
+    reduced = reduced.to_sdm()
+    free = [j for j in range(n) if j not in pivots]
+    out = [(Fraction(0), {j: Fraction(1)}) for j in range(n)]
+    for i, j in enumerate(pivots):
+        row = reduced.get(i, {})
+        constant = row.get(n, QQ(0))
+        out[j] = (Fraction(int(constant.numerator), int(constant.denominator)),
+                  {k: -Fraction(int(row[k].numerator), int(row[k].denominator)) for k in free if k in row})
+    return out
+
+
+def solve_float(rows, n):
+    """float64 solutions via LAPACK: (values, rank); values is None when the system is inconsistent."""
+    a = np.zeros((len(rows), n))
+    b = np.array([float(constant) for _, constant in rows])
+    for i, (coeffs, _) in enumerate(rows):
+        for j, c in coeffs.items():
+            a[i, j] = float(c)
+    if a.shape[0] == n and np.linalg.cond(a) <= MAX_CONDITION:
+        return np.linalg.solve(a, b), n
+    x, _, rank, _ = np.linalg.lstsq(a, b, rcond=None)
+    if not np.allclose(a @ x, b):
+        return None, rank
+    return x, rank
+
+
+def solve_polynomial(exprs, unknowns) -> list | None:
+    """Solutions of a small polynomial system as dicts, or None when it is not one or sympy gives up."""
+    if len(unknowns) > MAX_POLYNOMIAL_UNKNOWNS or not all(e.is_polynomial(*unknowns) for e in exprs):
+        return None
+    try:
+        solutions = sympy.solve_poly_system(exprs, *unknowns)
+    except (NotImplementedError, sympy.PolynomialError):
+        return None
+    if solutions is None:
+        return None
+    return [dict(zip(unknowns, s)) for s in solutions]
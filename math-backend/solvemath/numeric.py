@@ -0,0 +1,205 @@
+import mpmath
+import numpy as np
+import sympy
+
+# Interval scanned for real roots of non-polynomial equations.
+SCAN_RANGE = (-100.0, 100.0)
+SCAN_POINTS = 20001
+# Starting points for complex Newton iterations on non-polynomial equations.
+COMPLEX_SEEDS = [complex(re, im) for re in (-3, -1, 0, 1, 3) for im in (-2, -0.5, 0.5, 2)]
+
+
+def _dedupe(roots, tol):
+    unique = []
+    for r in roots:
+        if all(abs(r - u) > tol * max(1, abs(u)) for u in unique):
+            unique.append(r)
+    return unique
+
+
+def _polish(f, df, root, tol, maxsteps=50):
+    """Newton-polish `root` at the current mpmath precision; None if it wanders off."""
+    try:
+        polished = mpmath.findroot(f, root, solver='newton', df=df, tol=tol, maxsteps=maxsteps)
+    except (ValueError, ZeroDivisionError):
+        return None
+    return polished
+
+
+def polynomial_roots(poly: sympy.Poly, precision: int = 15) -> list:
+    """All distinct complex roots of a univariate polynomial.
+
+    The polynomial is first split into square-free factors so repeated roots
+    do not smear. Eigenvalues of each factor's companion matrix (numpy.roots)
+    give every root in one LAPACK call. For rational coefficients the real
+    roots are instead isolated exactly (Poly.intervals) and refined by a
+    bracketing solver, so ill-conditioned polynomials cannot lose or invent
+    real roots. The complex roots are Newton-polished to `precision`
+    digits in mpmath, so conjugates agree in every printed digit.
+    """
+    roots = []
+    with mpmath.workdps(precision + 10):
+        tol = mpmath.mpf(10) ** (-precision - 5)
+        for factor, _ in poly.sqf_list()[1]:
+            if factor.degree() < 1:
+                continue
+            mp_coeffs = [_to_mpmath(c, precision + 10) for c in factor.all_coeffs()]
+            f, df = _polyval(mp_coeffs)
+            estimates = np.roots([complex(c) for c in mp_coeffs])
+
+            if factor.domain.is_ZZ or factor.domain.is_QQ:
+                intervals = factor.intervals()
+                # Evaluating near a root cancels terms as large as the biggest
+                # coefficient, so refine with that many extra digits.
+                guard = max(len(str(abs(sympy.Rational(c).p))) for c in factor.all_coeffs())
+                with mpmath.workdps(precision + 10 + guard):
+                    f_exact, _ = _polyval([mpmath.mpf(c.p) / c.q for c in map(sympy.Rational, factor.all_coeffs())])
+                    for (a, b), _ in intervals:
+                        if a == b:
+                            roots.append(mpmath.mpf(a.p) / a.q)
+                        else:
+                            bracket = (mpmath.mpf(a.p) / a.q, mpmath.mpf(b.p) / b.q)
+                            roots.append(mpmath.findroot(f_exact, bracket, solver='illinois', tol=tol,
+                                                         maxsteps=500, verify=False))
+                nonreal = factor.degree() - len(intervals)
+                estimates = sorted(estimates, key=lambda z: -abs(z.imag))[:nonreal]
+
+            for estimate in estimates:
+                z = mpmath.mpc(estimate.real, estimate.imag)
+                polished = _polish(f, df, z, tol, maxsteps=12)
+                roots.append(polished if polished is not None else z)
+    return roots
+
+
+def _polyval(coeffs):
+    # Plain closures: findroot probes f(*x0) with the whole bracket, which
+    # would bind the second endpoint to a defaulted `coeffs` argument.
+    def f(z):
+        return mpmath.polyval(coeffs, z)
+
+    def df(z):
+        return mpmath.polyval(coeffs, z, derivative=True)[1]
+
+    return f, df
+
+
+def _to_mpmath(value, dps):
+    value = sympy.N(value, dps)
+    re, im = value.as_real_imag()
+    if im == 0:
+        return mpmath.mpf(str(re))
+    return mpmath.mpc(str(re), str(im))
+
+
+def _real_candidates(f_np, lo, hi, points):
+    xs = np.linspace(lo, hi, points)
+    with np.errstate(all='ignore'):
+        ys = np.asarray(f_np(xs), dtype=complex)
+    ys = np.broadcast_to(ys, xs.shape)
+    real = np.where(np.abs(ys.imag) < 1e-9, ys.real, np.nan)
+    finite = np.isfinite(real)
+
+    # Sign changes between finite neighbours bracket a root (or a pole,
+    # which the residual check later rejects).
+    brackets = finite[:-1] & finite[1:] & (np.sign(real[:-1]) * np.sign(real[1:]) <= 0)
+    for i in np.nonzero(brackets)[0]:
+        yield ("bracket", xs[i], xs[i + 1])
+
+    # Local minima of |f| catch roots of even multiplicity, where f touches
+    # zero without changing sign.
+    mag = np.where(finite, np.abs(real), np.inf)
+    minima = (mag[1:-1] < mag[:-2]) & (mag[1:-1] < mag[2:]) & ~brackets[:-1] & ~brackets[1:]
+    for i in np.nonzero(minima)[0] + 1:
+        yield ("guess", xs[i], None)
+
+
+def function_roots(expr, sym, precision: int = 15, interval=SCAN_RANGE, complex_roots: bool = True) -> list:
+    """Roots of a non-polynomial equation expr = 0.
+
+    Real roots are located by scanning `interval` with a vectorised numpy
+    evaluation and refined with a bracketing solver (or Newton from local
+    minima of |f|); complex roots come from Newton iterations started at a
+    fixed grid of seeds. Every candidate must have a tiny residual.
+    """
+    f_np = sympy.lambdify(sym, expr, "numpy")
+    f_mp = sympy.lambdify(sym, expr, "mpmath")
+    try:
+        df_mp = sympy.lambdify(sym, sympy.diff(expr, sym), "mpmath")
+    except NotImplementedError:
+        # Derivatives like that of Abs have no mpmath form; use the secant method instead of Newton.
+        df_mp = None
+    roots = []
+    with mpmath.workdps(precision + 10):
+        tol = mpmath.mpf(10) ** (-precision - 5)
+        for kind, a, b in _real_candidates(f_np, *interval, SCAN_POINTS):
+            try:
+                if kind == "bracket":
+                    root = mpmath.findroot(f_mp, (a, b), solver='anderson', tol=tol, maxsteps=200)
+                elif df_mp is None:
+                    root = mpmath.findroot(f_mp, a, solver='secant', tol=tol, maxsteps=50)
+                else:
+                    root = mpmath.findroot(f_mp, a, solver='newton', df=df_mp, tol=tol, maxsteps=50)
+                if df_mp is not None:
+                    root = _polish(f_mp, df_mp, root, tol) or root
+            except (ValueError, ZeroDivisionError, TypeError):
+                continue
+            roots.append(root)
+        if complex_roots:
+            for seed in COMPLEX_SEEDS:
+                try:
+                    root = mpmath.findroot(f_mp, mpmath.mpc(seed), solver='muller', tol=tol, maxsteps=100)
+                except (ValueError, ZeroDivisionError, TypeError):
+                    continue
+                roots.append(root)
+        accepted = []
+        for root in roots:
+            try:
+                residual = abs(f_mp(root))
+            except (ValueError, ZeroDivisionError, TypeError):
+                continue
+            if residual < mpmath.mpf(10) ** (-precision // 2) and abs(root) < 1e12:
+                accepted.append(root)
+    return _dedupe(accepted, 10.0 ** (-precision // 2))
+
+
+def solve_numeric(expr, sym, precision: int = 15) -> tuple[list, list, str]:
+    """Numerically solve expr = 0 for `sym`.
+
+    Returns (real roots, complex roots, method), roots as mpmath numbers.
+    """
+    expr = sympy.together(expr)
+    numer = sympy.numer(expr) if expr.is_rational_function(sym) else None
+    if numer is not None and numer.is_polynomial(sym) and sympy.Poly(numer, sym).degree() > 0:
+        poly = sympy.Poly(numer, sym)
+        roots = polynomial_roots(poly, precision)
+        denom = sympy.denom(expr)
+        if denom.free_symbols:
+            den = sympy.lambdify(sym, denom, "mpmath")
+            roots = [r for r in roots if abs(den(r)) > 10.0 ** (-precision // 2)]
+        method = "companion-matrix eigenvalues (numpy.roots)"
+    else:
+        # |z| = 2 holds on a whole circle; complex roots only mean something for analytic f.
+        analytic = not expr.has(sympy.Abs, sympy.re, sympy.im, sympy.conjugate, sympy.arg)
+        roots = function_roots(expr, sym, precision, complex_roots=analytic)
+        method = "bracketing + Newton iteration"
+
+    tol = 10.0 ** (-min(precision, 15) + 3)
+    with mpmath.workdps(precision + 10):
+        roots = [_chop(mpmath.mpc(r), tol) for r in roots]
+    real = sorted((r.real for r in roots if r.imag == 0), key=float)
+    complex_ = sorted((r for r in roots if r.imag != 0), key=lambda z: (float(z.real), float(z.imag)))
+    return real, complex_, method
+
+
+def _chop(z, tol):
+    """Zero whichever part of `z` is negligible next to its magnitude."""
+    scale = max(1, abs(z))
+    return mpmath.mpc(0 if abs(z.real) <= tol * scale else z.real,
+                      0 if abs(z.imag) <= tol * scale else z.imag)
+
+
+def format_root(root, precision: int = 15) -> str:
+    if isinstance(root, mpmath.mpc):
+        re, im = mpmath.nstr(root.real, precision), mpmath.nstr(abs(root.imag), precision)
+        return f"{re} {'-' if root.imag < 0 else '+'} {im}i"
+    return mpmath.nstr(root, precision)
@@ -0,0 +1,417 @@
+"""Problem text → sympy, in one tokenizing pass and without eval.
+
+The tokenizer runs one compiled pattern over the text; a recursive-descent
+parser then builds sympy objects directly. Understood on top of plain
+arithmetic:
+
+    implicit multiplication   2x, 3(x+1), xy, (x+1)(x-1), 2 sin x
+    powers                    x^2, x**2, x², sin²(x)
+    unicode                   ≤ ≥ ≠ × · ÷ − √ π ∞ °, subscripts aₙ / a_n
+    relations                 x = 2, x ≤ 3, chains like 1 < x ≤ 5
+    several statements        separated by ',', ';', ':', newlines or 'and'
+
+Command words such as 'solve' or 'simplify' are dropped, and 'for x'
+ends a statement. Results are memoized, so repeated problems cost a dict
+lookup.
+"""
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+import sympy
+
+
+class ParseError(ValueError):
+    """The text could not be read as math."""
+
+
+class Token(NamedTuple):
+    kind: str   # num, name, func, const, op, rel, sep, sup, skip
+    text: str
+
+
+FUNCTIONS = {
+    "sin": sympy.sin, "cos": sympy.cos, "tan": sympy.tan,
+    "sec": sympy.sec, "csc": sympy.csc, "cosec": sympy.csc, "cot": sympy.cot,
+    "asin": sympy.asin, "acos": sympy.acos, "atan": sympy.atan,
+    "arcsin": sympy.asin, "arccos": sympy.acos, "arctan": sympy.atan,
+    "sinh": sympy.sinh, "cosh": sympy.cosh, "tanh": sympy.tanh,
+    "sqrt": sympy.sqrt, "exp": sympy.exp, "log": sympy.log, "ln": sympy.log, "abs": sympy.Abs,
+}
+CONSTANTS = {"pi": sympy.pi, "π": sympy.pi, "E": sympy.E, "I": sympy.I, "∞": sympy.oo}
+
+# Words that carry no math: request verbs and filler around the problem.
+NOISE = frozenset({
+    "solve", "equation", "equations", "simultaneous", "simultaneously", "system", "inequality",
+    "inequalities", "factor", "factorise", "factorize", "simplify", "expression", "rational",
+    "surd", "surds", "exponent", "exponents", "verify", "identity", "prove", "find", "the", "of",
+    "that", "value", "values",
+})
+
+# Longest names first so 'sinh' wins over 'sin' and 'arcsin' over 'sin'.
+_KNOWN = sorted([*FUNCTIONS, *(c for c in CONSTANTS if c.isalpha())], key=len, reverse=True)
+
+_SUPERSCRIPTS = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹⁻", "0123456789-")
+_SUBSCRIPTS = str.maketrans("₀₁₂₃₄₅₆₇₈₉ₐₑₒₓₕₖₗₘₙₚₛₜ", "0123456789aeoxhklmnpst")
+
+_TOKEN = re.compile(r"""
+    (?P<ws>[ \t\r]+)
+  | (?P<num>\d+(?:\.\d+)?|\.\d+)
+  | (?P<word>[A-Za-zͰ-Ͽ]+)(?:_\{?(?P<sub>[A-Za-z0-9]+)\}?|(?P<usub>[₀-₉ₐ-ₜ]+))?
+  | (?P<sup>[⁰¹²³⁴⁵⁶⁷⁸⁹⁻]+)
+  | (?P<rel><=|>=|==|!=|=<|=>|[<>=≤≥≠])
+  | (?P<op>\*\*|[-+*/^()\[\]|!×·÷−√°∞])
+  | (?P<sep>[,;:?\n])
+""", re.VERBOSE)
+
+_OPERATORS = {"×": "*", "·": "*", "÷": "/", "−": "-", "**": "^", "[": "(", "]": ")"}
+_RELATIONS = {"=": "==", "==": "==", "<": "<", ">": ">", "<=": "<=", ">=": ">=", "=<": "<=", "=>": ">=",
+              "≤": "<=", "≥": ">=", "!=": "!=", "≠": "!="}
+
+
+@lru_cache(maxsize=1024)
+def _split_word(word: str) -> tuple:
+    """'sinx' → sin, x; 'xy' → x, y; filler words vanish."""
+    if word in NOISE:
+        return ()
+    if word == "and":
+        return (Token("sep", ","),)
+    if word == "for":
+        return (Token("skip", word),)
+    tokens, i = [], 0
+    while i < len(word):
+        for name in _KNOWN:
+            if word.startswith(name, i):
+                tokens.append(Token("func" if name in FUNCTIONS else "const", name))
+                i += len(name)
+                break
+        else:
+            tokens.append(Token("name", word[i]))
+            i += 1
+    return tuple(tokens)
+
+
+@lru_cache(maxsize=4096)
+def tokenize(text: str) -> tuple:
+    tokens = []
+    pos = depth = 0
+    for m in _TOKEN.finditer(text):
+        if m.start() != pos:
+            break
+        pos = m.end()
+        kind = m.lastgroup if m.lastgroup not in ("sub", "usub") else "word"
+        if kind == "ws":
+            continue
+        if kind == "word":
+            parts = list(_split_word(m.group("word")))
+            sub = m.group("sub") or (m.group("usub") or "").translate(_SUBSCRIPTS)
+            if sub:
+                if not parts or parts[-1].kind != "name":
+                    raise ParseError(f"Subscript on {m.group('word')!r} is not supported")
+                parts[-1] = Token("name", f"{parts[-1].text}_{sub}")
+            tokens.extend(parts)
+        elif kind == "op" and m.group() == "∞":
+            tokens.append(Token("const", "∞"))
+        elif kind == "op":
+            op = _OPERATORS.get(m.group(), m.group())
+            depth += (op == "(") - (op == ")")
+            tokens.append(Token("op", op))
+        elif kind == "rel":
+            tokens.append(Token("rel", _RELATIONS[m.group()]))
+        elif kind == "sup":
+            tokens.append(Token("sup", m.group().translate(_SUPERSCRIPTS)))
+        elif kind == "sep" and m.group() == "," and depth > 0:
+            # Inside brackets a comma separates function arguments.
+            tokens.append(Token("op", ","))
+        else:
+            tokens.append(Token(kind, m.group()))
+    if pos != len(text):
+        raise ParseError(f"Unexpected character {text[pos]!r} at position {pos}")
+    return tuple(tokens)
+
+
+def _statements(tokens):
+    """Split a token stream into statements, dropping 'for x' tails."""
+    current, skipping = [], False
+    for tok in tokens:
+        if tok.kind == "sep":
+            if current:
+                yield tuple(current)
+            current, skipping = [], False
+        elif tok.kind == "skip":
+            skipping = True
+        elif not skipping:
+            current.append(tok)
+    if current:
+        yield tuple(current)
+
+
+def _starts_operand(tok, in_abs: bool) -> bool:
+    if tok.kind in ("num", "name", "const", "func"):
+        return True
+    return tok.kind == "op" and (tok.text in ("(", "√") or (tok.text == "|" and not in_abs))
+
+
+class _Sympy:
+    """Builds sympy objects; the arithmetic evaluates exactly as sympify would."""
+
+    num = staticmethod(lambda text: sympy.Float(text) if "." in text else sympy.Integer(text))
+    name = staticmethod(sympy.Symbol)
+    const = staticmethod(CONSTANTS.__getitem__)
+    group = staticmethod(lambda value: value)
+    add = staticmethod(lambda a, b: a + b)
+    sub = staticmethod(lambda a, b: a - b)
+    mul = staticmethod(lambda a, b: a * b)
+    div = staticmethod(lambda a, b: a / b)
+    neg = staticmethod(lambda a: -a)
+    pow = staticmethod(lambda a, b: a ** b)
+    factorial = staticmethod(sympy.factorial)
+    degrees = staticmethod(lambda a: a * sympy.pi / 180)
+    sqrt = staticmethod(sympy.sqrt)
+    abs = staticmethod(sympy.Abs)
+    call = staticmethod(lambda name, args: FUNCTIONS[name](*args))
+    relation = staticmethod(lambda a, op, b: sympy.Rel(a, b, op, evaluate=False))
+    chain = staticmethod(lambda relations: sympy.And(*relations))
+    statement = staticmethod(lambda value, has_relation: value)
+
+
+class _Source:
+    """Builds canonical source text: explicit '*' and '**', no spaces."""
+
+    num = name = staticmethod(lambda text: text)
+    const = staticmethod(lambda text: {"π": "pi", "∞": "oo"}.get(text, text))
+    group = staticmethod(lambda value: f"({value})")
+    add = staticmethod(lambda a, b: f"{a}+{b}")
+    sub = staticmethod(lambda a, b: f"{a}-{b}")
+    mul = staticmethod(lambda a, b: f"{a}*{b}")
+    div = staticmethod(lambda a, b: f"{a}/{b}")
+    neg = staticmethod(lambda a: f"-{a}")
+    pow = staticmethod(lambda a, b: f"{a}**{b}")
+    factorial = staticmethod(lambda a: f"factorial({_unwrap(a)})")
+    degrees = staticmethod(lambda a: f"{a}*pi/180")
+    sqrt = staticmethod(lambda a: f"sqrt({_unwrap(a)})")
+    abs = staticmethod(lambda a: f"Abs({a})")
+    call = staticmethod(lambda name, args: f"{name}({','.join(args)})")
+    relation = staticmethod(lambda a, op, b: (a, "=" if op == "==" else op, b))
+    chain = staticmethod(lambda relations: relations)
+
+    @staticmethod
+    def statement(value, has_relation):
+        if not has_relation:
+            return f"{value}=0"
+        relations = [value] if isinstance(value, tuple) else value
+        return relations[0][0] + "".join(op + right for _, op, right in relations)
+
+
+def _unwrap(text: str) -> str:
+    """Drop one pair of brackets enclosing the whole of `text`."""
+    if not (text.startswith("(") and text.endswith(")")):
+        return text
+    depth = 0
+    for i, ch in enumerate(text):
+        depth += (ch == "(") - (ch == ")")
+        if depth == 0 and i < len(text) - 1:
+            return text
+    return text[1:-1]
+
+
+class _Parser:
+    """Recursive descent over one statement's tokens.
+
+        statement := expr (rel expr)*
+        expr      := term (('+' | '-') term)*
+        term      := unary (('*' | '/') unary | power)*     juxtaposition multiplies
+        unary     := ('-' | '+') unary | power
+        power     := postfix ('^' unary)?                   right-associative
+        postfix   := atom (superscript | '!' | '°')*
+        atom      := number | name | constant | call | '(' expr ')' | '√' postfix | '|' expr '|'
+    """
+
+    def __init__(self, tokens, build):
+        self.tokens = tokens
+        self.build = build
+        self.i = 0
+        self.abs_depth = 0
+
+    def peek(self):
+        return self.tokens[self.i] if self.i < len(self.tokens) else Token("end", "")
+
+    def take(self):
+        tok = self.peek()
+        self.i += 1
+        return tok
+
+    def at_op(self, *ops) -> bool:
+        tok = self.peek()
+        return tok.kind == "op" and tok.text in ops
+
+    def expect(self, op):
+        if not self.at_op(op):
+            raise ParseError(f"Expected {op!r} but found {self.peek().text or 'end of input'!r}")
+        self.i += 1
+
+    def statement(self):
+        b = self.build
+        left = self.expr()
+        relations = []
+        while self.peek().kind == "rel":
+            op = self.take().text
+            right = self.expr()
+            relations.append(b.relation(left, op, right))
+            left = right
+        if self.i != len(self.tokens):
+            raise ParseError(f"Unexpected {self.peek().text!r}")
+        if not relations:
+            return b.statement(left, False)
+        return b.statement(relations[0] if len(relations) == 1 else b.chain(relations), True)
+
+    def expr(self):
+        b = self.build
+        value = self.term()
+        while self.at_op("+", "-"):
+            if self.take().text == "+":
+                value = b.add(value, self.term())
+            else:
+                value = b.sub(value, self.term())
+        return value
+
+    def term(self):
+        b = self.build
+        value = self.unary()
+        while True:
+            if self.at_op("*"):
+                self.i += 1
+                value = b.mul(value, self.unary())
+            elif self.at_op("/"):
+                self.i += 1
+                value = b.div(value, self.unary())
+            elif _starts_operand(self.peek(), self.abs_depth > 0):
+                value = b.mul(value, self.power())
+            else:
+                return value
+
+    def unary(self):
+        if self.at_op("-"):
+            self.i += 1
+            return self.build.neg(self.unary())
+        if self.at_op("+"):
+            self.i += 1
+            return self.unary()
+        return self.power()
+
+    def power(self):
+        base = self.postfix()
+        if self.at_op("^"):
+            self.i += 1
+            return self.build.pow(base, self.unary())
+        return base
+
+    def postfix(self):
+        b = self.build
+        value = self.atom()
+        while True:
+            tok = self.peek()
+            if tok.kind == "sup":
+                self.i += 1
+                value = b.pow(value, self._sup(tok.text))
+            elif self.at_op("!"):
+                self.i += 1
+                value = b.factorial(value)
+            elif self.at_op("°"):
+                self.i += 1
+                value = b.degrees(value)
+            else:
+                return value
+
+    def _sup(self, text):
+        value = self.build.num(text.lstrip("-"))
+        return self.build.neg(value) if text.startswith("-") else value
+
+    def atom(self):
+        b = self.build
+        tok = self.take()
+        if tok.kind == "num":
+            return b.num(tok.text)
+        if tok.kind == "name":
+            return b.name(tok.text)
+        if tok.kind == "const":
+            return b.const(tok.text)
+        if tok.kind == "func":
+            return self.call(tok.text)
+        if tok.kind == "op" and tok.text == "(":
+            value = self.expr()
+            self.expect(")")
+            return b.group(value)
+        if tok.kind == "op" and tok.text == "√":
+            return b.sqrt(self.postfix())
+        if tok.kind == "op" and tok.text == "|":
+            self.abs_depth += 1
+            value = self.expr()
+            self.expect("|")
+            self.abs_depth -= 1
+            return b.abs(value)
+        raise ParseError(f"Unexpected {tok.text or 'end of input'!r}")
+
+    def call(self, name):
+        b = self.build
+        # sin²(x) and sin^2(x) raise the result, as written on paper.
+        exponent = None
+        if self.peek().kind == "sup":
+            exponent = self._sup(self.take().text)
+        elif self.at_op("^") and self.i + 1 < len(self.tokens) and self.tokens[self.i + 1].kind == "num":
+            self.i += 1
+            exponent = b.num(self.take().text)
+
+        if self.at_op("("):
+            self.i += 1
+            args = [self.expr()]
+            while self.at_op(","):
+                self.i += 1
+                args.append(self.expr())
+            self.expect(")")
+        else:
+            # Without brackets the argument is the implicit product up to
+            # the next function: sin 2x cos x = sin(2x)·cos(x).
+            arg = self.power()
+            while _starts_operand(self.peek(), self.abs_depth > 0) and self.peek().kind != "func":
+                arg = b.mul(arg, self.power())
+            args = [arg]
+        value = b.call(name, args)
+        return value if exponent is None else b.pow(value, exponent)
+
+
+@lru_cache(maxsize=4096)
+def parse(text: str) -> tuple:
+    """Every statement in `text` as a sympy expression or relation."""
+    return tuple(_Parser(s, _Sympy).statement() for s in _statements(tokenize(text)))
+
+
+@lru_cache(maxsize=4096)
+def normalize(text: str) -> tuple:
+    """Every statement in `text` as canonical source, e.g. '2x + 3 = 7' → '2*x+3=7'.
+
+    Bare expressions get '=0' appended. parse() reads these strings back
+    to the same objects as the original text.
+    """
+    return tuple(_Parser(s, _Source).statement() for s in _statements(tokenize(text)))
+
+
+def parse_expression(text: str) -> sympy.Expr:
+    """The single expression in `text`; relations are rejected."""
+    statements = parse(text)
+    if len(statements) != 1 or isinstance(statements[0], sympy.logic.boolalg.Boolean):
+        raise ParseError(f"Expected a single expression: {text!r}")
+    return statements[0]
+
+
+def parse_equation(text: str) -> tuple:
+    """(lhs, rhs) of the single equation in `text`; a bare expression means rhs = 0."""
+    statements = parse(text)
+    if len(statements) != 1:
+        raise ParseError(f"Expected a single equation: {text!r}")
+    statement = statements[0]
+    if isinstance(statement, sympy.Eq):
+        return statement.lhs, statement.rhs
+    if isinstance(statement, sympy.logic.boolalg.Boolean):
+        raise ParseError(f"Expected an equation, not an inequality: {text!r}")
+    return statement, sympy.Integer(0)
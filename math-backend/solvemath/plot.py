@@ -1,36 +1,368 @@
-# solvemath/plot.py (updated)
-import matplotlib
-matplotlib.use('Agg')  # Critical fix for threading
-from matplotlib import pyplot as plt
-import numpy as np
-import sympy
-import os
-import uuid
-
-def plot_equation(equation):
-    x = sympy.Symbol('x')
-    y = sympy.sympify(equation)
-    y_lambda = sympy.lambdify(x, y, "numpy")
-
-    x_vals = np.linspace(-10, 10, 400)
-    try:
-        y_vals = y_lambda(x_vals)
-    except TypeError:
-        y_vals = np.full_like(x_vals, float(y))
-
-    plt.figure(figsize=(8, 4))
-    plt.plot(x_vals, y_vals, 'b-', linewidth=2)
-    plt.title(f"Plot of {equation}", fontsize=14)
-    plt.xlabel("x", fontsize=12)
-    plt.ylabel("y", fontsize=12)
-    plt.grid(True, linestyle='--', alpha=0.7)
-    plt.tight_layout()
-
-    plot_dir = "plots"
-    os.makedirs(plot_dir, exist_ok=True)
-    filename = f"plot_{uuid.uuid4().hex}.png"
-    filepath = os.path.join(plot_dir, filename)
-    plt.savefig(filepath, dpi=150)
-    plt.close()
-    
-    return filename
\ No newline at end of file
+# solvemath/plot.py
+import matplotlib
+matplotlib.use('Agg')  # Critical fix for threading
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from functools import lru_cache
+import numpy as np
+import sympy
+import base64
+import hashlib
+import io
+import os
+import re
+import threading
+import time
+
+from solvemath.base import SolveMath
+from solvemath.instrument import stage
+from solvemath.parser import parse_expression
+
+PLOT_DIR = os.environ.get("PLOT_DIR", "plots")
+PLOT_DPI = 150
+# Eviction bounds for PLOT_DIR: total size and age of the files kept.
+PLOT_DIR_MAX_BYTES = int(os.environ.get("PLOT_DIR_MAX_MB", "200")) * 1024 * 1024
+PLOT_MAX_AGE = float(os.environ.get("PLOT_MAX_AGE_HOURS", "168")) * 3600
+EVICT_INTERVAL = 60.0
+
+BASE_POINTS = 200
+MAX_POINTS = 4000
+REFINE_PASSES = 6
+
+_local = threading.local()
+_evict_lock = threading.Lock()
+_last_evict = 0.0
+
+
+def _parse_in_x(equation: str):
+    """parse_expression, rejecting anything but a function of x (ValueError)."""
+    expr = parse_expression(equation)
+    extra = expr.free_symbols - {sympy.Symbol('x')}
+    if extra:
+        names = ", ".join(sorted(map(str, extra)))
+        raise ValueError(f"Only x may vary in a plot, {equation!r} also uses {names}")
+    return expr
+
+
+@lru_cache(maxsize=512)
+def compile_expression(equation: str):
+    """Parse `equation` once and return (expr, numpy callable of x)."""
+    x = sympy.Symbol('x')
+    expr = _parse_in_x(equation)
+    return expr, sympy.lambdify(x, expr, "numpy")
+
+
+def evaluate(func, x_vals: np.ndarray) -> np.ndarray:
+    """Evaluate a compiled function on a grid; undefined points become NaN."""
+    with np.errstate(all='ignore'):
+        try:
+            y_vals = func(x_vals)
+        except (TypeError, ValueError, ZeroDivisionError):
+            y_vals = np.array([_evaluate_point(func, v) for v in x_vals])
+    return _as_real(y_vals, x_vals.shape)
+
+
+def _as_real(y_vals, shape) -> np.ndarray:
+    with np.errstate(all='ignore'):
+        y_vals = np.broadcast_to(np.asarray(y_vals), shape)
+        if np.iscomplexobj(y_vals):
+            y_vals = np.where(np.abs(y_vals.imag) < 1e-12, y_vals.real, np.nan)
+        y_vals = y_vals.astype(float)
+    y_vals[~np.isfinite(y_vals)] = np.nan
+    return y_vals
+
+
+def _evaluate_point(func, value):
+    try:
+        return complex(func(value))
+    except (TypeError, ValueError, ZeroDivisionError, OverflowError):
+        return np.nan
+
+
+def adaptive_sample(func, x_min: float, x_max: float):
+    """Sample `func` densely where it bends, jumps or stops being defined.
+
+    Starts from a uniform grid and repeatedly bisects the intervals whose
+    turning angle, jump size or definedness flags a feature, then breaks the
+    curve (inserts NaN) across jumps that survive refinement, so asymptotes
+    and discontinuities are not drawn as near-vertical lines.
+    """
+    x_vals = np.linspace(x_min, x_max, BASE_POINTS)
+    y_vals = evaluate(func, x_vals)
+    min_width = (x_max - x_min) / (BASE_POINTS * 2 ** REFINE_PASSES)
+
+    for _ in range(REFINE_PASSES):
+        flagged = _flag_intervals(x_vals, y_vals)
+        flagged &= np.diff(x_vals) > min_width * 1.5
+        if not flagged.any() or len(x_vals) + flagged.sum() > MAX_POINTS:
+            break
+        mids = (x_vals[:-1][flagged] + x_vals[1:][flagged]) / 2
+        x_vals = np.concatenate([x_vals, mids])
+        order = np.argsort(x_vals)
+        x_vals = x_vals[order]
+        y_vals = np.concatenate([y_vals, evaluate(func, mids)])[order]
+
+    return _break_jumps(x_vals, y_vals)
+
+
+def _scale(y_vals):
+    finite = y_vals[np.isfinite(y_vals)]
+    if finite.size < 2:
+        return 1.0
+    low, high = np.percentile(finite, [5, 95])
+    return max(high - low, 1e-9)
+
+
+def _flag_intervals(x_vals, y_vals):
+    scale = _scale(y_vals)
+    dy = np.diff(y_vals) / scale
+    dx = np.diff(x_vals) / (x_vals[-1] - x_vals[0])
+    defined = np.isfinite(y_vals)
+    edge = defined[:-1] != defined[1:]
+    with np.errstate(invalid='ignore'):
+        jump = np.abs(dy) > 0.1
+        turn = np.abs(np.diff(np.arctan2(dy, dx))) > 0.2
+    bend = np.zeros_like(jump)
+    bend[:-1] |= turn
+    bend[1:] |= turn
+    return edge | jump | bend
+
+
+def _break_jumps(x_vals, y_vals):
+    scale = _scale(y_vals)
+    with np.errstate(invalid='ignore'):
+        jumps = np.abs(np.diff(y_vals)) > scale * 0.5
+    if not jumps.any():
+        return x_vals, y_vals
+    at = np.nonzero(jumps)[0] + 1
+    x_gap = (x_vals[at - 1] + x_vals[at]) / 2
+    return np.insert(x_vals, at, x_gap), np.insert(y_vals, at, np.nan)
+
+
+def _figure() -> Figure:
+    """A per-thread Figure, reused across calls without pyplot's global state."""
+    fig = getattr(_local, "figure", None)
+    if fig is None:
+        fig = Figure(figsize=(8, 4))
+        FigureCanvasAgg(fig)
+        _local.figure = fig
+    fig.clear()
+    return fig
+
+
+def _y_limits(x_vals, y_vals):
+    """Y range to show: the full range, unless asymptotes would flatten the
+    rest of the curve, in which case a robust range measured on a uniform
+    grid (refinement crowds points near the asymptotes)."""
+    finite = y_vals[np.isfinite(y_vals)]
+    if finite.size == 0:
+        return None
+    low, high = finite.min(), finite.max()
+    uniform = np.interp(np.linspace(x_vals[0], x_vals[-1], BASE_POINTS), x_vals, y_vals)
+    uniform = uniform[np.isfinite(uniform)]
+    if uniform.size:
+        p_low, p_high = np.percentile(uniform, [5, 95])
+        if high - low > 10 * max(p_high - p_low, 1e-9):
+            low, high = p_low - (p_high - p_low), p_high + (p_high - p_low)
+    pad = max((high - low) * 0.05, 1e-3)
+    return low - pad, high + pad
+
+
+def render(series, title, fmt="png", dpi=PLOT_DPI) -> bytes:
+    """Draw (label, x_vals, y_vals) curves on one figure and return the image bytes."""
+    fig = _figure()
+    ax = fig.add_subplot()
+    for label, x_vals, y_vals in series:
+        ax.plot(x_vals, y_vals, '-' if len(series) > 1 else 'b-', linewidth=2, label=label)
+    limits = [lim for lim in (_y_limits(x, y) for _, x, y in series) if lim]
+    if limits:
+        ax.set_ylim(min(low for low, _ in limits), max(high for _, high in limits))
+    ax.set_title(title, fontsize=14)
+    ax.set_xlabel("x", fontsize=12)
+    ax.set_ylabel("y", fontsize=12)
+    ax.grid(True, linestyle='--', alpha=0.7)
+    if len(series) > 1:
+        ax.legend(loc="best")
+    fig.tight_layout()
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, dpi=dpi)
+    return buf.getvalue()
+
+
+def plot_key(expr, x_min, x_max, dpi=PLOT_DPI) -> str:
+    """Content address of a plot: same expression and range, same name."""
+    ident = f"{sympy.srepr(expr)}|{float(x_min)!r}|{float(x_max)!r}|{dpi}"
+    return hashlib.sha256(ident.encode()).hexdigest()[:32]
+
+
+def evict_plots(plot_dir=PLOT_DIR, max_bytes=PLOT_DIR_MAX_BYTES, max_age=PLOT_MAX_AGE) -> int:
+    """Delete plots older than `max_age`, then the least recently used ones
+    until the directory fits in `max_bytes`. Returns the number removed."""
+    now = time.time()
+    files = []
+    with os.scandir(plot_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.startswith("plot_"):
+                st = entry.stat()
+                files.append((st.st_mtime, st.st_size, entry.path))
+    files.sort()
+    removed = 0
+    total = sum(size for _, size, _ in files)
+    for mtime, size, path in files:
+        if now - mtime <= max_age and total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    return removed
+
+
+def _maybe_evict(plot_dir):
+    global _last_evict
+    with _evict_lock:
+        if time.monotonic() - _last_evict < EVICT_INTERVAL:
+            return
+        _last_evict = time.monotonic()
+    evict_plots(plot_dir)
+
+
+def plot_equation(equation, x_min=-10, x_max=10, plot_dir=None):
+    plot_dir = plot_dir or PLOT_DIR
+    expr, func = compile_expression(str(equation))
+
+    filename = f"plot_{plot_key(expr, x_min, x_max)}.png"
+    filepath = os.path.join(plot_dir, filename)
+    if os.path.exists(filepath):
+        os.utime(filepath)  # keep recently served plots out of eviction
+        return filename
+
+    x_vals, y_vals = adaptive_sample(func, float(x_min), float(x_max))
+    data = render([(str(expr), x_vals, y_vals)], f"Plot of {expr}")
+
+    os.makedirs(plot_dir, exist_ok=True)
+    tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, filepath)
+    _maybe_evict(plot_dir)
+
+    return filename
+
+
+# --- Multi-function plots served from memory (/plot) ---
+
+PLOT_FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
+SHARED_GRID_POINTS = 1000
+MAX_PLOT_FUNCTIONS = 12
+
+
+@lru_cache(maxsize=256)
+def compile_expressions(equations: tuple):
+    """Compile several expressions into one numpy callable returning all of them."""
+    x = sympy.Symbol('x')
+    exprs = tuple(_parse_in_x(e) for e in equations)
+    return exprs, sympy.lambdify(x, list(exprs), "numpy")
+
+
+def evaluate_all(equations: tuple, x_vals: np.ndarray) -> np.ndarray:
+    """Evaluate several expressions on one grid in a single vectorised call.
+
+    Returns a (len(equations), len(x_vals)) array. Falls back to evaluating
+    each expression on its own when one of them cannot take arrays.
+    """
+    _, func = compile_expressions(equations)
+    try:
+        with np.errstate(all='ignore'):
+            values = func(x_vals)
+    except (TypeError, ValueError, ZeroDivisionError):
+        return np.vstack([evaluate(compile_expression(e)[1], x_vals) for e in equations])
+    return np.vstack([_as_real(v, x_vals.shape) for v in values])
+
+
+def plot_spec(items, x_min=-10, x_max=10, fmt="png", points=SHARED_GRID_POINTS):
+    """Normalise a /plot request into a hashable spec, parsing every expression.
+
+    `items` holds expression strings or {"expression", "x_min", "x_max"}
+    dicts, the latter overriding the shared range for that curve.
+    """
+    if fmt not in PLOT_FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+    if not items or len(items) > MAX_PLOT_FUNCTIONS:
+        raise ValueError(f"Give between 1 and {MAX_PLOT_FUNCTIONS} expressions")
+    curves = []
+    for item in items:
+        if isinstance(item, dict):
+            text = item.get("expression")
+            lo, hi = float(item.get("x_min", x_min)), float(item.get("x_max", x_max))
+        else:
+            text, lo, hi = item, float(x_min), float(x_max)
+        if not isinstance(text, str) or not np.isfinite([lo, hi]).all() or lo >= hi:
+            raise ValueError(f"Invalid plot item: {item!r}")
+        curves.append((text, lo, hi))
+    compile_expressions(tuple(text for text, _, _ in curves))
+    points = int(min(max(points, 50), 10000))
+    return tuple(curves), fmt, points
+
+
+def plot_etag(spec) -> str:
+    curves, fmt, points = spec
+    exprs, _ = compile_expressions(tuple(text for text, _, _ in curves))
+    ident = "|".join(f"{sympy.srepr(e)}@{lo!r}:{hi!r}" for e, (_, lo, hi) in zip(exprs, curves))
+    return hashlib.sha256(f"{ident}|{fmt}|{points}|{PLOT_DPI}".encode()).hexdigest()[:32]
+
+
+def render_plot(spec) -> bytes:
+    """Render a plot_spec on a shared grid, entirely in memory."""
+    curves, fmt, points = spec
+    equations = tuple(text for text, _, _ in curves)
+    exprs, _ = compile_expressions(equations)
+    x_vals = np.linspace(min(lo for _, lo, _ in curves), max(hi for _, _, hi in curves), points)
+    y_rows = evaluate_all(equations, x_vals)
+
+    series = []
+    for expr, (_, lo, hi), y_vals in zip(exprs, curves, y_rows):
+        y_vals = np.where((x_vals >= lo) & (x_vals <= hi), y_vals, np.nan)
+        series.append((str(expr),) + _break_jumps(x_vals, y_vals))
+    title = f"Plot of {exprs[0]}" if len(exprs) == 1 else "Plot of " + ", ".join(map(str, exprs))
+    return render(series, title, fmt)
+
+
+# --- Plotting as a solver (code 5 / "plot" in the registry) ---
+
+_PLOT_RANGE = re.compile(r'\s+(?:from|for\s+x\s+(?:from|in))\s+\[?\s*(-?[\d.]+)\s*(?:to|,|\.\.)\s*(-?[\d.]+)\s*\]?\s*$')
+
+
+class PlotSolver(SolveMath):
+    """'plot x^2, sin(x) from -5 to 5': renders the curves and returns the image under "values"."""
+
+    def solve(self, problem_text: str):
+        return self.run_steps(self.iter_solve(problem_text))
+
+    def iter_solve(self, problem_text: str):
+        steps = []
+        text = re.sub(r'^\s*(?:plot|graph|draw|sketch)\s+(?:of\s+)?', '', problem_text.strip(), flags=re.I)
+        x_min, x_max = -10.0, 10.0
+        m = _PLOT_RANGE.search(text)
+        if m:
+            x_min, x_max = float(m.group(1)), float(m.group(2))
+            text = text[:m.start()]
+        items = [t.strip() for t in re.split(r',|\band\b', text) if t.strip()]
+        yield self.step(steps, "📈 Plot Request Detected")
+        try:
+            with stage("parse"):
+                spec = plot_spec(items, x_min, x_max)
+                etag = plot_etag(spec)
+        except Exception as e:
+            return f"❌ Could not plot: {e}", None
+        yield self.step(steps, "  Curves: " + ", ".join(items))
+        yield self.step(steps, f"  Range: {x_min:g} ≤ x ≤ {x_max:g}")
+        with stage("solve"):
+            image = render_plot(spec)
+        yield self.step(steps, f"✅ Rendered {len(items)} curve{'s' if len(items) > 1 else ''} "
+                               f"({spec[1].upper()}, {len(image)} bytes)")
+        values = {"kind": "image", "format": spec[1], "etag": etag, "encoding": "base64",
+                  "data": base64.b64encode(image).decode("ascii")}
+        return '\n'.join(steps), None, values
@@ -0,0 +1,221 @@
+import multiprocessing
+import os
+import time
+
+from solvemath import budget, instrument
+from solvemath.budget import BudgetExceeded
+from solvemath.factory import InvalidSolverCode
+
+# Extra wall-clock time the parent grants a worker past its budget, so the
+# cooperative BudgetExceeded path can report back before the hard kill.
+KILL_GRACE = 0.5
+
+def _context():
+    method = os.environ.get("SOLVE_START_METHOD")
+    if not method:
+        method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+def _limit_memory(memory_mb):
+    """Cap the address space of the current process at its size now plus `memory_mb`."""
+    if not memory_mb:
+        return
+    try:
+        import resource
+        with open("/proc/self/statm") as f:
+            current = int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (ImportError, OSError, ValueError):
+        return
+    limit = current + int(memory_mb) * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _run_job(conn, factory, solver_code, expression, timeout, options=None, trace_id=None):
+    """Run one solve, sending each step to `conn` as it is produced."""
+    from solvemath.service import to_payload
+    solver = factory.get_solver_by_code(solver_code)
+    if not solver:
+        return ("invalid",)
+    steps = []
+    trace = instrument.Trace()
+    token = instrument.bind_trace_id(trace_id)
+    try:
+        with instrument.activate(trace), budget.time_limit(timeout):
+            step_iter = solver.iter_solve(expression, **solver.solve_options(options))
+            while True:
+                try:
+                    line = next(step_iter)
+                except StopIteration as stop:
+                    result = stop.value
+                    break
+                steps.append(line)
+                conn.send(("step", line))
+        with instrument.activate(trace), instrument.stage("format"):
+            payload = to_payload(*result)
+    except BudgetExceeded:
+        return ("timeout", steps)
+    except MemoryError:
+        return ("memory",)
+    finally:
+        instrument.end_request(token)
+    return ("done", payload, trace.stages)
+
+
+def _serve(conn, memory_mb, warm=False):
+    """Worker loop: solve jobs from `conn` until a None job arrives."""
+    from solvemath.factory import WARMUP, SolverFactory
+    # A forked child inherits the trace ID of whichever request started it.
+    instrument.bind_trace_id(None)
+    factory = SolverFactory()
+    if warm:
+        # Warm workers pay sympy's import and first-call costs before their first job.
+        factory.preload(WARMUP, warm=True)
+    _limit_memory(memory_mb)
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        try:
+            reply = _run_job(conn, factory, *job)
+        except BaseException as e:
+            reply = ("error", f"{type(e).__name__}: {e}")
+        conn.send(reply)
+    conn.close()
+
+
+def timed_out(timeout, partial_steps=()) -> dict:
+    return {
+        "status": "timed_out",
+        "error": f"Solve exceeded its {timeout:g}s time budget",
+        "partial_steps": list(partial_steps),
+    }
+
+
+class Worker:
+    """A sandboxed child process that runs solves one at a time.
+
+    A solve that overruns its budget is first interrupted cooperatively
+    inside the child; if the child does not answer within KILL_GRACE it is
+    killed and transparently replaced.
+    """
+
+    def __init__(self, memory_mb: int | None = None, warm: bool = False):
+        self.memory_mb = memory_mb
+        self.warm = warm
+        self.process = None
+        self.conn = None
+
+    def start(self):
+        ctx = _context()
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_serve, args=(child_conn, self.memory_mb, self.warm), daemon=True)
+        self.process.start()
+        child_conn.close()
+        return self
+
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def iter_run(self, solver_code, expression, timeout: float | None, options: dict | None = None):
+        """Run a solve, yielding ("step", line) events and then ("result", payload).
+
+        Closing the generator before the result arrives kills the worker,
+        since it may still be busy with the abandoned solve.
+        """
+        if not self.alive():
+            self.start()
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout + KILL_GRACE
+        steps = []
+        finished = False
+        self.conn.send((solver_code, expression, timeout, options, instrument.current_trace_id()))
+        try:
+            while True:
+                wait = None if deadline is None else max(deadline - time.monotonic(), 0)
+                try:
+                    reply = self.conn.recv() if self.conn.poll(wait) else None
+                except (EOFError, OSError):
+                    reply = ("crashed",)
+                if reply is None:
+                    self.kill()
+                    finished = True
+                    yield ("result", timed_out(timeout, steps))
+                    return
+                if reply[0] == "step":
+                    steps.append(reply[1])
+                    yield ("step", reply[1])
+                    continue
+                finished = True
+                if reply[0] == "done" and len(reply) > 2:
+                    yield ("timings", reply[2])
+                yield ("result", self._reply_payload(reply, solver_code, timeout, started))
+                return
+        finally:
+            if not finished:
+                self.kill()
+
+    def _reply_payload(self, reply, solver_code, timeout, started) -> dict:
+        kind = reply[0]
+        if kind == "done":
+            return reply[1]
+        if kind == "invalid":
+            raise InvalidSolverCode(solver_code)
+        if kind == "timeout":
+            return timed_out(timeout, reply[1])
+        if kind == "memory":
+            return {"status": "memory_exceeded",
+                    "error": f"Solve exceeded its {self.memory_mb} MB memory budget"}
+        if kind == "crashed":
+            self.kill()
+        detail = reply[1] if len(reply) > 1 else "worker process died"
+        return {"status": "crashed", "error": f"Solve failed after {time.monotonic() - started:.2f}s: {detail}"}
+
+    def run(self, solver_code, expression, timeout: float | None, options: dict | None = None) -> dict:
+        return last_result(self.iter_run(solver_code, expression, timeout, options))
+
+    def kill(self):
+        if self.process is not None:
+            self.process.kill()
+            self.process.join()
+        if self.conn is not None:
+            self.conn.close()
+        self.process = None
+        self.conn = None
+
+    def stop(self):
+        if self.alive():
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+            self.process.join(1)
+        self.kill()
+
+
+def last_result(events) -> dict:
+    """Drain a solve event stream and return the final payload."""
+    payload = None
+    for kind, value in events:
+        if kind == "result":
+            payload = value
+    return payload
+
+
+def iter_with_budget(solver_code, expression, timeout: float | None, memory_mb: int | None = None,
+                     options: dict | None = None):
+    """Run a single solve in a fresh sandboxed process, streaming its events."""
+    worker = Worker(memory_mb).start()
+    try:
+        yield from worker.iter_run(solver_code, expression, timeout, options)
+    finally:
+        worker.stop()
+
+
+def run_with_budget(solver_code, expression, timeout: float | None, memory_mb: int | None = None,
+                    options: dict | None = None) -> dict:
+    """Run a single solve in a fresh sandboxed process."""
+    return last_result(iter_with_budget(solver_code, expression, timeout, memory_mb, options))
@@ -0,0 +1,134 @@
+"""Whole ranges of a series at once: terms a_lo..a_hi or partial sums S_lo..S_hi.
+
+One call replaces a request per n. Exact mode walks the range with integer
+/ Fraction arithmetic (a running sum for partial sums, seeded from the
+closed form for S_{lo-1}); numeric mode is a single vectorized NumPy pass.
+encode_values() shapes the result for the "values" field of /solve, either
+as a JSON list or as base64 of a little-endian int64/float64 array.
+"""
+import base64
+import itertools
+import os
+from fractions import Fraction
+
+import numpy as np
+
+from solvemath import closedform
+
+# Largest range one request may ask for.
+MAX_VALUES = int(os.environ.get("SOLVE_SERIES_MAX_VALUES", "100000"))
+MODES = ("exact", "numeric")
+ENCODINGS = ("json", "base64")
+_INT64 = (-(2 ** 63), 2 ** 63 - 1)
+
+
+def exact_terms(info: dict, lo: int, hi: int) -> list:
+    """Terms lo..hi (1-based; n values for "polynomial") as ints/Fractions."""
+    kind = info["kind"]
+    if kind == "arithmetic":
+        first, d = closedform.arithmetic_term(info["a1"], info["d"], lo), info["d"]
+        if first.denominator == 1 and d.denominator == 1 and d:
+            step = int(d)
+            return list(range(int(first), int(first) + step * (hi - lo + 1), step))
+        return [first + i * d for i in range(hi - lo + 1)]
+    if kind == "geometric":
+        r = info["r"]
+        value = closedform.geometric_term(info["a1"], r, lo)
+        out = []
+        for _ in range(hi - lo + 1):
+            out.append(value)
+            value *= r
+        return out
+    if kind == "powers":
+        p, shift = info["p"], info["start"] - 1
+        return [(i + shift) ** p for i in range(lo, hi + 1)]
+    coeffs = info["coeffs"]
+    if all(c.denominator == 1 for c in coeffs):
+        coeffs = [int(c) for c in coeffs]
+    return [closedform.evaluate(coeffs, n) for n in range(lo, hi + 1)]
+
+
+def numeric_terms(info: dict, lo: int, hi: int) -> np.ndarray:
+    """exact_terms() as one float64 array (overflow becomes ±inf)."""
+    k = np.arange(lo, hi + 1, dtype=np.float64)
+    kind = info["kind"]
+    with np.errstate(over="ignore", invalid="ignore"):
+        if kind == "arithmetic":
+            return float(info["a1"]) + (k - 1) * float(info["d"])
+        if kind == "geometric":
+            return float(info["a1"]) * np.power(float(info["r"]), k - 1)
+        if kind == "powers":
+            return np.power(k + (info["start"] - 1), info["p"])
+        if kind == "function":
+            return np.broadcast_to(np.asarray(info["func"](k), dtype=np.float64), k.shape)
+        return np.polyval([float(c) for c in reversed(info["coeffs"])], k)
+
+
+def _offset(info: dict, lo: int, first: int):
+    """Sum of the terms first..lo-1, from the closed form where there is one."""
+    if lo <= first:
+        return 0
+    if info["kind"] == "polynomial":
+        return closedform.polynomial_sum(info["coeffs"], first, lo - 1)
+    if info["kind"] == "function":
+        return float(np.sum(numeric_terms(info, first, lo - 1)))
+    return closedform.series_sum(info, lo - 1)
+
+
+def _fits(info: dict, hi: int) -> bool:
+    # Geometric terms grow (or shrink) fastest; skip an exact pass that would not fit anyway.
+    if info["kind"] != "geometric":
+        return True
+    return closedform.is_small(closedform.geometric_term(info["a1"], info["r"], hi))
+
+
+def evaluate(info: dict, kind: str, lo: int, hi: int, mode: str = "exact", first: int = 1):
+    """Terms or partial sums for lo..hi; returns (values, dtype).
+
+    `first` is where partial sums start (1 for progressions, the lower bound
+    of a Σ). dtype is "int" or "rational" for exact lists and "float64" for
+    arrays; exact results too long to print fall back to float64, as does
+    any summand without an exact form (info kind "function").
+    """
+    if mode == "exact" and info["kind"] != "function" and _fits(info, hi):
+        values = exact_terms(info, lo, hi)
+        if kind == "partial_sums":
+            values = list(itertools.accumulate(values, initial=_offset(info, lo, first)))[1:]
+        if all(closedform.is_small(v) for v in (values[0], values[-1], max(values), min(values))):
+            rational = any(isinstance(v, Fraction) and v.denominator != 1 for v in values)
+            return values, "rational" if rational else "int"
+    values = numeric_terms(info, lo, hi)
+    if kind == "partial_sums":
+        with np.errstate(over="ignore", invalid="ignore"):
+            values = np.cumsum(values) + float(_offset(info, lo, first))
+    return values, "float64"
+
+
+def encode_values(values, dtype: str, kind: str, start: int, encoding: str = "json") -> dict:
+    """The "values" payload: metadata plus the numbers as a JSON list or base64 bytes."""
+    body = {"kind": kind, "start": start, "count": len(values), "dtype": dtype, "encoding": encoding}
+    if encoding == "base64":
+        if dtype == "int" and _INT64[0] <= min(values) and max(values) <= _INT64[1]:
+            array, body["dtype"] = np.asarray(values, dtype="<i8"), "int64"
+        else:
+            array, body["dtype"] = np.asarray([float(v) for v in values] if dtype != "float64" else values,
+                                              dtype="<f8"), "float64"
+        body["byte_order"] = "little"
+        body["data"] = base64.b64encode(array.tobytes()).decode("ascii")
+    elif dtype == "float64":
+        body["data"] = values.tolist()
+        if not np.isfinite(values).all():
+            # JSON has no inf/nan.
+            body["data"] = [v if np.isfinite(v) else None for v in body["data"]]
+    else:
+        body["data"] = [int(v) if dtype == "int" else str(v) for v in values]
+    return body
+
+
+def preview(values, dtype: str) -> str:
+    """'2, 5, 8, …, 29999' for step text."""
+    def show(v):
+        return f"{v:.10g}" if dtype == "float64" else closedform.format_exact(v)
+    if len(values) <= 6:
+        return ", ".join(show(v) for v in values)
+    return ", ".join(show(v) for v in values[:3]) + ", …, " + show(values[-1])
@@ -0,0 +1,260 @@
+import asyncio
+import contextvars
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from solvemath import instrument
+from solvemath.cache import cache_from_env, make_key
+from solvemath.executor import SolvePool, PoolSaturated
+from solvemath.factory import SolverFactory, InvalidSolverCode, cacheable, resolve
+from solvemath.sandbox import iter_with_budget, last_result
+
+
+# HTTP status for each failure "status" a payload can carry.
+STATUS_CODES = {"timed_out": 504, "memory_exceeded": 503, "crashed": 500}
+BATCH_MAX_ITEMS = int(os.environ.get("SOLVE_BATCH_MAX_ITEMS", "1000"))
+# Optional request fields forwarded to the solver (those it does not accept
+# are dropped), e.g. {"mode": "numeric", "precision": 30} for algebra or
+# {"mode": "numeric", "encoding": "base64"} for series range requests.
+SOLVE_OPTIONS = ("mode", "precision", "encoding")
+
+
+def request_options(data) -> dict:
+    """Pick the solver options out of a request body."""
+    if not isinstance(data, dict):
+        return {}
+    return {k: data[k] for k in SOLVE_OPTIONS if data.get(k) is not None}
+
+
+def to_payload(result, expr, values=None) -> dict:
+    """Turn a solver's (result, expr[, values]) tuple into the JSON body of /solve."""
+    payload = {"result": result, "steps": None if expr is None else str(expr)}
+    if values is not None:
+        payload["values"] = values
+    return payload
+
+
+def format_event(kind, value, sse: bool) -> str:
+    """Serialise one solve_stream event as an SSE frame or an NDJSON line."""
+    body = {"step": value} if kind == "step" else value
+    if sse:
+        return f"event: {kind}\ndata: {json.dumps(body)}\n\n"
+    return json.dumps({"type": kind, **body}) + "\n"
+
+
+def service_from_env() -> "SolveService":
+    """Build the service described by the SOLVE_* environment variables."""
+    return SolveService(
+        cache=cache_from_env(),
+        timeout=float(os.environ.get("SOLVE_TIMEOUT", "10")) or None,
+        memory_mb=int(os.environ.get("SOLVE_MEMORY_MB", "512")) or None,
+        workers=int(os.environ.get("SOLVE_WORKERS", os.cpu_count() or 1)),
+        queue_size=int(os.environ["SOLVE_QUEUE_SIZE"]) if "SOLVE_QUEUE_SIZE" in os.environ else None,
+    )
+
+
+class SolveService:
+    """Runs solver requests, consulting the result cache first.
+
+    Solves are dispatched to a pool of `workers` warm processes when one is
+    configured, otherwise to a one-off sandboxed process when a `timeout`
+    is set, otherwise inline. Processes are killed once they overrun their
+    time (and optional `memory_mb`) budget; failed solves come back as
+    payloads carrying a "status" and are never cached, and neither are
+    results of solvers registered with cached=False (plots).
+    """
+
+    def __init__(self, factory=None, cache=None, timeout: float | None = None, memory_mb: int | None = None,
+                 workers: int | None = None, queue_size: int | None = None):
+        self.factory = factory or SolverFactory()
+        self.cache = cache
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.workers = workers
+        self.queue_size = queue_size
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._batch_threads = ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                                                 thread_name_prefix="solve-batch")
+        self._async_threads = None
+
+    @property
+    def pool(self) -> SolvePool | None:
+        """The worker pool, started on first use so importing the app stays cheap."""
+        if not self.workers:
+            return None
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = SolvePool(self.workers, self.queue_size, self.memory_mb)
+            return self._pool
+
+    def solve(self, solver_code, expression, block: bool = False, options: dict | None = None) -> dict:
+        return last_result(self.solve_stream(solver_code, expression, block, options))
+
+    def solve_stream(self, solver_code, expression, block: bool = False, options: dict | None = None):
+        """Yield ("step", line) events as the solver produces them, then ("result", payload).
+
+        InvalidSolverCode and PoolSaturated surface on the first iteration.
+        A cache hit yields the result alone. Every solve is timed per stage
+        and recorded under the caller's trace ID, read when the stream is
+        created.
+        """
+        return self._timed_stream(resolve(solver_code), expression, block, options, instrument.current_trace_id())
+
+    def _timed_stream(self, solver_code, expression, block, options, trace_id):
+        trace = instrument.Trace()
+        started = time.perf_counter()
+        status = "abandoned"
+        try:
+            for kind, value in self._solve_events(solver_code, expression, block, options, trace):
+                if kind == "timings":
+                    trace.merge(value)
+                    continue
+                if kind == "result":
+                    status = value.get("status", "cached" if trace.cache_hit else "ok")
+                yield kind, value
+        except InvalidSolverCode:
+            status = "invalid"
+            raise
+        except PoolSaturated:
+            status = "rejected"
+            raise
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            instrument.record_solve(solver_code, status, time.perf_counter() - started, trace, trace_id)
+
+    def _solve_events(self, solver_code, expression, block, options, trace):
+        key = None
+        if self.cache is not None and cacheable(solver_code):
+            with instrument.activate(trace), instrument.stage("cache"):
+                key = make_key(solver_code, expression, **(options or {}))
+                hit = self.cache.get(key)
+            if hit is not None:
+                trace.cache_hit = True
+                yield ("result", dict(hit))
+                return
+
+        pool = self.pool
+        if pool is not None:
+            events = pool.iter_submit(solver_code, expression, self.timeout, block=block, options=options)
+        elif self.timeout:
+            events = iter_with_budget(solver_code, expression, self.timeout, self.memory_mb, options)
+        else:
+            events = self._iter_inline(solver_code, expression, options, trace)
+
+        for kind, value in events:
+            if kind == "result" and key is not None and "status" not in value:
+                self.cache.set(key, value)
+            yield kind, value
+
+    def _iter_inline(self, solver_code, expression, options=None, trace=None):
+        solver = self.factory.get_solver_by_code(solver_code)
+        if not solver:
+            raise InvalidSolverCode(solver_code)
+        step_iter = solver.iter_solve(expression, **solver.solve_options(options))
+        while True:
+            # Activate per step: the consumer may advance us from any thread.
+            with instrument.activate(trace):
+                try:
+                    line = next(step_iter)
+                except StopIteration as stop:
+                    with instrument.stage("format"):
+                        payload = to_payload(*stop.value)
+                    break
+            yield ("step", line)
+        yield ("result", payload)
+
+    def solve_batch(self, items: list) -> list:
+        """Solve many problems at once; results line up with `items`.
+
+        Identical problems (same cache key) are solved once and independent
+        ones run in parallel. A failing item yields an {"error": ...} entry
+        rather than failing the batch.
+        """
+        results = [None] * len(items)
+        jobs = {}
+        for i, item in enumerate(items):
+            if not isinstance(item, dict) or not isinstance(item.get("expression"), str):
+                results[i] = {"error": "Each item needs a solver_code and an expression string"}
+                continue
+            code, expression, options = resolve(item.get("solver_code")), item["expression"], request_options(item)
+            jobs.setdefault(make_key(code, expression, **options), (code, expression, options, []))[3].append(i)
+
+        futures = {
+            self._batch_threads.submit(contextvars.copy_context().run, self.solve, code, expression, True, options):
+                indices
+            for code, expression, options, indices in jobs.values()
+        }
+        for future, indices in futures.items():
+            try:
+                payload = future.result()
+            except InvalidSolverCode:
+                payload = {"error": "Invalid solver code"}
+            except Exception as e:
+                payload = {"error": f"{type(e).__name__}: {e}"}
+            for i in indices:
+                results[i] = dict(payload)
+        return results
+
+    # --- asyncio entry points ---
+    # Solves block on a worker pipe (or on sympy itself when inline), so the
+    # coroutines park them on a dedicated thread pool sized to what the
+    # solver pool can absorb, keeping the event loop free.
+
+    @property
+    def async_threads(self) -> ThreadPoolExecutor:
+        if self._async_threads is None:
+            capacity = (self.workers or os.cpu_count() or 1) * 5
+            self._async_threads = ThreadPoolExecutor(max_workers=capacity, thread_name_prefix="solve-async")
+        return self._async_threads
+
+    async def asolve(self, solver_code, expression, options: dict | None = None) -> dict:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.async_threads, contextvars.copy_context().run,
+                                          self.solve, solver_code, expression, False, options)
+
+    async def asolve_batch(self, items: list) -> list:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.async_threads, contextvars.copy_context().run, self.solve_batch, items)
+
+    async def asolve_stream(self, solver_code, expression, options: dict | None = None):
+        """Async counterpart of solve_stream; closing it early cancels the solve."""
+        loop = asyncio.get_running_loop()
+        events = self.solve_stream(solver_code, expression, options=options)
+        # Each step runs on some pool thread; carry the request's context along.
+        context = contextvars.copy_context()
+        done = object()
+        try:
+            while True:
+                event = await loop.run_in_executor(self.async_threads, context.run, next, events, done)
+                if event is done:
+                    return
+                yield event
+        finally:
+            await loop.run_in_executor(self.async_threads, events.close)
+
+    def metrics(self) -> str:
+        """Prometheus exposition of solve metrics plus cache and pool gauges."""
+        gauges = {}
+        if self.cache is not None:
+            stats = self.cache.stats()
+            for name in ("hits", "misses", "evictions", "expirations", "size"):
+                if name in stats:
+                    gauges[f"solve_cache_{name}"] = stats[name]
+        if self._pool is not None:
+            stats = self._pool.stats()
+            for name in ("workers", "in_flight", "busy", "waiting"):
+                gauges[f"solve_pool_{name}"] = stats[name]
+        return instrument.render_metrics(gauges)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+        self._batch_threads.shutdown(wait=False)
+        if self._async_threads is not None:
+            self._async_threads.shutdown(wait=False)
@@ -0,0 +1,326 @@
+"""Geometry formulas as a table, evaluated on whole NumPy columns.
+
+TABLE maps each shape to its formulas. A formula is a Python expression
+over the shape's parameters, compiled once at import. Its parameters are
+simply the names it uses. A measure can have several formulas, for
+example a triangle's area from base and height or from three sides
+(Heron). The first formula whose parameters are all given is used.
+Coordinate geometry (distance, midpoint, slope) is the "line" shape, with
+parameters x1, y1, x2, y2.
+
+evaluate() runs each chosen formula once over whole parameter columns.
+One row and a hundred thousand rows cost the same handful of array
+operations. GeometrySolver uses it for single problems, and /geometry
+uses it for CSV or JSON columns. Rows with non-positive lengths, or with
+no shape (three sides breaking the triangle inequality), come back as NaN
+with valid = 0. A vertical line's slope is NaN as well, but its row stays
+valid.
+"""
+import os
+import re
+from typing import NamedTuple
+
+import numpy as np
+
+from solvemath import columnar
+from solvemath.columnar import FORMATS
+
+MAX_ROWS = int(os.environ.get("SOLVE_GEOMETRY_MAX_ROWS", "5000000"))
+MAX_BODY_BYTES = int(os.environ.get("SOLVE_GEOMETRY_MAX_BODY_BYTES", str(256 * 1024 * 1024)))
+
+# Everything a formula may use besides its parameters.
+_NAMESPACE = {"__builtins__": {}, "pi": np.pi, "sqrt": np.sqrt, "tan": np.tan}
+
+
+class Formula(NamedTuple):
+    measure: str
+    expr: str
+    params: tuple           # in order of first use
+    code: object            # expr, compiled
+
+    @property
+    def text(self) -> str:
+        return self.expr.replace("pi", "π").replace("**2", "²").replace("**3", "³")
+
+
+def _formula(measure: str, expr: str) -> Formula:
+    code = compile(expr, f"<{measure}>", "eval")
+    return Formula(measure, expr, tuple(n for n in code.co_names if n not in _NAMESPACE), code)
+
+
+TABLE = {
+    # 2D
+    "circle": [
+        _formula("area", "pi * r**2"),
+        _formula("perimeter", "2 * pi * r"),
+        _formula("diameter", "2 * r"),
+    ],
+    "square": [
+        _formula("area", "s**2"),
+        _formula("perimeter", "4 * s"),
+        _formula("diagonal", "s * sqrt(2)"),
+    ],
+    "rectangle": [
+        _formula("area", "l * w"),
+        _formula("perimeter", "2 * (l + w)"),
+        _formula("diagonal", "sqrt(l**2 + w**2)"),
+    ],
+    "triangle": [
+        _formula("area", "b * h / 2"),
+        _formula("area", "sqrt((a + b + c) * (-a + b + c) * (a - b + c) * (a + b - c)) / 4"),
+        _formula("perimeter", "a + b + c"),
+    ],
+    "parallelogram": [
+        _formula("area", "b * h"),
+        _formula("perimeter", "2 * (a + b)"),
+    ],
+    "trapezoid": [
+        _formula("area", "(a + b) * h / 2"),
+    ],
+    "rhombus": [
+        _formula("area", "p * q / 2"),
+        _formula("perimeter", "4 * s"),
+    ],
+    "ellipse": [
+        _formula("area", "pi * a * b"),
+        # Ramanujan's approximation; exact for a circle.
+        _formula("perimeter", "pi * (3 * (a + b) - sqrt((3 * a + b) * (a + 3 * b)))"),
+    ],
+    "polygon": [
+        _formula("area", "n * s**2 / (4 * tan(pi / n))"),
+        _formula("perimeter", "n * s"),
+    ],
+    "sector": [
+        _formula("area", "pi * r**2 * theta / 360"),
+        _formula("perimeter", "2 * r + pi * r * theta / 180"),
+        _formula("arc_length", "pi * r * theta / 180"),
+    ],
+    # 3D
+    "cube": [
+        _formula("volume", "s**3"),
+        _formula("surface_area", "6 * s**2"),
+        _formula("diagonal", "s * sqrt(3)"),
+    ],
+    "cuboid": [
+        _formula("volume", "l * w * h"),
+        _formula("surface_area", "2 * (l * w + l * h + w * h)"),
+        _formula("diagonal", "sqrt(l**2 + w**2 + h**2)"),
+    ],
+    "sphere": [
+        _formula("volume", "4 / 3 * pi * r**3"),
+        _formula("surface_area", "4 * pi * r**2"),
+    ],
+    "hemisphere": [
+        _formula("volume", "2 / 3 * pi * r**3"),
+        _formula("surface_area", "3 * pi * r**2"),
+    ],
+    "cylinder": [
+        _formula("volume", "pi * r**2 * h"),
+        _formula("surface_area", "2 * pi * r * (r + h)"),
+        _formula("lateral_area", "2 * pi * r * h"),
+    ],
+    "cone": [
+        _formula("volume", "pi * r**2 * h / 3"),
+        _formula("surface_area", "pi * r * (r + sqrt(r**2 + h**2))"),
+        _formula("lateral_area", "pi * r * sqrt(r**2 + h**2)"),
+        _formula("slant_height", "sqrt(r**2 + h**2)"),
+    ],
+    "pyramid": [
+        # Square base of side s.
+        _formula("volume", "s**2 * h / 3"),
+        _formula("surface_area", "s**2 + 2 * s * sqrt(s**2 / 4 + h**2)"),
+    ],
+    # Coordinate geometry: the segment from (x1, y1) to (x2, y2).
+    "line": [
+        _formula("distance", "sqrt((x2 - x1)**2 + (y2 - y1)**2)"),
+        _formula("midpoint_x", "(x1 + x2) / 2"),
+        _formula("midpoint_y", "(y1 + y2) / 2"),
+        _formula("slope", "(y2 - y1) / (x2 - x1)"),
+    ],
+}
+
+SHAPE_NAMES = {
+    "rectangular prism": "cuboid", "box": "cuboid", "square pyramid": "pyramid", "regular polygon": "polygon",
+    "trapezium": "trapezoid", "segment": "line", "points": "line", "ball": "sphere",
+}
+# Regular polygons by name, as "polygon" with n sides.
+POLYGONS = {"triangle": 3, "pentagon": 5, "hexagon": 6, "heptagon": 7, "octagon": 8, "nonagon": 9, "decagon": 10}
+MEASURE_NAMES = {
+    "circumference": "perimeter", "surface area": "surface_area", "total surface area": "surface_area",
+    "lateral area": "lateral_area", "lateral surface area": "lateral_area", "curved surface area": "lateral_area",
+    "slant height": "slant_height", "arc length": "arc_length", "gradient": "slope",
+}
+# Measures that come as one point.
+GROUPS = {"midpoint": ("midpoint_x", "midpoint_y")}
+PARAM_NAMES = {
+    "radius": "r", "diameter": "d", "side": "s", "length": "l", "width": "w", "height": "h", "base": "b",
+    "angle": "theta", "sides": "n",
+}
+# Parameters that are not lengths, so may be zero or negative.
+COORDINATES = ("x1", "y1", "x2", "y2")
+
+
+def measures(shape: str) -> list:
+    return list(dict.fromkeys(f.measure for f in TABLE[shape]))
+
+
+def parameters(shape: str) -> set:
+    """The parameters the shape's formulas use, plus d where r is one."""
+    names = {p for f in TABLE[shape] for p in f.params}
+    return names | {"d"} if "r" in names else names
+
+
+def choose(shape: str, wanted, given) -> list:
+    """The formula for each wanted measure (all the shape's by default) from the given parameters."""
+    if shape not in TABLE:
+        raise ValueError(f"Unknown shape: {shape}. Known shapes: {', '.join(TABLE)}")
+    given = set(given) | ({"r"} if "d" in given else set())
+    explicit = wanted is not None
+    chosen = []
+    for measure in (wanted if explicit else measures(shape)):
+        candidates = [f for f in TABLE[shape] if f.measure == measure]
+        if not candidates:
+            raise ValueError(f"No formula for the {measure} of a {shape}")
+        usable = [f for f in candidates if set(f.params) <= given]
+        if usable:
+            chosen.append(usable[0])
+        elif explicit:
+            needs = " or ".join(", ".join(f.params) for f in candidates)
+            raise ValueError(f"The {measure} of a {shape} needs {needs}")
+    if not chosen:
+        raise ValueError(f"Not enough parameters for any {shape} measure")
+    return chosen
+
+
+def evaluate(shape: str, columns: dict, wanted=None) -> dict:
+    """The used parameter columns, one column per measure, and valid; NaN where a row is not a valid shape.
+
+    Every column must be one of the shape's parameters (or its long name).
+    """
+    if shape not in TABLE:
+        raise ValueError(f"Unknown shape: {shape}. Known shapes: {', '.join(TABLE)}")
+    allowed = parameters(shape)
+    params = {}
+    for name, values in columns.items():
+        key = PARAM_NAMES.get(name, name)
+        if key not in allowed:
+            raise ValueError(f"Unknown column for a {shape}: {name}. Use {', '.join(sorted(allowed))}")
+        if key in params:
+            raise ValueError(f"Column given twice: {key}")
+        params[key] = np.asarray(values, dtype=np.float64).reshape(-1)
+    lengths = {len(v) for v in params.values()}
+    if len(lengths) > 1:
+        raise ValueError("Columns have different lengths")
+    if lengths and lengths.pop() > MAX_ROWS:
+        raise ValueError(f"Too many rows (max {MAX_ROWS})")
+    if "d" in params and "r" not in params:
+        params["r"] = params["d"] / 2
+
+    formulas = choose(shape, wanted, params)
+    needed = {p for f in formulas for p in f.params}
+    used = [name for name in params if name in needed]
+    n = len(params[used[0]])
+    valid = np.ones(n, dtype=bool)
+    for name in used:
+        valid &= np.isfinite(params[name]) if name in COORDINATES else params[name] > 0
+    if "n" in used:
+        valid &= (params["n"] >= 3) & (params["n"] == np.round(params["n"]))
+    if {"a", "b", "c"} <= set(used):
+        a, b, c = params["a"], params["b"], params["c"]
+        valid &= (a + b > c) & (a + c > b) & (b + c > a)
+
+    out = {name: params[name] for name in used}
+    with np.errstate(all="ignore"):
+        # Only the formula's own parameters are locals, so request data never shadows _NAMESPACE.
+        values = {f.measure: np.asarray(eval(f.code, _NAMESPACE, {p: params[p] for p in f.params}),
+                                        dtype=np.float64) for f in formulas}
+    for measure, value in values.items():
+        out[measure] = np.where(valid & np.isfinite(value), value, np.nan)
+    out["valid"] = valid
+    return out
+
+
+def read_request(body: bytes, content_type: str, query=None) -> tuple:
+    """(shape, measures or None, columns, format) from a CSV or JSON request body (see columnar.read).
+
+    The shape and measures come from JSON fields or the query string:
+    {"shape": "cylinder", "measures": ["volume"], "columns": {"r": [...], "h": [...]}}
+    or POST /geometry?shape=cylinder&measures=volume,surface_area with a CSV body.
+    """
+    names = {p for formulas in TABLE.values() for f in formulas for p in f.params} | set(PARAM_NAMES) | {"d"}
+    columns, options, fmt = columnar.read(body, content_type, query, names=names)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+    shape = str(options.get("shape", "")).strip().lower()
+    if not shape:
+        raise ValueError(f"No shape given. Known shapes: {', '.join(TABLE)}")
+    shape = SHAPE_NAMES.get(shape, shape)
+    wanted = options.get("measures", options.get("measure"))
+    if isinstance(wanted, str):
+        wanted = [m.strip() for m in wanted.split(",") if m.strip()]
+    if wanted is not None:
+        wanted = [m for name in wanted for m in GROUPS.get(name, (MEASURE_NAMES.get(name, name),))]
+    return shape, wanted, columns, fmt
+
+
+def stream(out: dict, fmt: str = "csv", shape: str = ""):
+    """Yield the evaluated columns as CSV, JSON or float64 rows (valid as 0/1), in byte chunks."""
+    return columnar.stream(out, fmt, {"count": len(out["valid"]), "shape": shape})
+
+
+# --- single problems ---
+
+NUMBER = r'-?(?:\d+(?:\.\d+)?|\.\d+)'
+_POINT = re.compile(rf'\(\s*({NUMBER})\s*,\s*({NUMBER})\s*\)')
+_SIDES = re.compile(rf'\bsides?\s+(?:of\s+)?({NUMBER}(?:\s*(?:,|and)\s*{NUMBER}){{2}})')
+_PARAM = re.compile(rf'\b({"|".join(sorted(PARAM_NAMES, key=len, reverse=True))}|[a-z]\w?|theta)\s*'
+                    rf'(?:=|:|is|of)?\s*({NUMBER})(?![\d.])')
+
+
+def _alternation(names) -> re.Pattern:
+    return re.compile(r'\b(' + "|".join(re.escape(n) for n in sorted(names, key=len, reverse=True)) + r')s?\b')
+
+
+_SHAPE = _alternation(list(TABLE) + list(SHAPE_NAMES) + list(POLYGONS))
+_MEASURE = _alternation({m for formulas in TABLE.values() for f in formulas
+                         for m in (f.measure, f.measure.replace("_", " "))} | set(MEASURE_NAMES) | set(GROUPS))
+
+
+def read_problem(text: str) -> tuple | None:
+    """(shape, measures or None, {parameter: value}) from a problem like 'volume of cylinder radius 3 height 5'."""
+    text = text.lower()
+    points = _POINT.findall(text)
+    found = _SHAPE.search(_POINT.sub(" ", text))
+    if found:
+        shape = found.group(1)
+    elif len(points) == 2 or any(w in text for w in ("distance", "midpoint", "slope", "gradient")):
+        shape = "line"
+    else:
+        return None
+    params = {}
+    if shape in POLYGONS and (shape != "triangle" or "regular" in text or "equilateral" in text):
+        params["n"] = float(POLYGONS[shape])
+        shape = "polygon"
+    shape = SHAPE_NAMES.get(shape, shape)
+
+    if shape == "line":
+        if len(points) != 2:
+            return shape, None, {}
+        (x1, y1), (x2, y2) = points
+        params.update(x1=float(x1), y1=float(y1), x2=float(x2), y2=float(y2))
+    rest = _POINT.sub(" ", text)
+    sides = _SIDES.search(rest)
+    if sides and shape == "triangle":
+        params.update(zip("abc", map(float, re.findall(NUMBER, sides.group(1)))))
+        rest = rest.replace(sides.group(0), " ")
+    for name, value in _PARAM.findall(rest):
+        key = PARAM_NAMES.get(name, name)
+        if key not in params and key in parameters(shape):
+            params[key] = float(value)
+
+    wanted = []
+    for name in _MEASURE.findall(_SHAPE.sub(" ", _PARAM.sub(" ", rest))):
+        for measure in GROUPS.get(name, (MEASURE_NAMES.get(name, name.replace(" ", "_")),)):
+            if measure not in wanted:
+                wanted.append(measure)
+    return shape, wanted or None, params
@@ -0,0 +1,176 @@
+"""Vectorized triangle solving: columns of known sides and angles in, every side and angle out.
+
+Sides a, b, c are opposite angles A, B, C. Any three known values that
+include a side fix a triangle: SSS, SAS, ASA/AAS, or SSA, which can have two
+solutions. A right triangle is the case C = 90°, and the SOH-CAH-TOA names
+opposite/adjacent/hypotenuse/angle are a/b/c/A with C = 90°.
+
+solve() works on whole NumPy columns. Each pass fills in whatever the angle
+sum, the law of cosines and the law of sines can reach, for every row at
+once, so a million triangles take a few dozen array operations rather
+than a million solves. Rows that give no valid triangle come back as NaN
+with valid = 0. read_columns() and stream() handle the /triangles request
+and response bodies through the shared columnar module.
+"""
+import os
+
+import numpy as np
+
+from solvemath import columnar
+from solvemath.columnar import CHUNK_ROWS, FORMATS
+
+SIDES = ("a", "b", "c")
+ANGLES = ("A", "B", "C")
+COLUMNS = SIDES + ANGLES
+# SOH-CAH-TOA names for a right triangle with the right angle at C.
+RIGHT_NAMES = {"opposite": "a", "adjacent": "b", "hypotenuse": "c", "angle": "A"}
+OUTPUT = COLUMNS + ("area", "perimeter", "case", "solutions", "valid")
+CASES = ("", "SSS", "SAS", "ASA/AAS", "SSA")
+UNITS = ("deg", "rad")
+# "binary" (see FORMATS) is little-endian float64 rows of OUTPUT, case as its CASES index and valid as 0/1.
+MAX_ROWS = int(os.environ.get("SOLVE_TRIANGLE_MAX_ROWS", "5000000"))
+MAX_BODY_BYTES = int(os.environ.get("SOLVE_TRIANGLE_MAX_BODY_BYTES", str(256 * 1024 * 1024)))
+# Relative slack when checking angle sums and law-of-sines consistency.
+TOLERANCE = 1e-9
+
+
+def columns_from(columns: dict, unit: str = "deg", right: bool = False) -> tuple:
+    """(sides, angles) as (3, n) float64 arrays, angles in radians, NaN where unknown."""
+    if unit not in UNITS:
+        raise ValueError(f"Unsupported unit: {unit}")
+    named = {}
+    for name, values in columns.items():
+        key = RIGHT_NAMES.get(name, name)
+        if key not in COLUMNS:
+            raise ValueError(f"Unknown column: {name}")
+        if key in named:
+            raise ValueError(f"Column given twice: {key}")
+        right = right or name in RIGHT_NAMES
+        named[key] = np.asarray(values, dtype=np.float64).reshape(-1)
+    if not named:
+        raise ValueError("No columns given")
+    rows = {len(v) for v in named.values()}
+    if len(rows) != 1:
+        raise ValueError("Columns have different lengths")
+    n = rows.pop()
+    if n > MAX_ROWS:
+        raise ValueError(f"Too many rows (max {MAX_ROWS})")
+
+    sides = np.stack([named.get(k, np.full(n, np.nan)) for k in SIDES])
+    angles = np.stack([named.get(k, np.full(n, np.nan)) for k in ANGLES])
+    if unit == "deg":
+        angles = np.deg2rad(angles)
+    if right:
+        angles[2] = np.where(np.isnan(angles[2]), np.pi / 2, angles[2])
+    return sides, angles
+
+
+def classify(sides, angles) -> np.ndarray:
+    """Index into CASES for each row, from which values are known (0: not enough)."""
+    ks, ka = ~np.isnan(sides), ~np.isnan(angles)
+    ns, na = ks.sum(0), ka.sum(0)
+    # With two sides known, the included angle is the one opposite the missing side.
+    included = (~ks & ka).any(0)
+    return np.select([ns == 3, (ns == 2) & included, (ns >= 1) & (na >= 2), (ns == 2) & (na == 1)],
+                     [1, 2, 3, 4], 0).astype(np.int8)
+
+
+def solve(sides, angles, obtuse: bool = False) -> dict:
+    """Fill in every side and angle; returns OUTPUT columns (angles still in radians).
+
+    An SSA row with two triangles gets the acute solution for the unknown
+    angle, or the obtuse one with `obtuse`; "solutions" says how many exist.
+    """
+    case = classify(sides, angles)
+    s, t = sides.copy(), angles.copy()
+    two = np.zeros(s.shape[1], dtype=bool)
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        unknown = np.isnan(s).sum() + np.isnan(t).sum()
+        while unknown:
+            # Angle sum: the third angle from the other two.
+            missing = np.isnan(t)
+            t = np.where(missing & (missing.sum(0) == 1), np.pi - np.nansum(t, 0), t)
+            known = ~np.isnan(s)
+            for i in range(3):
+                j, k = (i + 1) % 3, (i + 2) % 3
+                # Law of cosines, SAS: the side opposite a known angle.
+                sas = ~known[i] & known[j] & known[k] & ~np.isnan(t[i])
+                if sas.any():
+                    s[i] = np.where(sas, np.sqrt(s[j] ** 2 + s[k] ** 2 - 2 * s[j] * s[k] * np.cos(t[i])), s[i])
+            known = ~np.isnan(s)
+            for i in range(3):
+                j, k = (i + 1) % 3, (i + 2) % 3
+                # Law of cosines, SSS: an angle from all three sides.
+                sss = np.isnan(t[i]) & known.all(0)
+                if sss.any():
+                    t[i] = np.where(sss, np.arccos((s[j] ** 2 + s[k] ** 2 - s[i] ** 2) / (2 * s[j] * s[k])), t[i])
+
+            # Law of sines: any side with its opposite angle gives the ratio for the rest.
+            paired = ~np.isnan(s) & ~np.isnan(t)
+            ratio = np.fmax.reduce(np.where(paired, s / np.sin(t), np.nan), axis=0)
+            s = np.where(np.isnan(s) & ~np.isnan(t), ratio * np.sin(t), s)
+            single = (~np.isnan(t)).sum(0) == 1
+            pair_side = np.fmax.reduce(np.where(paired, s, np.nan), axis=0)
+            pair_angle = np.fmax.reduce(np.where(paired, t, np.nan), axis=0)
+            for i in range(3):
+                ssa = single & np.isnan(t[i]) & ~np.isnan(s[i]) & ~np.isnan(ratio)
+                if not ssa.any():
+                    continue
+                sine = s[i] / ratio
+                sine = np.where(np.abs(sine - 1) < TOLERANCE, 1.0, sine)
+                acute = np.arcsin(sine)
+                # The longer side can face an acute or an obtuse angle when the known angle is acute.
+                ambiguous = ssa & (sine < 1) & (s[i] > pair_side * (1 + TOLERANCE)) & (pair_angle < np.pi / 2)
+                two |= ambiguous
+                chosen = np.where(ambiguous & obtuse, np.pi - acute, acute)
+                t[i] = np.where(ssa, chosen, t[i])
+                single &= ~ssa
+            # Stop once a pass fills nothing in: what is left has no triangle.
+            before, unknown = unknown, np.isnan(s).sum() + np.isnan(t).sum()
+            if unknown == before:
+                break
+
+        valid = np.isfinite(s).all(0) & np.isfinite(t).all(0) & (s > 0).all(0) & (t > 0).all(0)
+        valid &= np.abs(t.sum(0) - np.pi) < 1e-6
+        ratios = s / np.sin(t)
+        valid &= (ratios.max(0) - ratios.min(0)) <= 1e-6 * ratios.max(0)
+
+    s[:, ~valid] = np.nan
+    t[:, ~valid] = np.nan
+    out = dict(zip(SIDES, s))
+    out.update(zip(ANGLES, t))
+    out["area"] = 0.5 * s[1] * s[2] * np.sin(t[0])
+    out["perimeter"] = s.sum(0)
+    out["case"] = case
+    out["solutions"] = np.where(valid, np.where(two, 2, 1), 0).astype(np.int8)
+    out["valid"] = valid
+    return out
+
+
+def solve_columns(columns: dict, unit: str = "deg", right: bool = False, obtuse: bool = False) -> dict:
+    """solve() on named columns, with angles read and returned in `unit`."""
+    out = solve(*columns_from(columns, unit, right), obtuse=obtuse)
+    if unit == "deg":
+        for name in ANGLES:
+            out[name] = np.rad2deg(out[name])
+    return out
+
+
+# --- columnar I/O ---
+
+def read_columns(body: bytes, content_type: str, query=None) -> tuple:
+    """(columns, unit, right, format) from a CSV or JSON request body (see columnar.read).
+
+    JSON is {"columns": {"a": [...], ...}, "unit", "right", "format"}, or the
+    column arrays at the top level.
+    """
+    columns, options, fmt = columnar.read(body, content_type, query, names=COLUMNS + tuple(RIGHT_NAMES))
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+    return columns, options.get("unit", "deg"), columnar.flag(options.get("right", False)), fmt
+
+
+def stream(out: dict, fmt: str = "csv", unit: str = "deg", chunk_rows: int = CHUNK_ROWS):
+    """Yield the solved columns as CSV rows, one columnar JSON object or float64 rows, in byte chunks."""
+    return columnar.stream({name: out[name] for name in OUTPUT}, fmt, {"count": len(out["valid"]), "unit": unit},
+                           labels={"case": CASES}, chunk_rows=chunk_rows)
@@ -1,147 +1,262 @@
+import logging
 import sympy
+from solvemath import angles, identities, triangles
+from solvemath.angles import Family
 from solvemath.base import SolveMath
+from solvemath.instrument import stage
+from solvemath.parser import ParseError, parse_equation
+from fractions import Fraction
 from typing import Tuple
 import re
 from sympy import symbols, sin, cos, tan, sec, csc, cot, asin, acos, atan, Eq, solveset, S
 
+log = logging.getLogger(__name__)
+
 class TrigonometrySolver(SolveMath):
     def solve(self, problem_text: str, variable: str = 'x') -> Tuple[str, sympy.Expr | None]:
-        print(f"📐 TrigonometrySolver activated for: {problem_text}")
+        return self.run_steps(self.iter_solve(problem_text, variable))
+
+    def iter_solve(self, problem_text: str, variable: str = 'x'):
+        log.debug("TrigonometrySolver activated for %r", problem_text)
         text = problem_text.lower()
         steps = []
         x = symbols(variable)
 
         try:
 
-            if any(fn in text for fn in ['sin', 'cos', 'tan', 'csc', 'sec', 'cot']):
+            # Identities first: "verify sin²(x) + cos²(x) = 1" mentions sin too.
+            if any(word in text for word in ['identity', 'verify', 'prove', 'pythagorean']):
+                yield self.step(steps, "📘 Identity Verification Detected")
+
+                with stage("parse"):
+                    expr = self._extract_identity(text)
+                if expr is None:
+                    return "❌ Could not parse identity. Try 'verify sin²(x) + cos²(x) = 1'.", None
+
+                yield self.step(steps, f"  LHS: {expr.lhs}")
+                yield self.step(steps, f"  RHS: {expr.rhs}")
+                with stage("verify"):
+                    verdict = identities.verify(expr.lhs, expr.rhs)
+                if verdict.status == "proved":
+                    yield self.step(steps, f"✅ Identity is valid: {verdict.detail}.")
+                elif verdict.status == "refuted":
+                    yield self.step(steps, f"❌ Identity is false: {verdict.detail}.")
+                elif verdict.status == "probable":
+                    yield self.step(steps, f"✅ Identity is valid with high confidence: {verdict.detail}.")
+                else:
+                    yield self.step(steps, f"❌ Identity could not be verified: {verdict.detail}.")
+                return '\n'.join(steps), expr
+
+            elif any(fn in text for fn in ['sin', 'cos', 'tan', 'csc', 'sec', 'cot']):
                 
-                steps.append("📘 Trigonometric Equation Detected")
+                yield self.step(steps, "📘 Trigonometric Equation Detected")
                 
-                expr = self._extract_equation(text, variable)
+                with stage("parse"):
+                    expr = self._extract_equation(text, variable)
                 if not expr:
                     return "❌ Could not parse equation. Try 'solve sin(x) = 0.5'.", None
 
-                steps.append(f"  Equation: {expr} = 0")
-                solutions = solveset(expr, x, domain=S.Reals)
-                simplified_solutions = [sympy.simplify(s) for s in solutions]
-                
-                if not simplified_solutions:
-                    steps.append("  No real solutions found.")
-                else:
-                    steps.append("  Solutions (general):")
-                    for sol in simplified_solutions:
-                        steps.append(f"    {variable} = {sol} + 2πn, n ∈ ℤ")
-                
-                return '\n'.join(steps), expr
+                yield self.step(steps, f"  Equation: {expr} = 0")
+                # One function of a linear argument (2sin²(3x) = 1, tan(x - π/4) = √3)
+                # is read off the standard-angle table; solveset is kept for the rest.
+                with stage("solve"):
+                    families = self._table_solution(expr, x)
+                    if families is None:
+                        families = self._families(solveset(expr, x, domain=S.Reals))
 
-           
-            elif any(word in text for word in ['identity', 'verify', 'pythagorean']):
-                steps.append("📘 Identity Verification Detected")
-               
-                expr = self._extract_identity(text)
-                if not expr:
-                    return "❌ Could not parse identity. Try 'verify sin²(x) + cos²(x) = 1'.", None
-                
-                lhs, rhs = expr.lhs, expr.rhs
-                simplified_lhs = sympy.simplify(lhs)
-                steps.append(f"  LHS: {lhs} → {simplified_lhs}")
-                steps.append(f"  RHS: {rhs}")
-                if simplified_lhs == rhs:
-                    steps.append("✅ Identity is valid.")
+                if not families:
+                    yield self.step(steps, "  No real solutions found.")
                 else:
-                    steps.append("❌ Identity could not be verified.")
+                    yield self.step(steps, "  Solutions (general):")
+                    for family in families:
+                        yield self.step(steps, f"    {variable} = {self._format_family(family)}")
+
                 return '\n'.join(steps), expr
 
           
             elif any(word in text for word in ['triangle', 'hypotenuse', 'angle of elevation']):
-                steps.append("📘 Right Triangle Problem Detected")
-                
-                known_values = self._extract_triangle_values(text)
-                if not known_values:
-                    return "❌ Specify known values like 'opposite=3 angle=30°'.", None
-                
-             
-                result = self._solve_triangle(known_values, steps)
+                # Side a and angle A differ only in case, so read the original text.
+                known = self._extract_triangle_values(problem_text)
+                right = 'right' in text or any(name in known for name in triangles.RIGHT_NAMES)
+                yield self.step(steps, f"📘 {'Right ' if right else ''}Triangle Problem Detected")
+                if not known:
+                    return "❌ Specify known values like 'opposite=3 angle=30°' or 'a=7 b=10 A=30°'.", None
+
+                yield from self._solve_triangle(known, right, steps)
                 return '\n'.join(steps), None
 
-           
-            elif any(word in text for word in ['degrees to radians', 'radians to degrees']):
-                steps.append("📘 Angle Conversion Detected")
-               
-                value = self._extract_number(text)
-                if "degrees to radians" in text:
-                    converted = sympy.rad(value)
-                    steps.append(f"  {value}° → {converted} radians")
+            elif self._CONVERSION.search(text):
+                yield self.step(steps, "📘 Angle Conversion Detected")
+                value, unit, target = self._CONVERSION.search(text).groups()
+                value, in_pi = angles.parse_angle(value)
+                shown = angles.format_pi(value) if in_pi else (
+                    angles.format_fraction(value) if isinstance(value, Fraction) else f"{value:.10g}")
+                if unit.startswith('deg') or unit == '°':
+                    if target.startswith('deg'):
+                        return "❌ The angle is already in degrees.", None
+                    exact, radians = angles.to_radians(value, in_pi)
+                    approx = f"{radians:.10g}"
+                    yield self.step(steps, f"  {shown}° → {exact} radians ≈ {approx}" if exact and exact != approx
+                                    else f"  {shown}° → {approx} radians")
                 else:
-                    converted = sympy.deg(value)
-                    steps.append(f"  {value} radians → {converted}°")
+                    if target.startswith('rad'):
+                        return "❌ The angle is already in radians.", None
+                    exact, degrees = angles.to_degrees(value, in_pi)
+                    yield self.step(steps, f"  {shown} radians → {exact or f'{degrees:.10g}'}°")
                 return '\n'.join(steps), None
 
             return "❌ Could not identify trigonometry problem. Try: 'solve sin(x) = 0.5', 'verify identity', or 'find hypotenuse'.", None
 
         except Exception as e:
-            print(f"❌ TrigonometrySolver Error: {e}")
+            log.debug("TrigonometrySolver failed on %r", problem_text, exc_info=True)
             return f"❌ Error: {str(e)}", None
 
 
     def _extract_equation(self, text: str, variable: str) -> sympy.Expr | None:
         """Extract equation like 'sin(x) = 0.5'."""
         try:
-          
-            clean_text = re.sub(r'solve\s+', '', text)
-          
-            clean_text = re.sub(r'([a-z]+)([^a-z ])', r'\1(\2)', clean_text)
-           
-            clean_text = re.sub(r'([a-z]+)²', r'\1**2', clean_text)
-            lhs, rhs = clean_text.split('=')
-            return sympy.sympify(f"{lhs} - ({rhs})")
-        except:
+            lhs, rhs = parse_equation(text)
+            return lhs - rhs
+        except ParseError:
+            return None
+
+    @staticmethod
+    def _table_solution(expr, x) -> list | None:
+        """General solution when `expr` is a polynomial in a single f(kx + b), else None."""
+        calls = {call for call in expr.atoms(sympy.Function) if call.has(x)}
+        if len(calls) != 1:
+            return None
+        call = calls.pop()
+        name = type(call).__name__
+        if name not in angles.FUNCTIONS:
+            return None
+        u = call.args[0]
+        k = sympy.diff(u, x)
+        if k.has(x) or k == 0 or not k.is_real:
+            return None
+        b = sympy.expand(u - k * x)
+
+        t = sympy.Dummy('t')
+        num, den = sympy.fraction(sympy.together(expr.subs(call, t)))
+        if num.has(x) or den.has(x):
             return None
+        try:
+            poly = sympy.Poly(num, t)
+        except sympy.PolynomialError:
+            return None
+        if not 1 <= poly.degree() <= 4 or not all(c.is_number for c in poly.all_coeffs()):
+            return None
+
+        if poly.degree() == 1:
+            c1, c0 = poly.all_coeffs()
+            values = [-c0 / c1]   # sympy.roots would simplify() this
+        else:
+            values = sympy.roots(poly)
+        families = []
+        for value in values:
+            if value.is_real and den.subs(t, value) != 0:
+                families += [Family((f.base - b) / k, f.period / abs(k))
+                             for f in angles.general_solution(name, value)]
+        return angles.merge(families)
+
+    @staticmethod
+    def _families(solutions) -> list:
+        """solveset output as Families: each ImageSet keeps its own period."""
+        if isinstance(solutions, sympy.FiniteSet):
+            return [Family(v, None) for v in solutions]
+        if isinstance(solutions, sympy.Union):
+            return angles.merge(f for part in solutions.args for f in TrigonometrySolver._families(part))
+        if isinstance(solutions, sympy.ImageSet):
+            n = solutions.lamda.variables[0]
+            body = solutions.lamda.expr
+            period = sympy.diff(body, n)
+            if period.has(n):
+                return [Family(body.subs(n, 0), None)]
+            return [Family(body.subs(n, 0), abs(period))]
+        return []
+
+    @staticmethod
+    def _format_family(family: Family) -> str:
+        if family.period is None:
+            return str(family.base)
+        if family.base == 0:
+            return f"{angles.format_period(family.period)}, n ∈ ℤ"
+        return f"{family.base} + {angles.format_period(family.period)}, n ∈ ℤ"
 
     def _extract_identity(self, text: str) -> sympy.Eq | None:
         """Extract identity like 'sin²(x) + cos²(x) = 1'."""
         try:
-            clean_text = re.sub(r'verify\s+', '', text)
-            lhs, rhs = clean_text.split('=')
-            return Eq(sympy.sympify(lhs), sympy.sympify(rhs))
-        except:
+            lhs, rhs = parse_equation(text)
+            return Eq(lhs, rhs, evaluate=False)
+        except ParseError:
             return None
 
+    _TRIANGLE_VALUE = re.compile(r'\b(opposite|adjacent|hypotenuse|angle|[abcABC])\s*=\s*'
+                                 r'(\d+(?:\.\d+)?|\.\d+)\s*(°|deg\w*|rad\w*)?', re.IGNORECASE)
+    _CONVERSION = re.compile(r'(?:convert\s+)?(\S+?)\s*(°|degrees?|deg|radians?|rad)\s+(?:to|in|into)\s+'
+                             r'(degrees?|radians?)\b')
+    _METHODS = {
+        "SSS": "law of cosines for each angle",
+        "SAS": "law of cosines for the third side, then the angles",
+        "ASA/AAS": "angle sum, then law of sines for the sides",
+        "SSA": "law of sines for the missing angle",
+    }
+    # The same cases with the right angle at C, in SOH-CAH-TOA terms.
+    _RIGHT_METHODS = {
+        "SSS": "check a² + b² = c², then sin(θ) = opposite/hypotenuse",
+        "SAS": "hypotenuse² = opposite² + adjacent², tan(θ) = opposite/adjacent",
+        "ASA/AAS": "sin(θ) = opposite/hypotenuse, cos(θ) = adjacent/hypotenuse, tan(θ) = opposite/adjacent",
+        "SSA": "missing leg by Pythagoras, sin(θ) = opposite/hypotenuse",
+    }
+
     def _extract_triangle_values(self, text: str) -> dict:
-        """Extract key-value pairs like 'opposite=3 angle=30°'."""
+        """Key-value pairs like 'opposite=3 angle=30°' or 'a=7 b=10 A=30°'; angles in degrees."""
         known = {}
-       
-        matches = re.finditer(r'(\w+)=([0-9.°]+)', text)
-        for m in matches:
-            key, val = m.groups()
-            known[key] = float(val.replace('°', '')) if '°' in val else float(val)
+        for m in self._TRIANGLE_VALUE.finditer(text):
+            key, val, unit = m.groups()
+            key = key.lower() if len(key) > 1 else key
+            value = float(val)
+            if unit and unit.lower().startswith('rad'):
+                value = angles.to_degrees(value)[1]
+            known[key] = value
         return known
 
-    def _solve_triangle(self, known: dict, steps: list) -> dict:
-        """Solve right triangle using SOH-CAH-TOA."""
-      
-        results = {}
-        
-        if 'angle' in known:
-            theta = sympy.rad(known['angle'])
-            steps.append(f"  Angle θ = {known['angle']}° → {theta:.2f} radians")
-        
-        
-        if 'opposite' in known and 'angle' in known:
-            hyp = known['opposite'] / sympy.sin(theta)
-            results['hypotenuse'] = hyp
-            steps.append(f"  sin(θ) = opposite/hypotenuse → hypotenuse = {hyp:.2f}")
-        
-       
-        if 'adjacent' in known and 'hypotenuse' in known:
-            theta = sympy.acos(known['adjacent'] / known['hypotenuse'])
-            results['angle'] = sympy.deg(theta)
-            steps.append(f"  cos(θ) = adjacent/hypotenuse → θ = {results['angle']:.2f}°")
-        
-       
-        return results
-
-    def _extract_number(self, text: str) -> float:
-        """Extract the first number from text."""
-        match = re.search(r'([0-9.]+)', text)
-        return float(match.group(1)) if match else 0.0
\ No newline at end of file
+    def _solve_triangle(self, known: dict, right: bool, steps: list):
+        """Solve the triangle with the vectorized solver (one row), yielding each step."""
+        def show(name, value):
+            if name in triangles.ANGLES or name == "angle":
+                return f"{name} = {value:.6g}°"
+            return f"{name} = {value:.6g}"
+
+        yield self.step(steps, "  Known: " + ", ".join(show(k, v) for k, v in known.items()))
+        columns = {k: [v] for k, v in known.items()}
+        with stage("solve"):
+            out = triangles.solve_columns(columns, right=right)
+        case = triangles.CASES[out["case"][0]]
+        if not case:
+            yield self.step(steps, "❌ Need three values, at least one of them a side (with the right angle counting as one).")
+            return
+        if right:
+            yield self.step(steps, f"  SOH-CAH-TOA: {self._RIGHT_METHODS[case]}")
+        else:
+            yield self.step(steps, f"  Case: {case} → {self._METHODS[case]}")
+        if not out["valid"][0]:
+            yield self.step(steps, "❌ No triangle has these measurements.")
+            return
+
+        triangle_sets = [out]
+        if out["solutions"][0] == 2:
+            with stage("solve"):
+                triangle_sets.append(triangles.solve_columns(columns, right=right, obtuse=True))
+            yield self.step(steps, "  Two triangles fit (ambiguous SSA case):")
+        for n, tri in enumerate(triangle_sets, 1):
+            label = f"  Triangle {n}: " if len(triangle_sets) > 1 else "  "
+            v = {name: float(tri[name][0]) for name in triangles.OUTPUT[:8]}
+            if right:
+                yield self.step(steps, f"{label}opposite = {v['a']:.6g}, adjacent = {v['b']:.6g}, "
+                                       f"hypotenuse = {v['c']:.6g}")
+                yield self.step(steps, f"{label}θ = {v['A']:.6g}°, other acute angle = {v['B']:.6g}°")
+            else:
+                yield self.step(steps, f"{label}sides: " + ", ".join(show(k, v[k]) for k in triangles.SIDES))
+                yield self.step(steps, f"{label}angles: " + ", ".join(show(k, v[k]) for k in triangles.ANGLES))
+            yield self.step(steps, f"{label}area = {v['area']:.6g}, perimeter = {v['perimeter']:.6g}")
@@ -0,0 +1,101 @@
+"""One equation in one unknown: classify f(x) = 0 once and share the work between steps.
+
+kind() sorts the expression into linear, quadratic, polynomial (all three
+with rational coefficients), rational or transcendental. The caller
+classifies once and passes the kind to simplify(), factor() and roots(),
+and only the polynomial kinds take the Poly path. Polynomials are read
+into a Poly a single time, and factor_list() of that Poly is computed
+once and cached. The factorization gives Step 4 its factored form and
+gives the roots directly: -b/a for linear factors, the quadratic formula
+for quadratic ones. Only factors of degree three or more go to
+sympy.solve. Everything else still goes through sympy.simplify / factor /
+solve, but each result is memoized, so the same expression (or the same
+root) is never simplified twice.
+
+The output matches the general path exactly. An expanded polynomial with
+a nonzero constant term is already what simplify() returns, so it is
+passed through as is. A polynomial without a constant term gets x factored
+out by simplify(), so it still takes the real simplify(). Roots built from
+the factorization are already in the form simplify() would return.
+"""
+from functools import lru_cache
+
+import sympy
+from sympy import Poly, default_sort_key
+from sympy.core.mul import _keep_coeff
+from sympy.polys.polyroots import roots_quadratic
+
+KINDS = ("linear", "quadratic", "polynomial", "rational", "transcendental")
+POLYNOMIAL = KINDS[:3]
+CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _poly(expr, sym) -> Poly | None:
+    """expr as a Poly in sym with rational coefficients, else None."""
+    try:
+        poly = Poly(expr, sym)
+    except sympy.PolynomialError:
+        return None
+    if not (poly.domain.is_ZZ or poly.domain.is_QQ) or poly.degree() < 1:
+        return None
+    return poly
+
+
+def kind(expr, sym) -> str:
+    """One of KINDS. Polynomials with float or symbolic coefficients count as rational."""
+    poly = _poly(expr, sym)
+    if poly is not None:
+        return KINDS[min(poly.degree(), 3) - 1]
+    if expr.is_rational_function(sym):
+        return "rational"
+    return "transcendental"
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def factor_list(poly: Poly) -> tuple:
+    """(coefficient, ((factor, multiplicity), ...)) over the integers, as sympy.factor() forms it."""
+    denominator, integral = poly.clear_denoms(convert=True)
+    coeff, factors = integral.factor_list()
+    return sympy.Integer(coeff) / denominator, tuple(factors)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def simplify(expr, sym, kind: str):
+    poly = _poly(expr, sym) if kind in POLYNOMIAL else None
+    if poly is not None and expr == poly.as_expr() and (poly.TC() != 0 or poly.is_monomial):
+        return expr
+    return sympy.simplify(expr)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def factor(expr, sym, kind: str):
+    poly = _poly(expr, sym) if kind in POLYNOMIAL else None
+    if poly is None:
+        return sympy.factor(expr)
+    coeff, factors = factor_list(poly)
+    return _keep_coeff(coeff, sympy.Mul(*[f.as_expr() ** k for f, k in factors]))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _simplify_root(value):
+    return sympy.simplify(value)
+
+
+def roots(expr, sym, kind: str) -> list:
+    """Solutions of expr = 0 as sympy.solve(expr, sym) lists them, each simplified."""
+    poly = _poly(expr, sym) if kind in POLYNOMIAL else None
+    if poly is None:
+        return [_simplify_root(v) for v in sympy.solve(expr, sym)]
+    _, factors = factor_list(poly)
+    if any(f.degree() > 2 for f, _ in factors):
+        return [_simplify_root(v) for v in sympy.solve(expr, sym)]
+    found = []
+    for f, _ in factors:
+        if f.degree() == 1:
+            a, b = f.all_coeffs()
+            found.append(sympy.Rational(-b, a))
+        else:
+            found.extend(roots_quadratic(f))
+    # Quadratic-formula roots of a primitive integer factor are already in simplest form.
+    return sorted(dict.fromkeys(found), key=default_sort_key)